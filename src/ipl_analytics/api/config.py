@@ -21,6 +21,18 @@ class Settings(BaseSettings):
     db_host: str = "localhost"
     db_port: int = 5432
     
+    # Connection pool settings
+    db_pool_min: int = 1
+    db_pool_max: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_max_lifetime: Optional[float] = 3600.0  # recycle connections older than this
+    db_pool_max_idle: Optional[float] = 600.0  # close idle connections above the minimum
+    db_pool_ping_after: float = 5.0  # ping connections idle longer than this on checkout
+    
+    # Query instrumentation
+    db_slow_query_ms: float = 500.0  # log queries slower than this
+    db_explain_slow_queries: bool = False  # capture EXPLAIN (ANALYZE, BUFFERS) of slow queries
+    
     # API settings
     api_title: str = "IPL Analytics API"
     api_version: str = "1.0.0"
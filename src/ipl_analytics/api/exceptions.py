@@ -55,3 +55,15 @@ class DatabaseError(IPLAnalyticsException):
             error_code="DATABASE_ERROR",
             details=details or {}
         )
+
+
+class ServiceUnavailableError(IPLAnalyticsException):
+    """Temporarily unable to serve the request"""
+    
+    def __init__(self, message: str, details: Optional[dict] = None):
+        super().__init__(
+            message=message,
+            status_code=503,
+            error_code="SERVICE_UNAVAILABLE",
+            details=details or {}
+        )
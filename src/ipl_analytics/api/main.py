@@ -7,14 +7,16 @@ from fastapi.responses import JSONResponse
 import logging
 
 from ipl_analytics.api.config import settings
-from ipl_analytics.api.exceptions import IPLAnalyticsException
+from ipl_analytics.api.exceptions import IPLAnalyticsException, ServiceUnavailableError
+from ipl_analytics.db.pool import DatabasePool, PoolTimeout
 from ipl_analytics.api.routes import (
     players,
     batters,
     matchups,
     matches,
     seasons,
-    health
+    health,
+    metrics
 )
 
 # Configure logging
@@ -111,6 +113,10 @@ app = FastAPI(
         {
             "name": "matches",
             "description": "Match information endpoints. Get details about specific matches."
+        },
+        {
+            "name": "metrics",
+            "description": "Query latency, slow-query and connection pool metrics."
         }
     ]
 )
@@ -141,6 +147,18 @@ async def ipl_analytics_exception_handler(request: Request, exc: IPLAnalyticsExc
     )
 
 
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """All connections stayed busy for db_pool_timeout: ask the client to retry"""
+    error = ServiceUnavailableError(
+        "Database is busy, please retry",
+        details={"pool": DatabasePool.stats()}
+    )
+    response = await ipl_analytics_exception_handler(request, error)
+    response.headers["Retry-After"] = "1"
+    return response
+
+
 # Include routers
 app.include_router(health.router, prefix=settings.api_prefix)
 app.include_router(players.router, prefix=settings.api_prefix)
@@ -148,6 +166,7 @@ app.include_router(batters.router, prefix=settings.api_prefix)
 app.include_router(matchups.router, prefix=settings.api_prefix)
 app.include_router(matches.router, prefix=settings.api_prefix)
 app.include_router(seasons.router, prefix=settings.api_prefix)
+app.include_router(metrics.router, prefix=settings.api_prefix)
 
 
 @app.on_event("startup")
@@ -157,14 +176,9 @@ async def startup_event():
     logger.info(f"API Version: {settings.api_version}")
     logger.info(f"Database: {settings.db_name} @ {settings.db_host}:{settings.db_port}")
     
-    # (Re)initialize database pool at startup so it always uses current config
-    try:
-        from ipl_analytics.db.pool import DatabasePool
-        DatabasePool.close_all()
-        DatabasePool.initialize()
-        logger.info("Database connection pool initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize database pool: {e}")
+    # Open the pool minimum now so the first requests do not pay for connecting
+    DatabasePool.initialize(warmup=False)
+    await DatabasePool.run(DatabasePool.warmup)
 
 
 @app.on_event("shutdown")
@@ -172,7 +186,6 @@ async def shutdown_event():
     """Cleanup resources on shutdown"""
     logger.info("Shutting down IPL Analytics API...")
     try:
-        from ipl_analytics.db.pool import DatabasePool
         DatabasePool.close_all()
         logger.info("Database connections closed")
     except Exception as e:
@@ -92,7 +92,7 @@ async def get_batter_profile(
     """
     Get complete batter profile including career stats, phase performance, and dismissals
     """
-    return service.get_batter_profile(batter_name)
+    return await service.get_batter_profile(batter_name)
 
 
 @router.get(
@@ -148,7 +148,7 @@ async def get_batter_recent_form(
     """
     Get recent form for a batter (last N matches)
     """
-    return service.get_recent_form(batter_name, matches, season)
+    return await service.get_recent_form(batter_name, matches, season)
 
 
 @router.get(
@@ -256,4 +256,4 @@ async def get_batter_profile_by_season(
     If season parameter is provided, returns only that season's data.
     Otherwise, returns all seasons.
     """
-    return service.get_batter_profile_by_season(batter_name, season)
+    return await service.get_batter_profile_by_season(batter_name, season)
@@ -2,13 +2,18 @@
 Health check and utility routes
 """
 from fastapi import APIRouter
-from ipl_analytics.api.schemas.common import HealthResponse
+from ipl_analytics.api.schemas.common import HealthResponse, PoolStats
 from ipl_analytics.api.config import settings
 from ipl_analytics.db.pool import DatabasePool
 
 router = APIRouter(tags=["health"])
 
 
+def _ping() -> None:
+    with DatabasePool.get_cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
 @router.get(
     "/health",
     response_model=HealthResponse,
@@ -30,6 +35,7 @@ router = APIRouter(tags=["health"])
     - `status`: Overall service status
     - `database`: Database connection status (connected/disconnected/error)
     - `version`: API version number
+    - `pool`: Connection pool usage (in use, idle, waiting)
     """,
     responses={
         200: {
@@ -39,7 +45,16 @@ router = APIRouter(tags=["health"])
                     "example": {
                         "status": "healthy",
                         "database": "connected",
-                        "version": "1.0.0"
+                        "version": "1.0.0",
+                        "pool": {
+                            "size": 2,
+                            "in_use": 1,
+                            "idle": 1,
+                            "waiting": 0,
+                            "min_size": 1,
+                            "max_size": 10,
+                            "recycled": 0
+                        }
                     }
                 }
             }
@@ -54,14 +69,14 @@ async def health_check():
     # Check database connection
     db_status = "disconnected"
     try:
-        with DatabasePool.get_cursor() as cursor:
-            cursor.execute("SELECT 1")
-            db_status = "connected"
+        await DatabasePool.run(_ping)
+        db_status = "connected"
     except Exception:
         db_status = "error"
     
     return HealthResponse(
         status="healthy" if db_status == "connected" else "degraded",
         database=db_status,
-        version=settings.api_version
+        version=settings.api_version,
+        pool=PoolStats(**pool_stats) if (pool_stats := DatabasePool.stats()) else None
     )
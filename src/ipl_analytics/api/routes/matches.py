@@ -69,4 +69,4 @@ async def get_match_info(
     """
     Get match information including season, venue, and teams
     """
-    return service.get_match_info(match_id)
+    return await service.get_match_info(match_id)
@@ -0,0 +1,48 @@
+"""
+Query metrics routes
+"""
+from fastapi import APIRouter
+from ipl_analytics.api.schemas.metrics import QueryMetricsResponse
+from ipl_analytics.db.instrumentation import query_recorder
+from ipl_analytics.db.pool import DatabasePool
+from ipl_analytics.db.prepared import prepared_statements
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get(
+    "/queries",
+    response_model=QueryMetricsResponse,
+    summary="Query Metrics",
+    description="""
+    Per-query latency, row counts and pool wait times recorded by the repositories.
+    
+    **Returns:**
+    - Per query name: count, errors, rows, mean/p50/p95/p99/max latency and a histogram
+    - The most recent queries over the slow-query threshold, with their
+      `EXPLAIN (ANALYZE, BUFFERS)` plan when `DB_EXPLAIN_SLOW_QUERIES` is enabled
+    - Connection pool and prepared statement cache usage
+    
+    **Use Cases:**
+    - Find which profile, form or matchup query to optimize first
+    - Spot pool exhaustion (high pool wait) under load
+    """
+)
+async def get_query_metrics() -> QueryMetricsResponse:
+    """Query instrumentation since startup or the last reset"""
+    return QueryMetricsResponse(
+        **query_recorder.snapshot(),
+        pool=DatabasePool.stats() or None,
+        prepared_statements=prepared_statements.stats()
+    )
+
+
+@router.delete(
+    "/queries",
+    status_code=204,
+    summary="Reset Query Metrics",
+    description="Clear recorded query metrics and slow queries, starting a new measurement window."
+)
+async def reset_query_metrics() -> None:
+    """Start a new measurement window"""
+    query_recorder.reset()
@@ -71,7 +71,7 @@ async def list_players(
     """
     List all players with optional search and pagination
     """
-    result = service.get_all_players(search, limit, offset)
+    result = await service.get_all_players(search, limit, offset)
     return PlayerListResponse(**result)
 
 
@@ -133,7 +133,7 @@ async def search_players(
     """
     Search players for autocomplete
     """
-    players = service.search_players(q, limit)
+    players = await service.search_players(q, limit)
     return PlayerSearchResponse(
         players=[PlayerResponse(name=p["name"]) for p in players]
     )
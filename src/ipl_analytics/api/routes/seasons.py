@@ -19,5 +19,5 @@ async def get_available_seasons(
     service: MatchService = Depends(get_match_service),
 ) -> SeasonsResponse:
     """Get list of seasons for which data exists."""
-    seasons = service.get_available_seasons()
+    seasons = await service.get_available_seasons()
     return SeasonsResponse(seasons=seasons)
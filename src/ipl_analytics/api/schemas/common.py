@@ -18,11 +18,23 @@ class ErrorResponse(BaseModel):
     )
 
 
+class PoolStats(BaseModel):
+    """Connection pool usage"""
+    size: int = Field(..., description="Open connections")
+    in_use: int = Field(..., description="Connections checked out")
+    idle: int = Field(..., description="Connections ready for use")
+    waiting: int = Field(..., description="Requests queued for a connection")
+    min_size: int = Field(..., description="Configured minimum")
+    max_size: int = Field(..., description="Configured maximum")
+    recycled: int = Field(0, description="Connections replaced for exceeding their lifetime")
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Service status")
     database: str = Field(..., description="Database connection status")
     version: str = Field(..., description="API version")
+    pool: Optional[PoolStats] = Field(None, description="Connection pool usage")
 
 
 class PhaseStats(BaseModel):
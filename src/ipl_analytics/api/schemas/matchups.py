@@ -14,6 +14,9 @@ class MatchupStats(BaseModel):
     strike_rate: float = Field(..., description="Strike rate")
     average: Optional[float] = Field(None, description="Average")
     confidence_score: Optional[int] = Field(None, description="Confidence score (0-100)")
+    dots: Optional[int] = Field(None, description="Dot balls")
+    boundaries: Optional[int] = Field(None, description="Fours and sixes")
+    extras: Optional[int] = Field(None, description="Extras conceded")
 
 
 class RecentEncounter(BaseModel):
@@ -0,0 +1,55 @@
+"""
+Query metrics API schemas
+"""
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from ipl_analytics.api.schemas.common import PoolStats
+
+
+class QueryMetrics(BaseModel):
+    """Measurements of one named query"""
+    count: int = Field(..., description="Executions")
+    errors: int = Field(..., description="Executions that raised")
+    slow: int = Field(..., description="Executions over the slow-query threshold")
+    rows: int = Field(..., description="Rows returned in total")
+    mean_ms: float = Field(..., description="Mean execution time")
+    p50_ms: Optional[float] = Field(None, description="Median (histogram bucket bound)")
+    p95_ms: Optional[float] = Field(None, description="95th percentile (histogram bucket bound)")
+    p99_ms: Optional[float] = Field(None, description="99th percentile (histogram bucket bound)")
+    max_ms: float = Field(..., description="Slowest execution")
+    total_ms: float = Field(..., description="Time spent in this query in total")
+    pool_wait_mean_ms: float = Field(..., description="Mean wait for a pool connection")
+    pool_wait_max_ms: float = Field(..., description="Longest wait for a pool connection")
+    histogram: Dict[str, int] = Field(..., description="Executions per latency bucket")
+
+
+class SlowQuery(BaseModel):
+    """One execution over the slow-query threshold"""
+    name: str = Field(..., description="Query name")
+    duration_ms: float = Field(..., description="Execution time")
+    pool_wait_ms: float = Field(..., description="Wait for a pool connection")
+    rows: int = Field(..., description="Rows returned")
+    error: Optional[str] = Field(None, description="Exception type, if the query failed")
+    at: str = Field(..., description="When it finished (UTC, ISO 8601)")
+    plan: Optional[List[str]] = Field(None, description="EXPLAIN (ANALYZE, BUFFERS) output, if captured")
+
+
+class PreparedStatementMetrics(BaseModel):
+    """Prepared statement cache usage"""
+    hits: int = Field(..., description="Executions of an already prepared statement")
+    prepares: int = Field(..., description="Statements prepared")
+    hit_ratio: Optional[float] = Field(None, description="hits / (hits + prepares)")
+    connections: int = Field(..., description="Connections holding prepared statements")
+    queries: Dict[str, Dict[str, int]] = Field(..., description="Hits and prepares per query")
+
+
+class QueryMetricsResponse(BaseModel):
+    """Query instrumentation since startup or the last reset"""
+    since: str = Field(..., description="Start of the measurement window (UTC, ISO 8601)")
+    slow_query_threshold_ms: float = Field(..., description="Slow-query threshold")
+    explain_slow_queries: bool = Field(..., description="Whether slow queries are EXPLAINed")
+    queries: Dict[str, QueryMetrics] = Field(..., description="Per-query metrics, slowest mean first")
+    slow_queries: List[SlowQuery] = Field(..., description="Most recent slow queries, newest first")
+    pool: Optional[PoolStats] = Field(None, description="Connection pool usage")
+    prepared_statements: PreparedStatementMetrics = Field(..., description="Prepared statement cache")
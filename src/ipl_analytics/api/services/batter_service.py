@@ -1,6 +1,7 @@
 """
 Service for batter-related operations
 """
+import asyncio
 from typing import Optional
 from ipl_analytics.repositories.batter_repository import BatterRepository
 from ipl_analytics.api.exceptions import NotFoundError
@@ -24,7 +25,7 @@ class BatterService:
     def __init__(self):
         self.repository = BatterRepository()
     
-    def get_batter_profile(self, batter_name: str) -> BatterProfileResponse:
+    async def get_batter_profile(self, batter_name: str) -> BatterProfileResponse:
         """
         Get complete batter profile
         
@@ -37,7 +38,11 @@ class BatterService:
         Raises:
             NotFoundError if batter not found
         """
-        data = self.repository.get_batter_profile(batter_name)
+        # Independent queries: run them concurrently on separate connections
+        data, highest_score = await asyncio.gather(
+            self.repository.get_batter_profile(batter_name),
+            self.repository.get_highest_score(batter_name)
+        )
         
         if not data:
             raise NotFoundError("Batter", batter_name)
@@ -70,9 +75,6 @@ class BatterService:
             ) if data["death_balls"] > 0 else None
         )
         
-        # Get highest score
-        highest_score = self.repository.get_highest_score(batter_name)
-        
         career = BatterCareerStats(
             matches=data["matches"],
             runs=data["runs"],
@@ -97,7 +99,7 @@ class BatterService:
             dismissals=dismissals
         )
     
-    def get_recent_form(
+    async def get_recent_form(
         self,
         batter_name: str,
         num_matches: int = 5,
@@ -120,9 +122,9 @@ class BatterService:
         # Validate player exists
         from ipl_analytics.api.services.player_service import PlayerService
         player_service = PlayerService()
-        player_service.validate_player_exists(batter_name)
+        await player_service.validate_player_exists(batter_name)
         
-        recent_matches_data, summary_data = self.repository.get_recent_form(
+        recent_matches_data, summary_data = await self.repository.get_recent_form(
             batter_name, num_matches, season
         )
         
@@ -139,7 +141,7 @@ class BatterService:
             summary=summary
         )
     
-    def get_batter_profile_by_season(
+    async def get_batter_profile_by_season(
         self,
         batter_name: str,
         season: Optional[str] = None
@@ -160,9 +162,9 @@ class BatterService:
         # Validate player exists
         from ipl_analytics.api.services.player_service import PlayerService
         player_service = PlayerService()
-        player_service.validate_player_exists(batter_name)
+        await player_service.validate_player_exists(batter_name)
         
-        seasons_data = self.repository.get_batter_profile_by_season(batter_name, season)
+        seasons_data = await self.repository.get_batter_profile_by_season(batter_name, season)
         
         # When filtering by season, empty result means "no data for this season", not "batter not found"
         if not seasons_data:
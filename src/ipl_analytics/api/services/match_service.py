@@ -13,7 +13,7 @@ class MatchService:
     def __init__(self):
         self.repository = MatchRepository()
     
-    def get_match_info(self, match_id: int) -> MatchInfoResponse:
+    async def get_match_info(self, match_id: int) -> MatchInfoResponse:
         """
         Get match information
         
@@ -26,13 +26,13 @@ class MatchService:
         Raises:
             NotFoundError if match not found
         """
-        data = self.repository.get_match_info(match_id)
+        data = await self.repository.get_match_info(match_id)
         
         if not data:
             raise NotFoundError("Match", str(match_id))
         
         return MatchInfoResponse(**data)
 
-    def get_available_seasons(self) -> List[str]:
+    async def get_available_seasons(self) -> List[str]:
         """Return distinct seasons that have data, newest first."""
-        return self.repository.get_available_seasons()
+        return await self.repository.get_available_seasons()
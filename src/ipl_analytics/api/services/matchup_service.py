@@ -18,13 +18,14 @@ class MatchupService:
     def __init__(self):
         self.repository = MatchupRepository()
     
-    def get_batter_bowler_matchup(
+    async def get_batter_bowler_matchup(
         self,
         batter_name: str,
         bowler_name: str,
         season: Optional[str] = None,
         venue: Optional[str] = None,
-        include_phases: bool = True
+        include_phases: bool = True,
+        phase: Optional[str] = None
     ) -> BatterBowlerMatchupResponse:
         """
         Get batter vs bowler matchup analysis
@@ -35,6 +36,7 @@ class MatchupService:
             season: Optional season filter
             venue: Optional venue filter
             include_phases: Whether to include phase breakdown
+            phase: Optional phase filter
             
         Returns:
             BatterBowlerMatchupResponse object
@@ -42,45 +44,21 @@ class MatchupService:
         Raises:
             NotFoundError if matchup not found or insufficient data
         """
-        # #region agent log
-        import json, os
-        _log_paths = ["/Users/himankverma/Developer/projects/.cursor/debug.log", os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "debug.log"))]
-        _line = json.dumps({"location": "matchup_service.py:get_batter_bowler_matchup", "message": "before validation", "data": {"batter_name": batter_name, "bowler_name": bowler_name}, "timestamp": __import__("time").time() * 1000, "sessionId": "debug-session", "hypothesisId": "H1"}) + "\n"
-        for _p in _log_paths:
-            try:
-                open(_p, "a").write(_line)
-            except Exception:
-                pass
-        # #endregion
-        # Validate players exist
-        from ipl_analytics.api.services.player_service import PlayerService
-        player_service = PlayerService()
-        player_service.validate_player_exists(batter_name)
-        player_service.validate_player_exists(bowler_name)
-        # #region agent log
-        _line2 = json.dumps({"location": "matchup_service.py:get_batter_bowler_matchup", "message": "after validation", "data": {"validated": True}, "timestamp": __import__("time").time() * 1000, "sessionId": "debug-session", "hypothesisId": "H1"}) + "\n"
-        for _p in _log_paths:
-            try:
-                open(_p, "a").write(_line2)
-            except Exception:
-                pass
-        # #endregion
-        data = self.repository.get_batter_bowler_matchup(
+        # Players are resolved in memory; the matchup itself is one round trip
+        data = await self.repository.get_batter_bowler_matchup(
             batter_name,
             bowler_name,
             season,
             venue,
-            include_phases
+            include_phases,
+            phase
         )
-        # #region agent log
-        _line3 = json.dumps({"location": "matchup_service.py:get_batter_bowler_matchup", "message": "repository result", "data": {"data_is_none": data is None, "has_overall": bool(data and data.get("overall"))}, "timestamp": __import__("time").time() * 1000, "sessionId": "debug-session", "hypothesisId": "H3-H5"}) + "\n"
-        for _p in _log_paths:
-            try:
-                open(_p, "a").write(_line3)
-            except Exception:
-                pass
-        # #endregion
-        if not data:
+        
+        if not data["batter_found"]:
+            raise NotFoundError("Player", batter_name)
+        if not data["bowler_found"]:
+            raise NotFoundError("Player", bowler_name)
+        if not data["overall"]:
             raise NotFoundError(
                 "Matchup",
                 f"{batter_name} vs {bowler_name}",
@@ -0,0 +1,117 @@
+"""
+Deterministic synthetic corpus of Cricsheet-style match files for benchmarks.
+
+Matches follow the shape of real IPL files (two 20-over innings, wides and
+no-balls, wickets, registry block) so parser and loader costs are realistic,
+and a fixed seed makes every run of a given size byte-identical.
+"""
+import hashlib
+import json
+import random
+from pathlib import Path
+from typing import List
+
+BENCHMARK_MATCH_ID_START = 9_000_000
+# Bump whenever generated files change, so cached corpora are not reused
+CORPUS_VERSION = 2
+# Never real season labels: loads get partitions (and aggregate locks) of
+# their own, which cleanup can simply drop
+SEASONS = [f"Benchmark {i}" for i in range(1, 6)]
+VENUES = ["Benchmark Ground, City A", "Benchmark Oval, City B", "Benchmark Park, City C"]
+WICKET_KINDS = ["caught", "bowled", "lbw", "run out", "stumped"]
+
+
+def _squad(team: str) -> List[str]:
+    return [f"Benchmark {team} Player {i}" for i in range(1, 12)]
+
+
+def _innings(team: str, bowling: List[str], rng: random.Random) -> dict:
+    batters = _squad(team)
+    on_strike, off_strike, next_in = 0, 1, 2
+    wickets = 0
+    overs = []
+
+    for over in range(20):
+        deliveries = []
+        legal = 0
+        while legal < 6 and wickets < 10:
+            delivery = {
+                "batter": batters[on_strike],
+                "bowler": bowling[over % 5 + 6],
+                "non_striker": batters[off_strike],
+                "runs": {"batter": 0, "extras": 0, "total": 0},
+            }
+            roll = rng.random()
+            if roll < 0.04:
+                delivery["extras"] = {"wides": 1}
+                delivery["runs"]["extras"] = 1
+            elif roll < 0.05:
+                delivery["extras"] = {"noballs": 1}
+                delivery["runs"]["extras"] = 1
+            else:
+                legal += 1
+                runs = rng.choice([0, 0, 0, 1, 1, 1, 2, 4, 6])
+                delivery["runs"]["batter"] = runs
+                if roll > 0.955:
+                    delivery["wickets"] = [{
+                        "player_out": batters[on_strike],
+                        "kind": rng.choice(WICKET_KINDS),
+                    }]
+                    wickets += 1
+                    on_strike = next_in
+                    next_in += 1
+                elif runs % 2:
+                    on_strike, off_strike = off_strike, on_strike
+            delivery["runs"]["total"] = delivery["runs"]["batter"] + delivery["runs"]["extras"]
+            deliveries.append(delivery)
+
+        if not deliveries:
+            break
+        overs.append({"over": over, "deliveries": deliveries})
+        on_strike, off_strike = off_strike, on_strike
+
+    return {"team": team, "overs": overs}
+
+
+def synthetic_match(index: int, seed: int = 0) -> dict:
+    """The `index`-th match of the corpus, as a decoded Cricsheet document."""
+    rng = random.Random(seed * 1_000_003 + index)
+    home, away = f"Team {index % 8}", f"Team {(index + 1) % 8}"
+    people = {
+        name: hashlib.md5(name.encode()).hexdigest()[:8]
+        for name in _squad(home) + _squad(away)
+    }
+
+    return {
+        "meta": {"data_version": "1.1.0", "created": "2024-01-01", "revision": 1},
+        "info": {
+            "season": SEASONS[index % len(SEASONS)],
+            "venue": VENUES[index % len(VENUES)],
+            "dates": [f"20{8 + index % len(SEASONS):02d}-04-{1 + index % 28:02d}"],
+            "teams": [home, away],
+            "registry": {"people": people},
+        },
+        "innings": [
+            _innings(home, _squad(away), rng),
+            _innings(away, _squad(home), rng),
+        ],
+    }
+
+
+def write_corpus(folder_path: Path, matches: int, seed: int = 0) -> List[Path]:
+    """
+    Write `matches` files named `<match_id>.json` into `folder_path`.
+
+    Files that already exist are kept, so a corpus is generated once and
+    reused across runs.
+    """
+    folder_path.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    for index in range(matches):
+        path = folder_path / f"{BENCHMARK_MATCH_ID_START + index}.json"
+        if not path.exists():
+            path.write_text(json.dumps(synthetic_match(index, seed)))
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,211 @@
+"""
+Index usage report for the repository queries.
+
+Runs every repository query that reads deliveries once, with EXPLAIN
+capture forced on (see db/instrumentation.py), and reports which indexes
+each plan used and whether any deliveries partition was scanned
+sequentially. By default the batter, bowler, season and venue are those of
+the most frequent matchup in the database:
+
+    python -m ipl_analytics.benchmarks.index_usage
+    python -m ipl_analytics.benchmarks.index_usage --batter "V Kohli" --bowler "JJ Bumrah" --output indexes.json
+
+Exits with status 1 when an index of db/indexes.py is missing or invalid,
+when a query it serves did not use it, or when any query scanned a
+deliveries partition sequentially or could not be EXPLAINed. Partition
+indexes are reported under the parent index they are attached to.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ipl_analytics.api.config import settings
+from ipl_analytics.db.indexes import DELIVERY_INDEXES
+from ipl_analytics.db.instrumentation import query_recorder
+from ipl_analytics.db.partitions import PARTITIONED_TABLE, season_partitions
+from ipl_analytics.db.pool import DatabasePool
+from ipl_analytics.repositories.batter_repository import BatterRepository
+from ipl_analytics.repositories.matchup_repository import MatchupRepository
+from ipl_analytics.repositories.player_repository import PlayerRepository
+
+_INDEX_SCAN = re.compile(r"(?:Index (?:Only )?Scan(?: Backward)? using|Bitmap Index Scan on) (\S+)")
+_SEQ_SCAN = re.compile(r"Seq Scan on (\S+)")
+
+
+def pick_sample(cur) -> Optional[Dict[str, str]]:
+    """Batter, bowler, season and venue of the most frequent matchup"""
+    cur.execute(
+        """
+        SELECT b.player_name, bw.player_name, s.season, v.venue
+        FROM (
+            SELECT batter_id, bowler_id, season_id, venue_id
+            FROM deliveries
+            GROUP BY batter_id, bowler_id, season_id, venue_id
+            ORDER BY COUNT(*) DESC
+            LIMIT 1
+        ) d
+        JOIN players b ON b.player_id = d.batter_id
+        JOIN players bw ON bw.player_id = d.bowler_id
+        JOIN seasons s ON s.season_id = d.season_id
+        JOIN venues v ON v.venue_id = d.venue_id
+        """
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return dict(zip(("batter", "bowler", "season", "venue"), row))
+
+
+def index_status(cur) -> Dict[str, Optional[bool]]:
+    """Whether each index of DELIVERY_INDEXES is valid (None if missing)"""
+    cur.execute(
+        """
+        SELECT c.relname, x.indisvalid
+        FROM pg_class c
+        JOIN pg_index x ON x.indexrelid = c.oid
+        WHERE c.relname = ANY(%s)
+        """,
+        ([index.name for index in DELIVERY_INDEXES],),
+    )
+    valid = dict(cur.fetchall())
+    return {index.name: valid.get(index.name) for index in DELIVERY_INDEXES}
+
+
+def index_parents(cur) -> Dict[str, str]:
+    """Partition index name -> name of the index it is attached to"""
+    cur.execute(
+        """
+        SELECT c.relname, p.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE c.relkind = 'i'
+        """
+    )
+    return dict(cur.fetchall())
+
+
+async def run_queries(sample: Dict[str, str]) -> None:
+    """Run each repository query reading deliveries, plain and filtered"""
+    batters = BatterRepository()
+    matchups = MatchupRepository()
+    players = PlayerRepository()
+
+    batter_id = await batters.resolve_player_id(sample["batter"])
+    await batters._get_batter_profile_direct(batter_id)
+    await batters._get_batter_profile_by_season_direct(batter_id)
+    await batters._get_batter_profile_by_season_direct(batter_id, sample["season"])
+    await batters.get_recent_form(sample["batter"], 5)
+    await batters.get_recent_form(sample["batter"], 5, sample["season"])
+    await batters.get_highest_score(sample["batter"])
+    await matchups.get_batter_bowler_matchup(sample["batter"], sample["bowler"])
+    await matchups.get_batter_bowler_matchup(
+        sample["batter"], sample["bowler"], season=sample["season"], venue=sample["venue"]
+    )
+    await players.search_players(sample["batter"][:4])
+
+
+def build_report(
+    sample: Dict[str, str],
+    plans: List[Dict[str, Any]],
+    status: Dict[str, Optional[bool]],
+    parents: Dict[str, str],
+    partitions: List[str]
+) -> Dict[str, Any]:
+    """Indexes and sequential scans per query, and per-index coverage"""
+    queries: Dict[str, Dict[str, Any]] = {}
+    for entry in plans:
+        query = queries.setdefault(
+            entry["name"], {"runs": 0, "indexes": set(), "seq_scans": set(), "unexplained": 0}
+        )
+        query["runs"] += 1
+        if not entry["plan"]:
+            query["unexplained"] += 1
+            continue
+        for line in entry["plan"]:
+            for index in _INDEX_SCAN.findall(line):
+                query["indexes"].add(parents.get(index, index))
+            for table in _SEQ_SCAN.findall(line):
+                if table in partitions:
+                    query["seq_scans"].add(table)
+
+    indexes = {}
+    for index in DELIVERY_INDEXES:
+        used_by = sorted(name for name, q in queries.items() if index.name in q["indexes"])
+        indexes[index.name] = {
+            "valid": status[index.name],
+            "serves": list(index.serves),
+            "used_by": used_by,
+            # Only queries that ran: the matchup falls back to "matchup"
+            # on databases without the cube
+            "not_used_by": [
+                name for name in index.serves if name in queries and name not in used_by
+            ],
+        }
+
+    ok = all(
+        i["valid"] and not i["not_used_by"] for i in indexes.values()
+    ) and not any(q["seq_scans"] or q["unexplained"] for q in queries.values())
+
+    return {
+        "sample": sample,
+        "ok": ok,
+        "indexes": indexes,
+        "queries": {
+            name: {**q, "indexes": sorted(q["indexes"]), "seq_scans": sorted(q["seq_scans"])}
+            for name, q in sorted(queries.items())
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report the indexes used by the repository queries")
+    parser.add_argument("--batter", help="batter to query (default: from the most frequent matchup)")
+    parser.add_argument("--bowler", help="bowler to query")
+    parser.add_argument("--season", help="season for the season-filtered queries")
+    parser.add_argument("--venue", help="venue for the venue-filtered matchup")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Every query counts as slow, so each one is EXPLAINed; the slow-query
+    # log lines this would produce are only noise here
+    settings.db_slow_query_ms = 0
+    settings.db_explain_slow_queries = True
+    logging.getLogger("ipl_analytics.db.instrumentation").setLevel(logging.ERROR)
+
+    DatabasePool.initialize(min_conn=1, max_conn=2)
+    try:
+        with DatabasePool.get_cursor() as cur:
+            sample = pick_sample(cur)
+            if sample is None:
+                print("❌ No deliveries loaded; ingest some matches first", file=sys.stderr)
+                return 1
+            for key in sample:
+                sample[key] = getattr(args, key) or sample[key]
+            status = index_status(cur)
+            parents = index_parents(cur)
+            partitions = list(season_partitions(cur).values()) + [PARTITIONED_TABLE]
+
+        query_recorder.reset()
+        asyncio.run(run_queries(sample))
+        plans = query_recorder.snapshot()["slow_queries"]
+    finally:
+        DatabasePool.close_all()
+
+    report = build_report(sample, plans, status, parents, partitions)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Ingestion throughput benchmark.
+
+Runs the read, parse, validate and load stages over a fixed synthetic corpus
+and prints one JSON document (balls/sec, matches/sec and time per stage, plus
+the process's peak RSS) that can be saved and compared between commits:
+
+    python -m ipl_analytics.benchmarks.ingestion --matches 500 --output base.json
+    python -m ipl_analytics.benchmarks.ingestion --matches 500 --compare base.json
+
+Load stages write to the database configured through the usual DB_* settings
+and are only run with --load; point them at a scratch database. Benchmark
+matches use ids from BENCHMARK_MATCH_ID_START and seasons of their own
+("Benchmark 1", ...), so they load into separate deliveries partitions; those
+partitions, the aggregate rows of those seasons (loads maintain them like
+real ingestion does) and the benchmark's matches, players, venues and
+seasons are dropped before and after each load stage.
+"""
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ipl_analytics.benchmarks.corpus import (
+    BENCHMARK_MATCH_ID_START,
+    CORPUS_VERSION,
+    SEASONS,
+    VENUES,
+    write_corpus,
+)
+from ipl_analytics.ingestion.ingest_match import parse_match, parse_match_batch
+from ipl_analytics.ingestion.validate_match import validate_batch
+from ipl_analytics.models.delivery_batch import DeliveryBatch
+
+PARSE_STAGES = ["read", "parse_models", "parse_batch", "validate"]
+LOAD_STAGES = ["load_insert", "load_copy"]
+
+
+def _process_peak_rss_mb() -> float:
+    """
+    Peak RSS of the whole process so far. It never goes down, so it covers
+    the corpus kept in memory and every stage run, not any one stage.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_stage(run: Callable[[], None], repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _delete_benchmark_rows(matches: int) -> None:
+    from ipl_analytics.db.aggregates import installed_aggregates
+    from ipl_analytics.db.connection import get_connection
+    from ipl_analytics.db.partitions import detach_season, drop_detached
+
+    match_range = (BENCHMARK_MATCH_ID_START, BENCHMARK_MATCH_ID_START + matches)
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            # Dropping the benchmark seasons' partitions removes their deliveries
+            for season in SEASONS:
+                detached = detach_season(cur, season)
+                if detached:
+                    drop_detached(cur, detached)
+            # Left over only on databases without partitions
+            cur.execute("DELETE FROM deliveries WHERE match_id >= %s AND match_id < %s", match_range)
+            cur.execute("DELETE FROM matches WHERE match_id >= %s AND match_id < %s", match_range)
+            # Aggregate rows reference the benchmark players, venues and seasons
+            for aggregate in installed_aggregates(cur):
+                cur.execute(
+                    f"""
+                    DELETE FROM {aggregate.table}
+                    WHERE season_id IN (SELECT season_id FROM seasons WHERE season = ANY(%s))
+                    """,
+                    (SEASONS,),
+                )
+            cur.execute("DELETE FROM players WHERE player_name LIKE 'Benchmark %%'")
+            cur.execute("DELETE FROM venues WHERE venue = ANY(%s)", (VENUES,))
+            cur.execute("DELETE FROM seasons WHERE season = ANY(%s)", (SEASONS,))
+
+
+def _load(batches: List[DeliveryBatch], batch_size: int, use_copy: bool) -> None:
+    from ipl_analytics.db.session import IngestionSession
+
+    with IngestionSession(batch_size=batch_size, use_copy=use_copy) as session:
+        for batch in batches:
+            session.write_match(batch)
+
+
+def run_benchmark(
+    corpus_path: Path,
+    matches: int,
+    seed: int = 0,
+    stages: Optional[List[str]] = None,
+    repeat: int = 1,
+    batch_size: int = 10,
+) -> dict:
+    """
+    Run the requested stages and return the benchmark report.
+
+    Args:
+        corpus_path: Folder holding (or receiving) the synthetic corpus
+        matches: Number of matches in the corpus
+        seed: Corpus seed; keep it fixed when comparing runs
+        stages: Stages to run, in order (default: all parse stages)
+        repeat: Runs per stage; the fastest is reported
+        batch_size: Matches per commit in load stages
+    """
+    stages = stages or PARSE_STAGES
+    unknown = set(stages) - set(PARSE_STAGES + LOAD_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    files = write_corpus(corpus_path, matches, seed)
+    raws = [f.read_bytes() for f in files]
+    documents = [json.loads(raw) for raw in raws]
+    batches = [
+        parse_match_batch(doc, int(f.stem)) for doc, f in zip(documents, files)
+    ]
+    balls = sum(len(b) for b in batches)
+
+    def read() -> None:
+        for f in files:
+            json.loads(f.read_bytes())
+
+    def parse_models() -> None:
+        for doc, f in zip(documents, files):
+            parse_match(doc, int(f.stem))
+
+    def parse_batch() -> None:
+        for doc, f in zip(documents, files):
+            parse_match_batch(doc, int(f.stem))
+
+    def validate() -> None:
+        for batch in batches:
+            batch.validate()
+        validate_batch(DeliveryBatch.concat(batches))
+
+    runners: Dict[str, Callable[[], None]] = {
+        "read": read,
+        "parse_models": parse_models,
+        "parse_batch": parse_batch,
+        "validate": validate,
+        "load_insert": lambda: _load(batches, batch_size, use_copy=False),
+        "load_copy": lambda: _load(batches, batch_size, use_copy=True),
+    }
+
+    results = {}
+    for stage in stages:
+        is_load = stage in LOAD_STAGES
+        if is_load:
+            _delete_benchmark_rows(matches)
+        try:
+            # A load can only be timed once per clean slate
+            seconds = _time_stage(runners[stage], 1 if is_load else repeat)
+        finally:
+            if is_load:
+                _delete_benchmark_rows(matches)
+
+        results[stage] = {
+            "seconds": round(seconds, 4),
+            "balls_per_sec": round(balls / seconds, 1),
+            "matches_per_sec": round(matches / seconds, 2),
+        }
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"version": CORPUS_VERSION, "matches": matches, "balls": balls, "seed": seed},
+        "repeat": repeat,
+        "stages": results,
+        "total_seconds": round(sum(r["seconds"] for r in results.values()), 4),
+        "process_peak_rss_mb": _process_peak_rss_mb(),
+    }
+
+
+def compare(report: dict, baseline: dict) -> Dict[str, float]:
+    """Speed-up of each stage relative to `baseline` (>1 is faster)"""
+    return {
+        stage: round(baseline["stages"][stage]["seconds"] / result["seconds"], 3)
+        for stage, result in report["stages"].items()
+        if stage in baseline.get("stages", {})
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ingestion throughput")
+    parser.add_argument("--matches", type=int, default=200, help="corpus size")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument(
+        "--corpus", type=Path, default=None,
+        help="corpus folder (default: a cached folder under the system temp dir)",
+    )
+    parser.add_argument(
+        "--stages", default=",".join(PARSE_STAGES),
+        help=f"comma-separated stages from {', '.join(PARSE_STAGES + LOAD_STAGES)}",
+    )
+    parser.add_argument("--load", action="store_true", help="also run the database load stages")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per parse stage (best is kept)")
+    parser.add_argument("--batch-size", type=int, default=10, help="matches per commit when loading")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="baseline report to compare against")
+    args = parser.parse_args(argv)
+
+    stages = [s for s in args.stages.split(",") if s]
+    if args.load:
+        stages += [s for s in LOAD_STAGES if s not in stages]
+
+    corpus_path = args.corpus or (
+        Path(tempfile.gettempdir()) / f"ipl_benchmark_corpus_v{CORPUS_VERSION}_seed{args.seed}"
+    )
+
+    report = run_benchmark(
+        corpus_path,
+        args.matches,
+        seed=args.seed,
+        stages=stages,
+        repeat=args.repeat,
+        batch_size=args.batch_size,
+    )
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("corpus") != report["corpus"]:
+            print("⚠️  Baseline was run on a different corpus", file=sys.stderr)
+        report["speedup_vs_baseline"] = {
+            "baseline_commit": baseline.get("commit"),
+            "stages": compare(report, baseline),
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Incrementally maintained analytics aggregates.
+
+Per-season batter, bowler and venue totals live in analytics.*_season_stats
+tables, which the analytics views read, and analytics.matchup_cube holds
+batter-vs-bowler totals per season, venue and phase for the matchup
+endpoint.
+
+Writers maintain them as commutative deltas (AggregateDeltas): before a
+match is written, the totals of its stored deliveries (if any) are
+subtracted; once written, its new totals are added. The net change is
+folded into the tables with INSERT ... ON CONFLICT DO UPDATE SET
+col = col + EXCLUDED.col in key order, right before the batch commits.
+Concurrent writers therefore never recompute each other's rows and need no
+lock against each other, and a new match costs an index lookup of its own
+deliveries instead of season-partition scans.
+
+Whole seasons are recomputed from scratch by rebuild_aggregates() (season
+reloads, snapshot imports, and the initial fill after migrations 004/007):
+
+    python -m ipl_analytics.db.aggregates
+    python -m ipl_analytics.db.aggregates --season 2011
+
+A rebuild holds a per-season advisory lock exclusively; writers hold it
+shared while applying deltas, so a rebuild never interleaves with an apply.
+"""
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+from ipl_analytics.db.connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """An aggregate table keyed by (`key`, season_id, *`group_by`)"""
+
+    table: str
+    key: str          # deliveries column grouped on, besides season_id
+    columns: Tuple[str, ...]
+    select: str       # aggregate expressions, in `columns` order; must be
+                      # additive across matches (counts and sums)
+    group_by: Tuple[str, ...] = ()
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """Primary key columns of the table"""
+        return (self.key, "season_id") + self.group_by
+
+
+# The only definition of the aggregates: the migrations create the tables
+# and leave filling them to rebuild_aggregates(), so the initial fill,
+# rebuilds and incremental deltas can never disagree
+AGGREGATES = (
+    Aggregate(
+        table="analytics.batter_season_stats",
+        key="batter_id",
+        columns=(
+            "matches", "balls", "runs", "outs",
+            "pp_runs", "pp_balls", "mid_runs", "mid_balls", "death_runs", "death_balls",
+            "caught_outs", "bowled_outs", "lbw_outs", "stumped_outs",
+        ),
+        select="""
+            COUNT(DISTINCT match_id),
+            COUNT(*) FILTER (WHERE is_legal_ball),
+            COALESCE(SUM(runs_batter), 0),
+            COUNT(*) FILTER (WHERE is_wicket AND dismissed_batter_id = batter_id),
+            COALESCE(SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay')), 0),
+            COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay') AND is_legal_ball),
+            COALESCE(SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle')), 0),
+            COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle') AND is_legal_ball),
+            COALESCE(SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death')), 0),
+            COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death') AND is_legal_ball),
+            COUNT(*) FILTER (WHERE dismissed_batter_id = batter_id AND wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'caught')),
+            COUNT(*) FILTER (WHERE dismissed_batter_id = batter_id AND wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'bowled')),
+            COUNT(*) FILTER (WHERE dismissed_batter_id = batter_id AND wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'lbw')),
+            COUNT(*) FILTER (WHERE dismissed_batter_id = batter_id AND wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'stumped'))
+        """,
+    ),
+    Aggregate(
+        table="analytics.bowler_season_stats",
+        key="bowler_id",
+        columns=("matches", "balls", "runs_conceded", "wickets", "dot_balls"),
+        select="""
+            COUNT(DISTINCT match_id),
+            COUNT(*) FILTER (WHERE is_legal_ball),
+            COALESCE(SUM(
+                runs_batter
+                + CASE WHEN extras_type_id IN (
+                    SELECT extras_type_id FROM extras_types WHERE extras_type IN ('wides', 'noballs')
+                  ) THEN runs_extras ELSE 0 END
+            ), 0),
+            COUNT(*) FILTER (
+                WHERE is_wicket
+                  AND wicket_type_id NOT IN (
+                    SELECT wicket_type_id FROM wicket_types
+                    WHERE wicket_type IN ('run out', 'retired hurt', 'retired out', 'obstructing the field')
+                  )
+            ),
+            COUNT(*) FILTER (WHERE is_legal_ball AND runs_batter = 0 AND runs_extras = 0)
+        """,
+    ),
+    Aggregate(
+        table="analytics.venue_season_stats",
+        key="venue_id",
+        columns=("matches", "balls", "runs", "wickets"),
+        select="""
+            COUNT(DISTINCT match_id),
+            COUNT(*) FILTER (WHERE is_legal_ball),
+            COALESCE(SUM(runs_batter + runs_extras), 0),
+            COUNT(*) FILTER (WHERE is_wicket)
+        """,
+    ),
+    Aggregate(
+        table="analytics.matchup_cube",
+        key="batter_id",
+        group_by=("bowler_id", "venue_id", "phase_id"),
+        columns=("balls", "runs", "outs", "dots", "boundaries", "extras"),
+        select="""
+            COUNT(*) FILTER (WHERE is_legal_ball),
+            COALESCE(SUM(runs_batter), 0),
+            COUNT(*) FILTER (WHERE is_wicket AND dismissed_batter_id = batter_id),
+            COUNT(*) FILTER (WHERE is_legal_ball AND runs_batter = 0 AND runs_extras = 0),
+            COUNT(*) FILTER (WHERE runs_batter IN (4, 6)),
+            COALESCE(SUM(runs_extras), 0)
+        """,
+    ),
+)
+
+
+def installed_aggregates(cur) -> List[Aggregate]:
+    """Aggregates whose table exists (databases may predate later migrations)"""
+    cur.execute(
+        """
+        SELECT to_regclass(t.name) IS NOT NULL
+        FROM unnest(%s::text[]) WITH ORDINALITY AS t(name, n)
+        ORDER BY t.n
+        """,
+        ([aggregate.table for aggregate in AGGREGATES],),
+    )
+    return [aggregate for aggregate, (exists,) in zip(AGGREGATES, cur.fetchall()) if exists]
+
+
+def aggregates_installed(cur) -> bool:
+    """False on databases created before the aggregate tables existed"""
+    return bool(installed_aggregates(cur))
+
+
+def _lock_seasons(cur, season_ids: Iterable[int], shared: bool = False) -> None:
+    """
+    Per-season advisory locks between rebuilds and delta writers.
+
+    Taken in season order, and before the caller touches any aggregate
+    row, so lock waits cannot form a cycle.
+    """
+    lock = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+    for season_id in sorted(set(season_ids)):
+        cur.execute(
+            f"SELECT {lock}(hashtext('analytics_aggregates'), %s)",
+            (season_id,),
+        )
+
+
+def _select_sql(aggregate: Aggregate, where: str) -> str:
+    keys = ", ".join(aggregate.keys)
+    return f"""
+        SELECT {keys}, {aggregate.select}
+        FROM deliveries
+        WHERE {where}
+        GROUP BY {keys}
+    """
+
+
+def _insert_sql(aggregate: Aggregate, where: str) -> str:
+    keys = ", ".join(aggregate.keys)
+    columns = ", ".join(aggregate.columns)
+    return f"""
+        INSERT INTO {aggregate.table} ({keys}, {columns})
+        {_select_sql(aggregate, where)}
+    """
+
+
+class AggregateDeltas:
+    """
+    Net change to the aggregate rows, summed per row key.
+
+    Usage, for the matches of one transaction:
+
+        deltas.subtract_matches(cur, match_ids)   # before writing them
+        ... write (or replace) the matches ...
+        deltas.add_matches(cur, match_ids)        # once written
+        deltas.apply(cur)                         # before committing
+
+    Subtracting the stored totals first makes the result exact whether a
+    match is new, replaced, or partly stored already.
+    """
+
+    def __init__(self, aggregates: Sequence[Aggregate] = AGGREGATES):
+        self.aggregates = tuple(aggregates)
+        # table -> row key -> column deltas
+        self._rows: Dict[str, Dict[tuple, List[int]]] = {
+            aggregate.table: {} for aggregate in self.aggregates
+        }
+
+    def __bool__(self) -> bool:
+        return any(self._rows.values())
+
+    def subtract_matches(self, cur, match_ids: Iterable[int]) -> None:
+        """Subtract the totals of the matches' stored deliveries"""
+        self._collect(cur, match_ids, -1)
+
+    def add_matches(self, cur, match_ids: Iterable[int]) -> None:
+        """Add the totals of the matches' stored deliveries"""
+        self._collect(cur, match_ids, 1)
+
+    def _collect(self, cur, match_ids: Iterable[int], sign: int) -> None:
+        match_ids = sorted(set(match_ids))
+        if not match_ids:
+            return
+        for aggregate in self.aggregates:
+            # ix_deliveries_match_id finds the matches in every partition
+            cur.execute(_select_sql(aggregate, "match_id = ANY(%s)"), (match_ids,))
+            rows = self._rows[aggregate.table]
+            width = len(aggregate.keys)
+            for row in cur.fetchall():
+                totals = rows.setdefault(tuple(row[:width]), [0] * len(aggregate.columns))
+                for i, value in enumerate(row[width:]):
+                    totals[i] += sign * value
+
+    def update(self, other: "AggregateDeltas") -> None:
+        """Add another set of deltas (e.g. a match's) to this one"""
+        for table, rows in other._rows.items():
+            mine = self._rows.setdefault(table, {})
+            for key, values in rows.items():
+                totals = mine.setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    totals[i] += value
+
+    def clear(self) -> None:
+        for rows in self._rows.values():
+            rows.clear()
+
+    def season_ids(self) -> List[int]:
+        # season_id is the second key column of every aggregate
+        return sorted({key[1] for rows in self._rows.values() for key in rows})
+
+    def apply(self, cur) -> int:
+        """
+        Fold the deltas into the aggregate tables in the caller's
+        transaction, and drop rows whose totals fell to zero.
+
+        Returns:
+            Number of aggregate rows changed
+        """
+        _lock_seasons(cur, self.season_ids(), shared=True)
+
+        changed = 0
+        for aggregate in self.aggregates:
+            # Sorted, so concurrent writers lock shared rows in the same order
+            rows = sorted(
+                key + tuple(values)
+                for key, values in self._rows[aggregate.table].items()
+                if any(values)
+            )
+            if not rows:
+                continue
+
+            keys = ", ".join(aggregate.keys)
+            execute_values(
+                cur,
+                f"""
+                INSERT INTO {aggregate.table} AS t ({keys}, {", ".join(aggregate.columns)})
+                VALUES %s
+                ON CONFLICT ({keys}) DO UPDATE SET
+                    {", ".join(f"{c} = t.{c} + EXCLUDED.{c}" for c in aggregate.columns)}
+                """,
+                rows,
+                page_size=1000,
+            )
+
+            # A replaced match may have lost a player, venue or phase entirely
+            shrunk = [
+                key for key, values in self._rows[aggregate.table].items()
+                if any(v < 0 for v in values)
+            ]
+            if shrunk:
+                execute_values(
+                    cur,
+                    f"""
+                    DELETE FROM {aggregate.table} t
+                    USING (VALUES %s) AS k({keys})
+                    WHERE {" AND ".join(f"t.{k} = k.{k}" for k in aggregate.keys)}
+                      AND {" AND ".join(f"t.{c} = 0" for c in aggregate.columns)}
+                    """,
+                    sorted(shrunk),
+                    page_size=1000,
+                )
+            changed += len(rows)
+
+        logger.debug(f"Applied {changed} aggregate row deltas")
+        self.clear()
+        return changed
+
+
+def rebuild_aggregates(cur, season_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recompute the aggregates of whole seasons (every season when None).
+
+    Used after a season reload and to populate the tables for the first time.
+    """
+    if season_ids is not None:
+        season_ids = sorted(set(season_ids))
+        if not season_ids:
+            return
+        _lock_seasons(cur, season_ids)
+
+    for aggregate in installed_aggregates(cur):
+        if season_ids is None:
+            cur.execute(f"DELETE FROM {aggregate.table}")
+            cur.execute(_insert_sql(aggregate, "true"))
+        else:
+            cur.execute(
+                f"DELETE FROM {aggregate.table} WHERE season_id = ANY(%s::smallint[])",
+                (season_ids,),
+            )
+            cur.execute(
+                _insert_sql(aggregate, "season_id = ANY(%s::smallint[])"),
+                (season_ids,),
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Recompute the analytics aggregate tables from the stored deliveries.",
+    )
+    parser.add_argument(
+        "--season", action="append", dest="seasons",
+        help="season to rebuild; repeatable (default: every season)",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            aggregates = installed_aggregates(cur)
+            if not aggregates:
+                print("❌ No aggregate tables; run migration 004 first", file=sys.stderr)
+                return 1
+
+            season_ids = None
+            if args.seasons:
+                cur.execute(
+                    "SELECT season, season_id FROM seasons WHERE season = ANY(%s)",
+                    (args.seasons,),
+                )
+                found = dict(cur.fetchall())
+                unknown = [s for s in args.seasons if s not in found]
+                if unknown:
+                    print(f"❌ Unknown seasons: {', '.join(unknown)}", file=sys.stderr)
+                    return 1
+                season_ids = list(found.values())
+
+            rebuild_aggregates(cur, season_ids)
+            for aggregate in aggregates:
+                cur.execute(f"ANALYZE {aggregate.table}")
+
+    print(
+        f"✅ Rebuilt {', '.join(a.table for a in aggregates)} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
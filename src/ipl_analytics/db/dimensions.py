@@ -0,0 +1,129 @@
+"""
+Lookup tables behind the dictionary-encoded delivery columns.
+
+`season`, `venue`, `phase`, `extras_type` and `wicket_type` have a handful of
+distinct values each, so deliveries store a SMALLINT code per ball and the
+text lives once in a lookup table. Players are encoded the same way through
+players.player_id.
+"""
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Set
+
+from psycopg2.extras import execute_values
+
+from ipl_analytics.db.insert_players import resolve_player_ids
+from ipl_analytics.models.delivery_batch import DeliveryBatch, DeliveryChunk
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """A delivery column stored as a code into a lookup table"""
+
+    column: str       # delivery column (text value)
+    table: str        # lookup table
+    key: str          # code column, in both the lookup table and deliveries
+
+
+DIMENSIONS = (
+    Dimension("season", "seasons", "season_id"),
+    Dimension("venue", "venues", "venue_id"),
+    Dimension("extras_type", "extras_types", "extras_type_id"),
+    Dimension("wicket_type", "wicket_types", "wicket_type_id"),
+    Dimension("phase", "phases", "phase_id"),
+)
+
+PLAYERS_TABLE = "players"
+
+# Delivery column -> (lookup table, stored code column)
+ENCODED_COLUMNS: Dict[str, tuple] = {
+    "batter": (PLAYERS_TABLE, "batter_id"),
+    "bowler": (PLAYERS_TABLE, "bowler_id"),
+    "non_striker": (PLAYERS_TABLE, "non_striker_id"),
+    "dismissed_batter": (PLAYERS_TABLE, "dismissed_batter_id"),
+    **{d.column: (d.table, d.key) for d in DIMENSIONS},
+}
+
+LOOKUP_TABLES = (PLAYERS_TABLE,) + tuple(d.table for d in DIMENSIONS)
+
+
+def _column_values(deliveries: DeliveryChunk, column: str) -> Set[str]:
+    if isinstance(deliveries, DeliveryBatch):
+        values = set(getattr(deliveries, column).tolist())
+    else:
+        values = {getattr(d, column) for d in deliveries}
+    values.discard(None)
+    # Phase is an enum on Delivery models
+    return {getattr(v, "value", v) for v in values}
+
+
+def resolve_dimension_codes(
+    cur,
+    dimension: Dimension,
+    values: Set[str],
+    known: Optional[Mapping[str, int]] = None,
+) -> Dict[str, int]:
+    """
+    Map `values` to their codes in `dimension`'s lookup table, inserting new ones.
+
+    Returns:
+        value -> code for every value in `values`
+    """
+    known = known or {}
+    codes = {v: known[v] for v in values if v in known}
+
+    missing = sorted(values - codes.keys())
+    if not missing:
+        return codes
+
+    execute_values(
+        cur,
+        f"""
+        INSERT INTO {dimension.table} ({dimension.column})
+        VALUES %s
+        ON CONFLICT ({dimension.column}) DO NOTHING
+        """,
+        [(v,) for v in missing],
+    )
+    cur.execute(
+        f"""
+        SELECT {dimension.column}, {dimension.key}
+        FROM {dimension.table}
+        WHERE {dimension.column} = ANY(%s)
+        """,
+        (missing,),
+    )
+    codes.update(cur.fetchall())
+
+    return codes
+
+
+def resolve_codes(
+    cur,
+    deliveries: DeliveryChunk,
+    known: Optional[Mapping[str, Mapping[str, int]]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Codes for every encoded value in `deliveries`, inserting unseen values.
+
+    Args:
+        cur: Open cursor
+        deliveries: Delivery objects or a DeliveryBatch
+        known: Already-resolved codes per lookup table, to skip round trips
+
+    Returns:
+        lookup table -> value -> code
+    """
+    known = known or {}
+
+    codes = {
+        PLAYERS_TABLE: resolve_player_ids(cur, deliveries, known.get(PLAYERS_TABLE)),
+    }
+    for dimension in DIMENSIONS:
+        codes[dimension.table] = resolve_dimension_codes(
+            cur,
+            dimension,
+            _column_values(deliveries, dimension.column),
+            known.get(dimension.table),
+        )
+
+    return codes
@@ -0,0 +1,79 @@
+"""
+Access-path indexes of the deliveries table.
+
+Each index is designed for the repository queries listed in `serves` (query
+names as passed to BaseRepository.execute_query) and INCLUDEs the columns
+those queries read, so Postgres can answer them with index-only scans of
+the player's rows instead of scanning whole season partitions.
+
+Season filters are served by partition pruning, so season_id only appears
+as a key column where it narrows a scan within a player's rows.
+
+The indexes are declared on the partitioned table in schema.sql, so
+partitions created later (ensure_partitions) get them automatically.
+Migration 006 builds them on an existing database without blocking writes;
+keep both in sync with this list. Afterwards
+
+    python -m ipl_analytics.benchmarks.index_usage
+
+checks that every query listed here actually uses its index.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class DeliveryIndex:
+    """An index on deliveries and the repository queries it is built for"""
+
+    name: str
+    columns: Tuple[str, ...]
+    include: Tuple[str, ...] = ()
+    where: Optional[str] = None
+    serves: Tuple[str, ...] = ()
+
+
+DELIVERY_INDEXES = (
+    DeliveryIndex(
+        name="ix_deliveries_batter_match",
+        columns=("batter_id", "match_id"),
+        include=(
+            "season_id", "venue_id", "phase_id", "runs_batter", "is_legal_ball",
+            "is_wicket", "dismissed_batter_id", "wicket_type_id",
+        ),
+        serves=(
+            "batter_profile_direct",
+            "batter_profile_season_direct",
+            "recent_form_matches",
+            "recent_form_stats",
+            "highest_score",
+            "search_players",
+        ),
+    ),
+    DeliveryIndex(
+        name="ix_deliveries_matchup",
+        columns=("batter_id", "bowler_id", "season_id", "venue_id"),
+        include=(
+            "match_id", "phase_id", "runs_batter", "is_legal_ball",
+            "is_wicket", "dismissed_batter_id",
+        ),
+        serves=("matchup_cube", "matchup"),
+    ),
+    DeliveryIndex(
+        name="ix_deliveries_dismissed_batter",
+        columns=("dismissed_batter_id",),
+        include=("season_id", "batter_id", "wicket_type_id"),
+        where="is_wicket",
+        serves=("batter_profile_direct",),
+    ),
+    DeliveryIndex(
+        name="ix_deliveries_bowler_season",
+        columns=("bowler_id", "season_id"),
+        include=(
+            "match_id", "is_legal_ball", "runs_batter", "runs_extras",
+            "extras_type_id", "is_wicket", "wicket_type_id",
+        ),
+        # Incremental refresh of analytics.bowler_season_stats (db/aggregates.py)
+        serves=(),
+    ),
+)
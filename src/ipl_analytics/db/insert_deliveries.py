@@ -1,65 +1,255 @@
-from typing import Iterable
+import io
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Union
 
 from psycopg2.extras import execute_values
 
+from ipl_analytics.db.aggregates import AggregateDeltas, installed_aggregates
 from ipl_analytics.db.connection import get_connection
-from ipl_analytics.models.delivery import Delivery
-
-
-def insert_deliveries(deliveries: Iterable[Delivery]) -> None:
-    sql = """
-        INSERT INTO deliveries (
-            match_id,
-            season,
-            venue,
-            innings,
-            over,
-            ball,
-            delivery_seq,
-            batting_team,
-            batter,
-            bowler,
-            non_striker,
-            runs_batter,
-            runs_extras,
-            extras_type,
-            is_legal_ball,
-            is_wicket,
-            dismissed_batter,
-            wicket_type,
-            phase
-        )
+from ipl_analytics.db.dimensions import ENCODED_COLUMNS, resolve_codes
+from ipl_analytics.db.partitions import SEASONS_TABLE, ensure_partitions
+from ipl_analytics.models.delivery import DELIVERY_COLUMNS, Delivery
+from ipl_analytics.models.delivery_batch import DeliveryBatch, DeliveryChunk, chunk_match_ids
+
+
+# Deliveries store codes for players and the low-cardinality text columns
+STORED_COLUMNS = tuple(
+    ENCODED_COLUMNS[c][1] if c in ENCODED_COLUMNS else c
+    for c in DELIVERY_COLUMNS
+)
+
+# Unique event key; leads with the partition key, as Postgres requires
+CONFLICT_TARGET = "(season_id, match_id, innings, delivery_seq)"
+
+
+def _resolve(cur, deliveries: DeliveryChunk) -> Dict[str, Dict[str, int]]:
+    """Codes for a standalone write, creating season partitions as needed"""
+    codes = resolve_codes(cur, deliveries)
+    ensure_partitions(cur, codes[SEASONS_TABLE])
+    return codes
+
+
+def _stored_totals(cur, deliveries: DeliveryChunk) -> Optional[AggregateDeltas]:
+    """
+    Aggregate deltas of a standalone write, starting from the totals of the
+    matches' currently stored deliveries (None without aggregate tables)
+    """
+    aggregates = installed_aggregates(cur)
+    if not aggregates:
+        return None
+    deltas = AggregateDeltas(aggregates)
+    deltas.subtract_matches(cur, chunk_match_ids(deliveries))
+    return deltas
+
+
+def _refresh(cur, deliveries: DeliveryChunk, deltas: Optional[AggregateDeltas]) -> None:
+    """Bring the aggregates of a standalone write up to date in its transaction"""
+    if deltas is not None:
+        deltas.add_matches(cur, chunk_match_ids(deliveries))
+        deltas.apply(cur)
+
+
+def stored_rows(
+    deliveries: Union[DeliveryChunk, Iterable[Delivery]],
+    codes: Mapping[str, Mapping[str, int]],
+) -> Iterator[tuple]:
+    """
+    Rows in STORED_COLUMNS order, with encoded values swapped for their codes.
+
+    Args:
+        deliveries: Delivery objects or a DeliveryBatch
+        codes: lookup table -> value -> code, as returned by resolve_codes()
+    """
+    batch = (
+        deliveries if isinstance(deliveries, DeliveryBatch)
+        else DeliveryBatch.from_deliveries(deliveries)
+    )
+
+    columns = []
+    for name in DELIVERY_COLUMNS:
+        values = getattr(batch, name).tolist()
+        if name in ENCODED_COLUMNS:
+            lookup = codes[ENCODED_COLUMNS[name][0]]
+            values = [None if v is None else lookup[v] for v in values]
+        columns.append(values)
+
+    return zip(*columns)
+
+
+def write_deliveries(
+    cur,
+    deliveries: DeliveryChunk,
+    codes: Optional[Mapping[str, Mapping[str, int]]] = None,
+) -> int:
+    """
+    Insert deliveries (Delivery objects or a DeliveryBatch) through an open cursor.
+
+    Players and lookup values are resolved (and inserted), and missing season
+    partitions created, first when `codes` is not given.
+    """
+    if codes is None:
+        codes = _resolve(cur, deliveries)
+
+    sql = f"""
+        INSERT INTO deliveries ({", ".join(STORED_COLUMNS)})
         VALUES %s
-        ON CONFLICT (match_id, innings, delivery_seq) DO NOTHING
+        ON CONFLICT {CONFLICT_TARGET} DO NOTHING
     """
 
-    rows = [
-        (
-            d.match_id,
-            d.season,
-            d.venue,
-            d.innings,
-            d.over,
-            d.ball,
-            d.delivery_seq,
-            d.batting_team,
-            d.batter,
-            d.bowler,
-            d.non_striker,
-            d.runs_batter,
-            d.runs_extras,
-            d.extras_type,
-            d.is_legal_ball,
-            d.is_wicket,
-            d.dismissed_batter,
-            d.wicket_type,
-            d.phase,
-        )
-        for d in deliveries
-    ]
+    rows = list(stored_rows(deliveries, codes))
+
+    execute_values(cur, sql, rows, page_size=500)
+    return len(rows)
+
+
+def delete_match_deliveries(cur, match_id: int) -> int:
+    """Remove every delivery of a match through an open cursor."""
+    cur.execute("DELETE FROM deliveries WHERE match_id = %s", (match_id,))
+    return cur.rowcount
+
 
+def insert_deliveries(deliveries: DeliveryChunk) -> None:
     with get_connection() as conn:
         with conn.cursor() as cur:
-            execute_values(cur, sql, rows, page_size=500)
+            codes = _resolve(cur, deliveries)
+            deltas = _stored_totals(cur, deliveries)
+            count = write_deliveries(cur, deliveries, codes)
+            _refresh(cur, deliveries, deltas)
+
+    print(f"✅ Inserted deliveries (or already existed): {count}")
+
+
+# ---------------------------------------------------------------------------
+# COPY-based bulk loading
+# ---------------------------------------------------------------------------
+
+_COPY_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+
+def _copy_value(value) -> str:
+    """Render one value in COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+class _RowStream(io.RawIOBase):
+    """
+    Read-only file object that renders rows as COPY text lazily.
+
+    copy_expert pulls from it in chunks, so a whole season is never
+    materialised as one string in memory.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._lines = (
+            ("\t".join(_copy_value(v) for v in row) + "\n").encode("utf-8")
+            for row in rows
+        )
+        self._buffer = b""
+        self.rows = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self, size: int) -> None:
+        chunks = [self._buffer]
+        filled = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            filled += len(line)
+            self.rows += 1
+            if filled >= size:
+                break
+        self._buffer = b"".join(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = 1 << 62
+        if len(self._buffer) < size:
+            self._fill(size)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+def copy_deliveries(
+    deliveries: Union[DeliveryChunk, Iterable[Delivery]],
+    cur=None,
+    chunk_size: int = 1 << 16,
+    codes: Optional[Mapping[str, Mapping[str, int]]] = None,
+) -> int:
+    """
+    Bulk-load deliveries with COPY FROM STDIN and a set-based merge.
+
+    Rows are streamed into a temporary staging table and merged into
+    `deliveries` with a single INSERT ... SELECT, keeping the same
+    ON CONFLICT semantics as insert_deliveries(). Works for a single match
+    or a whole season's worth of deliveries.
+
+    Args:
+        deliveries: A DeliveryBatch, or any iterable of Delivery (consumed once)
+        cur: Optional cursor to load through; when omitted a new connection
+            is opened, the touched aggregates refreshed, and committed
+        chunk_size: Bytes handed to the server per COPY read
+        codes: Lookup codes for every encoded value in `deliveries` (see
+            resolve_codes()); resolved (and inserted), and missing season
+            partitions created, first when omitted
+
+    Returns:
+        Number of rows streamed
+    """
+    if cur is None:
+        if not isinstance(deliveries, DeliveryBatch):
+            deliveries = DeliveryBatch.from_deliveries(deliveries)
+        with get_connection() as conn:
+            with conn.cursor() as own_cur:
+                codes = codes or _resolve(own_cur, deliveries)
+                deltas = _stored_totals(own_cur, deliveries)
+                loaded = copy_deliveries(deliveries, own_cur, chunk_size, codes)
+                _refresh(own_cur, deliveries, deltas)
+        print(f"✅ Bulk-loaded deliveries (or already existed): {loaded}")
+        return loaded
+
+    if codes is None:
+        if not isinstance(deliveries, DeliveryBatch):
+            deliveries = DeliveryBatch.from_deliveries(deliveries)
+        codes = _resolve(cur, deliveries)
+
+    columns = ", ".join(STORED_COLUMNS)
+
+    cur.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS deliveries_staging
+        ON COMMIT DELETE ROWS
+        AS SELECT {columns} FROM deliveries WITH NO DATA
+    """)
+    # Rows left over from an earlier load in this transaction must not merge twice
+    cur.execute("TRUNCATE deliveries_staging")
+
+    stream = _RowStream(stored_rows(deliveries, codes))
+    cur.copy_expert(
+        f"COPY deliveries_staging ({columns}) FROM STDIN",
+        stream,
+        size=chunk_size,
+    )
+
+    cur.execute(f"""
+        INSERT INTO deliveries ({columns})
+        SELECT {columns} FROM deliveries_staging
+        ON CONFLICT {CONFLICT_TARGET} DO NOTHING
+    """)
+    cur.execute("TRUNCATE deliveries_staging")
 
-    print(f"✅ Inserted deliveries (or already existed): {len(rows)}")
+    return stream.rows
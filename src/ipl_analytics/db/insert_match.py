@@ -1,25 +1,32 @@
-from psycopg2.extras import execute_batch
-
 from ipl_analytics.db.connection import get_connection
-from ipl_analytics.models.delivery import Delivery
+from ipl_analytics.models.delivery_batch import DeliveryChunk, chunk_header
 
 
-def insert_match(deliveries: list[Delivery]) -> None:
-    if not deliveries:
-        raise ValueError("No deliveries provided")
+def write_match(cur, deliveries: DeliveryChunk, replace: bool = False) -> int:
+    """
+    Insert the match row for `deliveries` through an open cursor.
 
-    d0 = deliveries[0]
+    With replace=True an existing row is overwritten instead of kept.
+    """
+    match_id, season, venue = chunk_header(deliveries)
 
-    sql = """
+    on_conflict = (
+        "DO UPDATE SET season = EXCLUDED.season, venue = EXCLUDED.venue"
+        if replace else "DO NOTHING"
+    )
+    sql = f"""
         INSERT INTO matches (match_id, season, venue)
         VALUES (%s, %s, %s)
-        ON CONFLICT (match_id) DO NOTHING
+        ON CONFLICT (match_id) {on_conflict}
     """
 
-    row = (d0.match_id, d0.season, d0.venue)
+    cur.execute(sql, (match_id, season, venue))
+    return match_id
+
 
+def insert_match(deliveries: DeliveryChunk) -> None:
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(sql, row)
+            match_id = write_match(cur, deliveries)
 
-    print(f"✅ Inserted match {d0.match_id} (or already existed)")
+    print(f"✅ Inserted match {match_id} (or already existed)")
@@ -1,12 +1,15 @@
-from typing import Iterable, Set
+from typing import Dict, Mapping, Optional, Set
 
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_values
 
 from ipl_analytics.db.connection import get_connection
-from ipl_analytics.models.delivery import Delivery
+from ipl_analytics.models.delivery_batch import DeliveryBatch, DeliveryChunk
 
 
-def extract_players(deliveries: Iterable[Delivery]) -> Set[str]:
+def extract_players(deliveries: DeliveryChunk) -> Set[str]:
+    if isinstance(deliveries, DeliveryBatch):
+        return deliveries.players()
+
     players = set()
     for d in deliveries:
         players.add(d.batter)
@@ -17,19 +20,76 @@ def extract_players(deliveries: Iterable[Delivery]) -> Set[str]:
     return players
 
 
-def insert_players(deliveries: Iterable[Delivery]) -> None:
+def resolve_player_ids(
+    cur,
+    deliveries: DeliveryChunk,
+    known: Optional[Mapping[str, int]] = None,
+) -> Dict[str, int]:
+    """
+    Map every player of `deliveries` to its player_id, inserting new players.
+
+    Names already in `known` cost no round trip. New players get their
+    Cricsheet registry id when the batch carries one; an existing player
+    without one is backfilled.
+
+    Returns:
+        player_name -> player_id for every player in `deliveries`
+    """
     players = extract_players(deliveries)
+    known = known or {}
+
+    player_ids = {name: known[name] for name in players if name in known}
+
+    # Sorted so concurrent writers take row locks in the same order
+    missing = sorted(players - player_ids.keys())
+    if not missing:
+        return player_ids
 
-    rows = [(p,) for p in players]
+    registry = deliveries.registry if isinstance(deliveries, DeliveryBatch) else {}
 
-    sql = """
-        INSERT INTO players (player_name)
-        VALUES (%s)
+    # DO NOTHING, unlike DO UPDATE, leaves existing players unlocked, so
+    # concurrent writers touching the same players never wait on each other
+    execute_values(
+        cur,
+        """
+        INSERT INTO players (player_name, registry_id)
+        VALUES %s
         ON CONFLICT (player_name) DO NOTHING
-    """
+        """,
+        [(name, registry.get(name)) for name in missing],
+    )
+
+    # Backfill registry ids, locking only the rows that still lack one
+    backfill = [(name, registry[name]) for name in missing if registry.get(name)]
+    if backfill:
+        execute_values(
+            cur,
+            """
+            UPDATE players p
+            SET registry_id = v.registry_id
+            FROM (VALUES %s) AS v(player_name, registry_id)
+            WHERE p.player_name = v.player_name
+              AND p.registry_id IS NULL
+            """,
+            backfill,
+        )
+    cur.execute(
+        "SELECT player_name, player_id FROM players WHERE player_name = ANY(%s)",
+        (missing,),
+    )
+    player_ids.update(cur.fetchall())
+
+    return player_ids
+
+
+def write_players(cur, deliveries: DeliveryChunk) -> int:
+    """Insert the players of `deliveries` through an open cursor."""
+    return len(resolve_player_ids(cur, deliveries))
+
 
+def insert_players(deliveries: DeliveryChunk) -> None:
     with get_connection() as conn:
         with conn.cursor() as cur:
-            execute_batch(cur, sql, rows)
+            count = write_players(cur, deliveries)
 
-    print(f"✅ Inserted players (or already existed): {len(players)}")
+    print(f"✅ Inserted players (or already existed): {count}")
@@ -0,0 +1,222 @@
+"""
+Per-query instrumentation for the repositories.
+
+Every BaseRepository.execute_query() call is recorded under its query name
+(the same name that selects a prepared statement; unnamed queries are
+grouped as "unnamed"): call and error counts, rows returned, a latency
+histogram and the time spent waiting for a pool connection.
+
+Queries slower than `db_slow_query_ms` are logged as structured records and
+kept in a short in-memory list. With `db_explain_slow_queries` enabled, a
+slow query is re-run under EXPLAIN (ANALYZE, BUFFERS) on the same
+connection and the plan is kept with it. That doubles the cost of slow
+queries, so it is meant for investigations, not for normal operation.
+
+    GET /api/v1/metrics/queries
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from ipl_analytics.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+UNNAMED = "unnamed"
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SLOW_QUERY_HISTORY = 50
+
+
+class _Histogram:
+    """Fixed-bucket histogram with count, sum and max"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile, capped at the max"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and i < len(BUCKETS_MS):
+                return round(min(float(BUCKETS_MS[i]), self.max), 2)
+        return round(self.max, 2)
+
+    def buckets(self) -> Dict[str, int]:
+        labels = [f"le_{b}ms" for b in BUCKETS_MS] + [f"gt_{BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self.counts))
+
+
+class _QueryStats:
+    __slots__ = ("latency", "pool_wait", "errors", "rows", "slow")
+
+    def __init__(self):
+        self.latency = _Histogram()
+        self.pool_wait = _Histogram()
+        self.errors = 0
+        self.rows = 0
+        self.slow = 0
+
+
+class QueryRecorder:
+    """Thread-safe store of query measurements"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries: Dict[str, _QueryStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._since = datetime.now(timezone.utc)
+
+    @property
+    def slow_query_ms(self) -> float:
+        return settings.db_slow_query_ms
+
+    @property
+    def explain_slow_queries(self) -> bool:
+        return settings.db_explain_slow_queries
+
+    def record(
+        self,
+        name: Optional[str],
+        duration_ms: float,
+        pool_wait_ms: float,
+        rows: int = 0,
+        error: Optional[BaseException] = None,
+        plan: Optional[List[str]] = None
+    ) -> None:
+        """
+        Record one execution
+
+        Args:
+            name: Query name (None for unnamed queries)
+            duration_ms: Time from having a connection to having the rows
+            pool_wait_ms: Time spent waiting for the connection
+            rows: Rows returned
+            error: Exception raised by the query, if any
+            plan: EXPLAIN output captured for a slow query
+        """
+        name = name or UNNAMED
+        slow = duration_ms >= self.slow_query_ms
+
+        with self._lock:
+            stats = self._queries.get(name)
+            if stats is None:
+                stats = self._queries[name] = _QueryStats()
+            stats.latency.add(duration_ms)
+            stats.pool_wait.add(pool_wait_ms)
+            stats.rows += rows
+            if error is not None:
+                stats.errors += 1
+            if slow:
+                stats.slow += 1
+
+        if not slow:
+            return
+
+        entry = {
+            "name": name,
+            "duration_ms": round(duration_ms, 2),
+            "pool_wait_ms": round(pool_wait_ms, 2),
+            "rows": rows,
+            "error": type(error).__name__ if error is not None else None,
+            "at": datetime.now(timezone.utc).isoformat(),
+            "plan": plan,
+        }
+        with self._lock:
+            self._slow.append(entry)
+
+        logger.warning(
+            f"Slow query {name}: {duration_ms:.1f}ms "
+            f"(pool wait {pool_wait_ms:.1f}ms, {rows} rows)",
+            extra={"query": {k: v for k, v in entry.items() if k != "plan"}}
+        )
+        if plan:
+            logger.info(f"Plan of slow query {name}:\n" + "\n".join(plan))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All measurements since the last reset, slowest mean first"""
+        with self._lock:
+            queries = {}
+            for name, s in self._queries.items():
+                latency, wait = s.latency, s.pool_wait
+                queries[name] = {
+                    "count": latency.count,
+                    "errors": s.errors,
+                    "slow": s.slow,
+                    "rows": s.rows,
+                    "mean_ms": round(latency.total / latency.count, 2),
+                    "p50_ms": latency.quantile(0.50),
+                    "p95_ms": latency.quantile(0.95),
+                    "p99_ms": latency.quantile(0.99),
+                    "max_ms": round(latency.max, 2),
+                    "total_ms": round(latency.total, 2),
+                    "pool_wait_mean_ms": round(wait.total / wait.count, 2),
+                    "pool_wait_max_ms": round(wait.max, 2),
+                    "histogram": latency.buckets(),
+                }
+
+            return {
+                "since": self._since.isoformat(),
+                "slow_query_threshold_ms": self.slow_query_ms,
+                "explain_slow_queries": self.explain_slow_queries,
+                "queries": dict(sorted(
+                    queries.items(), key=lambda item: item[1]["mean_ms"], reverse=True
+                )),
+                "slow_queries": list(reversed(self._slow)),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self._slow.clear()
+            self._since = datetime.now(timezone.utc)
+
+
+def explain(cursor, query: str, params: Optional[Sequence] = None) -> Optional[List[str]]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) of `query` on `cursor`'s connection
+
+    Runs inside a savepoint so a failing EXPLAIN cannot abort the caller's
+    transaction. `query` may be an "EXECUTE <statement>" call.
+    """
+    try:
+        cursor.execute("SAVEPOINT explain_slow_query")
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params or None)
+        plan = [row[0] for row in cursor.fetchall()]
+        cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+        return plan
+    except Exception as e:
+        logger.warning(f"Could not EXPLAIN slow query: {e}")
+        try:
+            cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+        except Exception:
+            pass
+        return None
+
+
+query_recorder = QueryRecorder()
+
+
+def elapsed_ms(since: float) -> float:
+    return (time.perf_counter() - since) * 1000
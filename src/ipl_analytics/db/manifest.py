@@ -0,0 +1,137 @@
+"""
+Persisted ingestion manifest: which source files are already loaded
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from ipl_analytics.db.connection import get_connection
+
+
+MANIFEST_DDL = """
+    CREATE TABLE IF NOT EXISTS ingestion_manifest (
+        file_path TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        file_size BIGINT NOT NULL,
+        file_mtime DOUBLE PRECISION NOT NULL,
+        match_id INTEGER NOT NULL,
+        season TEXT NOT NULL,
+        deliveries INTEGER NOT NULL,
+        players INTEGER NOT NULL,
+        ingested_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+"""
+
+
+@dataclass
+class ManifestEntry:
+    """One ingested source file"""
+
+    file_path: str
+    content_hash: str
+    file_size: int
+    file_mtime: float
+    match_id: int
+    season: str
+    deliveries: int
+    players: int
+
+
+class IngestionManifest:
+    """
+    In-memory view of the ingestion_manifest table.
+
+    A file whose size and mtime match its entry is skipped without being
+    read. Otherwise its content hash decides whether it changed.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, ManifestEntry]] = None):
+        self.entries: Dict[str, ManifestEntry] = entries or {}
+
+    @classmethod
+    def load(cls) -> "IngestionManifest":
+        """Read the whole manifest (creating the table on first use)"""
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(MANIFEST_DDL)
+                cur.execute("""
+                    SELECT file_path, content_hash, file_size, file_mtime,
+                           match_id, season, deliveries, players
+                    FROM ingestion_manifest
+                """)
+                rows = cur.fetchall()
+
+        return cls({row[0]: ManifestEntry(*row) for row in rows})
+
+    def get(self, file_path: str) -> Optional[ManifestEntry]:
+        return self.entries.get(file_path)
+
+    def is_unchanged(self, file_path: str, file_size: int, file_mtime: float) -> bool:
+        """True when size and mtime still match the recorded entry"""
+        entry = self.entries.get(file_path)
+        return (
+            entry is not None
+            and entry.file_size == file_size
+            and entry.file_mtime == file_mtime
+        )
+
+    def is_unchanged_on_disk(self, file_path: str, stat: os.stat_result) -> bool:
+        """is_unchanged() for a file on disk"""
+        return self.is_unchanged(file_path, stat.st_size, stat.st_mtime)
+
+    def touch(self, entries: Iterable[ManifestEntry]) -> int:
+        """
+        Record new size/mtime for files whose content did not change.
+
+        Returns:
+            Number of entries updated
+        """
+        entries = list(entries)
+        rows = [(e.file_size, e.file_mtime, e.file_path) for e in entries]
+        if not rows:
+            return 0
+
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(
+                    """
+                    UPDATE ingestion_manifest
+                    SET file_size = %s, file_mtime = %s
+                    WHERE file_path = %s
+                    """,
+                    rows,
+                )
+
+        for e in entries:
+            self.entries[e.file_path] = e
+        return len(rows)
+
+
+def write_manifest_entry(cur, entry: ManifestEntry) -> None:
+    """Insert or replace a manifest entry through an open cursor."""
+    sql = """
+        INSERT INTO ingestion_manifest (
+            file_path, content_hash, file_size, file_mtime,
+            match_id, season, deliveries, players, ingested_at
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, now())
+        ON CONFLICT (file_path) DO UPDATE SET
+            content_hash = EXCLUDED.content_hash,
+            file_size = EXCLUDED.file_size,
+            file_mtime = EXCLUDED.file_mtime,
+            match_id = EXCLUDED.match_id,
+            season = EXCLUDED.season,
+            deliveries = EXCLUDED.deliveries,
+            players = EXCLUDED.players,
+            ingested_at = EXCLUDED.ingested_at
+    """
+    cur.execute(sql, (
+        entry.file_path,
+        entry.content_hash,
+        entry.file_size,
+        entry.file_mtime,
+        entry.match_id,
+        entry.season,
+        entry.deliveries,
+        entry.players,
+    ))
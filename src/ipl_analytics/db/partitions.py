@@ -0,0 +1,191 @@
+"""
+Season partitions of the deliveries table.
+
+`deliveries` is LIST-partitioned by season_id, one partition per season
+(`deliveries_2011`, `deliveries_2007_08`, ...). Season-filtered queries only
+scan their season's partition, and a season is reloaded by swapping its
+partition out instead of deleting its rows.
+
+Partitions are created on demand by the writers. Creating one locks the
+parent table until the transaction commits, so ingest_season() creates the
+season's partition in its own short transaction before any writer starts.
+"""
+import logging
+import re
+from typing import Dict, Iterable, Mapping, Optional, Set
+
+from ipl_analytics.db.connection import get_connection
+from ipl_analytics.db.dimensions import DIMENSIONS, resolve_dimension_codes
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = "deliveries"
+PARTITION_KEY = "season_id"
+DETACHED_SUFFIX = "_detached"
+
+_SEASONS = next(d for d in DIMENSIONS if d.key == PARTITION_KEY)
+SEASONS_TABLE = _SEASONS.table
+
+
+def partition_name(season: str) -> str:
+    """Partition table of a season: "2007/08" -> "deliveries_2007_08" """
+    slug = re.sub(r"[^a-z0-9]+", "_", season.lower()).strip("_")
+    return f"{PARTITIONED_TABLE}_{slug}"
+
+
+def is_partitioned(cur) -> bool:
+    """False on databases that predate migration 003"""
+    cur.execute(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)",
+        (PARTITIONED_TABLE,),
+    )
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+
+def season_partitions(cur) -> Dict[int, str]:
+    """
+    Attached partitions of deliveries.
+
+    Returns:
+        season_id -> partition table name
+    """
+    cur.execute(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        """,
+        (PARTITIONED_TABLE,),
+    )
+
+    partitions: Dict[int, str] = {}
+    for name, bound in cur.fetchall():
+        # "FOR VALUES IN (3)"; a DEFAULT partition has no values
+        for season_id in re.findall(r"\d+", bound or ""):
+            partitions[int(season_id)] = name
+
+    return partitions
+
+
+def ensure_partitions(
+    cur,
+    season_codes: Mapping[str, int],
+    known: Optional[Set[int]] = None,
+) -> Set[int]:
+    """
+    Create the partition of every season in `season_codes` that lacks one.
+
+    Args:
+        cur: Open cursor; new partitions are created in its transaction
+        season_codes: season -> season_id, as returned by resolve_codes()
+        known: season_ids already known to have a partition
+
+    Returns:
+        season_ids created by this call
+    """
+    missing = {
+        season: season_id
+        for season, season_id in season_codes.items()
+        if known is None or season_id not in known
+    }
+    if not missing or not is_partitioned(cur):
+        return set()
+
+    existing = season_partitions(cur)
+    created: Set[int] = set()
+
+    for season, season_id in sorted(missing.items()):
+        if season_id in existing:
+            continue
+        name = partition_name(season)
+        cur.execute(
+            f"""
+            CREATE TABLE {name}
+            PARTITION OF {PARTITIONED_TABLE}
+            FOR VALUES IN ({int(season_id)})
+            """
+        )
+        created.add(season_id)
+        logger.info(f"Created partition {name} for season {season}")
+
+    return created
+
+
+def prepare_seasons(seasons: Iterable[str]) -> Dict[str, int]:
+    """
+    Resolve season codes and create missing partitions in a transaction of
+    their own, so concurrent writers never need to.
+
+    Returns:
+        season -> season_id
+    """
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            codes = resolve_dimension_codes(cur, _SEASONS, set(seasons))
+            ensure_partitions(cur, codes)
+
+    return codes
+
+
+def detach_season(cur, season: str) -> Optional[str]:
+    """
+    Detach a season's partition and rename it out of the way.
+
+    The season's rows disappear from deliveries at once, without deleting
+    anything; attach_season() puts them back, drop_detached() discards them.
+
+    Returns:
+        Name of the detached table, or None when the season has no partition
+    """
+    cur.execute(
+        f"SELECT {_SEASONS.key} FROM {_SEASONS.table} WHERE {_SEASONS.column} = %s",
+        (season,),
+    )
+    row = cur.fetchone()
+    if row is None or not is_partitioned(cur):
+        return None
+
+    name = season_partitions(cur).get(row[0])
+    if name is None:
+        return None
+
+    detached = f"{partition_name(season)}{DETACHED_SUFFIX}"
+    cur.execute(f"DROP TABLE IF EXISTS {detached}")
+    cur.execute(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}")
+    cur.execute(f"ALTER TABLE {name} RENAME TO {detached}")
+    logger.info(f"Detached {name} as {detached}")
+    return detached
+
+
+def attach_season(cur, season: str, table: str) -> None:
+    """
+    Make `table` the season's partition again, dropping any partition that
+    replaced it.
+    """
+    cur.execute(
+        f"SELECT {_SEASONS.key} FROM {_SEASONS.table} WHERE {_SEASONS.column} = %s",
+        (season,),
+    )
+    season_id = cur.fetchone()[0]
+
+    current = season_partitions(cur).get(season_id)
+    if current is not None:
+        cur.execute(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {current}")
+        cur.execute(f"DROP TABLE {current}")
+
+    name = partition_name(season)
+    cur.execute(f"ALTER TABLE {table} RENAME TO {name}")
+    cur.execute(
+        f"""
+        ALTER TABLE {PARTITIONED_TABLE}
+        ATTACH PARTITION {name} FOR VALUES IN ({int(season_id)})
+        """
+    )
+    logger.info(f"Attached {table} as {name}")
+
+
+def drop_detached(cur, table: str) -> None:
+    """Discard a table returned by detach_season()"""
+    cur.execute(f"DROP TABLE IF EXISTS {table}")
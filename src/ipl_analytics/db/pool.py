@@ -1,70 +1,489 @@
 """
 Database connection pooling
+
+psycopg2 is a blocking driver, so async callers (the API) go through run(),
+which executes a function on a thread pool. When every connection is checked
+out, further callers wait in a first-come, first-served queue for up to
+`db_pool_timeout` seconds instead of failing straight away; only then is
+PoolTimeout raised.
 """
+import asyncio
+import functools
 import psycopg2
-from psycopg2 import pool
+from psycopg2 import extensions
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Any, Callable, Deque, Dict, Generator, Optional, TypeVar
 import logging
+import threading
+import time
 
 from ipl_analytics.api.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquisition timeout"""
+
+
+class _Waiter:
+    """A caller queued for a connection"""
+    
+    __slots__ = ("event", "conn", "may_connect")
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+        self.may_connect = False  # granted a free slot instead of a connection
+
+
+class _ConnectionInfo:
+    """Bookkeeping of one pooled connection"""
+    
+    __slots__ = ("created", "last_used")
+    
+    def __init__(self, now: float):
+        self.created = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections with a FIFO wait queue
+    
+    Unlike psycopg2's ThreadedConnectionPool, which raises PoolError as soon
+    as `max_size` connections are out, getconn() blocks until a connection
+    is returned. Returned connections are handed to the longest-waiting
+    caller directly, so a newcomer can never jump the queue.
+    
+    Connections are recycled after `max_lifetime` seconds, and idle ones
+    above `min_size` are closed after `max_idle` seconds. One that sat idle
+    for more than `ping_after` seconds is pinged before it is handed out; a
+    dead one (e.g. after a failover) is replaced by a fresh connection, so
+    callers never see the broken socket.
+    """
+    
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_lifetime: Optional[float] = 3600.0,
+        max_idle: Optional[float] = 600.0,
+        ping_after: float = 5.0
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size {min_size}-{max_size}")
+        
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        
+        self._lock = threading.Lock()
+        self._idle: Deque[Any] = deque()  # least recently used on the left
+        self._waiters: Deque[_Waiter] = deque()
+        self._info: Dict[int, _ConnectionInfo] = {}
+        self._size = 0  # open connections (and slots being opened), checked out or idle
+        self._closed = False
+        self._recycled = 0
+    
+    def warmup(self) -> int:
+        """
+        Open connections until the pool holds `min_size`
+        
+        Returns:
+            Number of connections opened
+        """
+        opened = 0
+        while True:
+            with self._lock:
+                if self._closed or self._size >= self.min_size:
+                    return opened
+                self._size += 1
+            
+            try:
+                conn = self._open()
+            except Exception:
+                self._release_slot()
+                raise
+            self.putconn(conn)
+            opened += 1
+    
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Check a connection out, waiting for one if the pool is exhausted
+        
+        Args:
+            timeout: Seconds to wait (the pool's timeout when None)
+        
+        Returns:
+            An open connection
+        
+        Raises:
+            PoolTimeout if none became available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        self._close_expired_idle()
+        
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            if self._idle and not self._waiters:
+                conn = self._idle.pop()
+                waiter = None
+            elif self._size < self.max_size and not self._waiters:
+                self._size += 1
+                conn = waiter = None
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+        
+        if waiter is not None:
+            started = time.monotonic()
+            waiter.event.wait(timeout)
+            with self._lock:
+                if not waiter.event.is_set():
+                    self._waiters.remove(waiter)
+                    raise PoolTimeout(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"({self.max_size} in use, {len(self._waiters)} waiting)"
+                    )
+            logger.debug(f"Waited {time.monotonic() - started:.3f}s for a connection")
+            conn = None if waiter.may_connect else waiter.conn
+        
+        # From here on we own a slot: reuse the connection if it is healthy,
+        # otherwise replace it
+        if conn is not None and not self._usable(conn):
+            self._discard(conn)
+            conn = None
+        
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                self._release_slot()
+                raise
+        return conn
+    
+    def putconn(self, conn, close: bool = False) -> None:
+        """
+        Return a connection; it goes to the first waiter if there is one
+        
+        Args:
+            conn: Connection from getconn()
+            close: Discard the connection instead of reusing it
+        """
+        if not close and not conn.closed:
+            try:
+                # Never hand out a connection in the middle of a transaction
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                close = True
+        
+        expired = self._expired(conn, time.monotonic())
+        if expired:
+            self._recycled += 1
+        if close or expired or conn.closed or self._closed:
+            self._discard(conn)
+            self._release_slot()
+            return
+        
+        info = self._info.get(id(conn))
+        if info is not None:
+            info.last_used = time.monotonic()
+        
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.conn = conn
+                waiter.event.set()
+            else:
+                self._idle.append(conn)
+    
+    def _open(self):
+        conn = self.connect()
+        self._info[id(conn)] = _ConnectionInfo(time.monotonic())
+        return conn
+    
+    def _discard(self, conn) -> None:
+        """Close a connection; its slot stays with the caller"""
+        self._info.pop(id(conn), None)
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+    
+    def _release_slot(self) -> None:
+        """A connection was closed: let the first waiter open a new one"""
+        with self._lock:
+            if self._waiters and not self._closed:
+                waiter = self._waiters.popleft()
+                waiter.may_connect = True
+                waiter.event.set()
+            else:
+                self._size -= 1
+    
+    def _expired(self, conn, now: float) -> bool:
+        info = self._info.get(id(conn))
+        return (
+            info is not None
+            and self.max_lifetime is not None
+            and now - info.created > self.max_lifetime
+        )
+    
+    def _usable(self, conn) -> bool:
+        """Liveness check on checkout; only idle connections cost a round trip"""
+        if conn.closed:
+            return False
+        
+        now = time.monotonic()
+        if self._expired(conn, now):
+            self._recycled += 1
+            return False
+        
+        info = self._info.get(id(conn))
+        if info is None or now - info.last_used < self.ping_after:
+            return True
+        
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            # Usually a server restart or failover, which killed the other
+            # idle connections too: drop them all rather than one per request
+            logger.warning(f"Replacing dead pooled connections: {e}")
+            self._close_idle(lambda info: True)
+            threading.Thread(target=self._rewarm, name="db-pool-warmup", daemon=True).start()
+            return False
+    
+    def _rewarm(self) -> None:
+        """Restore min_size in the background after dropping dead connections"""
+        try:
+            self.warmup()
+        except psycopg2.Error as e:
+            logger.warning(f"Could not reopen pool connections: {e}")
+    
+    def _close_expired_idle(self) -> None:
+        """Close connections idle for more than max_idle, keeping min_size"""
+        if self.max_idle is None:
+            return
+        
+        now = time.monotonic()
+        closed = self._close_idle(
+            lambda info: now - info.last_used > self.max_idle,
+            keep=self.min_size
+        )
+        if closed:
+            logger.debug(f"Closed {closed} idle connections")
+    
+    def _close_idle(self, stale: Callable[[_ConnectionInfo], bool], keep: int = 0) -> int:
+        """Close idle connections, least recently used first, while `stale`"""
+        closing = []
+        with self._lock:
+            while self._idle and self._size > keep:
+                info = self._info.get(id(self._idle[0]))
+                if info is not None and not stale(info):
+                    break
+                closing.append(self._idle.popleft())
+                self._size -= 1
+        
+        for conn in closing:
+            self._discard(conn)
+        return len(closing)
+    
+    def stats(self) -> Dict[str, int]:
+        """Current in-use, idle and waiting counts"""
+        with self._lock:
+            return {
+                "size": self._size,
+                "in_use": self._size - len(self._idle),
+                "idle": len(self._idle),
+                "waiting": len(self._waiters),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "recycled": self._recycled,
+            }
+    
+    def closeall(self) -> None:
+        """Close idle connections; checked-out ones are closed when returned"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for conn in idle:
+            self._discard(conn)
+
+
+def _connect():
+    return psycopg2.connect(
+        dbname=settings.db_name,
+        user=settings.db_user,
+        password=settings.db_password,
+        host=settings.db_host,
+        port=settings.db_port,
+    )
+
 
 class DatabasePool:
     """Manages PostgreSQL connection pool"""
     
-    _pool: Optional[pool.ThreadedConnectionPool] = None
+    _pool: Optional[ConnectionPool] = None
+    _executor: Optional[ThreadPoolExecutor] = None
     
     @classmethod
-    def initialize(cls, min_conn: int = 1, max_conn: int = 10) -> None:
-        """Initialize the connection pool"""
+    def initialize(
+        cls,
+        min_conn: Optional[int] = None,
+        max_conn: Optional[int] = None,
+        timeout: Optional[float] = None,
+        warmup: bool = True
+    ) -> None:
+        """
+        Initialize the connection pool
+        
+        Args:
+            min_conn: Connections kept open (settings.db_pool_min)
+            max_conn: Connection limit (settings.db_pool_max)
+            timeout: Seconds to wait for a connection (settings.db_pool_timeout)
+            warmup: Open min_conn connections now rather than on first use
+        
+        A database that is unreachable during warmup is not fatal: the pool
+        is still created and connects on demand once the server is back.
+        """
         if cls._pool is not None:
             logger.warning("Connection pool already initialized")
             return
         
+        min_conn = settings.db_pool_min if min_conn is None else min_conn
+        max_conn = settings.db_pool_max if max_conn is None else max_conn
+        timeout = settings.db_pool_timeout if timeout is None else timeout
+        
+        cls._pool = ConnectionPool(
+            _connect,
+            min_size=min_conn,
+            max_size=max_conn,
+            timeout=timeout,
+            max_lifetime=settings.db_pool_max_lifetime,
+            max_idle=settings.db_pool_max_idle,
+            ping_after=settings.db_pool_ping_after,
+        )
+        # More threads than connections: surplus requests queue in the
+        # pool, where waits are fair, bounded and visible in stats()
+        cls._executor = ThreadPoolExecutor(
+            max_workers=2 * max_conn,
+            thread_name_prefix="db",
+        )
+        logger.info(
+            f"Database connection pool initialized ({min_conn}-{max_conn} connections, "
+            f"{timeout:g}s timeout)"
+        )
+        
+        if warmup:
+            cls.warmup()
+    
+    @classmethod
+    def warmup(cls) -> int:
+        """
+        Open connections up to the pool minimum
+        
+        Returns:
+            Number of connections opened (0 if the database is unreachable)
+        """
+        if cls._pool is None:
+            raise RuntimeError("Connection pool not initialized. Call initialize() first.")
+        
+        started = time.perf_counter()
         try:
-            cls._pool = pool.ThreadedConnectionPool(
-                minconn=min_conn,
-                maxconn=max_conn,
-                dbname=settings.db_name,
-                user=settings.db_user,
-                password=settings.db_password,
-                host=settings.db_host,
-                port=settings.db_port,
-            )
-            logger.info(f"Database connection pool initialized ({min_conn}-{max_conn} connections)")
-        except Exception as e:
-            logger.error(f"Failed to initialize connection pool: {e}")
-            raise
+            opened = cls._pool.warmup()
+        except psycopg2.Error as e:
+            logger.warning(f"Connection pool warmup failed, connecting on demand: {e}")
+            return 0
+        if opened:
+            logger.info(f"Warmed up {opened} connections in {time.perf_counter() - started:.2f}s")
+        return opened
     
     @classmethod
-    def get_connection(cls):
-        """Get a connection from the pool"""
+    def is_initialized(cls) -> bool:
+        """Whether the connection pool has been created"""
+        return cls._pool is not None
+    
+    @classmethod
+    def get_connection(cls, timeout: Optional[float] = None):
+        """
+        Get a connection from the pool, waiting if all are in use
+        
+        Raises:
+            PoolTimeout if none became available within the timeout
+        """
         if cls._pool is None:
             raise RuntimeError("Connection pool not initialized. Call initialize() first.")
         
         try:
-            return cls._pool.getconn()
+            return cls._pool.getconn(timeout)
+        except PoolTimeout as e:
+            logger.warning(str(e))
+            raise
         except Exception as e:
             logger.error(f"Failed to get connection from pool: {e}")
             raise
     
     @classmethod
-    def return_connection(cls, conn) -> None:
+    def return_connection(cls, conn, close: bool = False) -> None:
         """Return a connection to the pool"""
         if cls._pool is None:
+            conn.close()
             return
         
         try:
-            cls._pool.putconn(conn)
+            cls._pool.putconn(conn, close=close or conn.closed)
         except Exception as e:
             logger.error(f"Failed to return connection to pool: {e}")
     
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """In-use, idle and waiting connection counts (empty before initialize())"""
+        return cls._pool.stats() if cls._pool is not None else {}
+    
+    @classmethod
+    async def run(cls, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking database function without blocking the event loop
+        
+        Args:
+            func: Function that uses pool connections (e.g. via get_cursor)
+            *args, **kwargs: Passed to func
+        
+        Returns:
+            func's return value
+        """
+        if cls._executor is None:
+            raise RuntimeError("Connection pool not initialized. Call initialize() first.")
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            cls._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+    
     @classmethod
     def close_all(cls) -> None:
         """Close all connections in the pool"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
         if cls._pool is not None:
             cls._pool.closeall()
             cls._pool = None
@@ -75,24 +494,21 @@ class DatabasePool:
     def get_cursor(cls) -> Generator:
         """Context manager for database cursor"""
         conn = None
+        cursor = None
         try:
             conn = cls.get_connection()
             cursor = conn.cursor()
             yield cursor
             conn.commit()
         except Exception as e:
-            if conn:
-                conn.rollback()
+            if conn and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
             raise
         finally:
-            if cursor:
+            if cursor and not cursor.closed:
                 cursor.close()
             if conn:
                 cls.return_connection(conn)
-
-
-# Initialize pool on module import
-try:
-    DatabasePool.initialize()
-except Exception as e:
-    logger.warning(f"Could not initialize database pool on import: {e}")
@@ -0,0 +1,127 @@
+"""
+Per-connection cache of server-side prepared statements.
+
+psycopg2 sends the full text of every query, so Postgres parses and plans
+the large profile and matchup CTEs on each request. A query run through
+PreparedStatementCache.execute() (BaseRepository.execute_query(..., name=...))
+is instead PREPAREd once per pooled connection and
+afterwards only EXECUTEd, which skips parsing and, once Postgres settles on
+a generic plan, planning too.
+
+Statements are named after the caller's label plus a hash of the SQL, so
+queries assembled from optional filters get one statement per variant.
+Which statements a connection holds is tracked against the connection
+object itself, so the cache lives exactly as long as the pooled connection
+does and is rebuilt transparently when the pool replaces it.
+"""
+import logging
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Optional, Sequence, Set
+from weakref import WeakKeyDictionary
+
+from psycopg2 import errors
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%s")
+
+
+def statement_name(label: str, query: str) -> str:
+    """Server-side name of a query: "<label>_<crc32 of the SQL>" """
+    return f"{label}_{zlib.crc32(query.encode('utf-8')):08x}"
+
+
+def to_server_params(query: str) -> str:
+    """Rewrite psycopg2 %s placeholders as $1, $2, ... for PREPARE"""
+    counter = iter(range(1, 1_000_000))
+    return _PLACEHOLDER.sub(lambda _: f"${next(counter)}", query)
+
+
+def execute_command(label: str, query: str, params: Optional[Sequence] = None) -> str:
+    """EXECUTE statement (with %s placeholders for `params`) running `query`"""
+    args = f" ({', '.join(['%s'] * len(params))})" if params else ""
+    return f"EXECUTE {statement_name(label, query)}{args}"
+
+
+class PreparedStatementCache:
+    """Which statements each connection has prepared, plus hit counters"""
+
+    def __init__(self):
+        self._prepared: "WeakKeyDictionary[Any, Optional[Set[str]]]" = WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._prepares: Dict[str, int] = defaultdict(int)
+
+    def execute(self, cursor, label: str, query: str, params: Optional[Sequence] = None) -> None:
+        """
+        Run `query` on `cursor` as a prepared statement
+
+        Args:
+            cursor: Cursor of a pooled connection
+            label: Stable name of the query, used in the statement name and stats
+            query: SQL with %s placeholders
+            params: Query parameters
+        """
+        conn = cursor.connection
+        name = statement_name(label, query)
+
+        with self._lock:
+            prepared = self._prepared.get(conn)
+            stale = conn in self._prepared and prepared is None
+            if prepared is None:
+                prepared = self._prepared[conn] = set()
+            is_prepared = name in prepared
+
+        if stale:
+            # See forget(): the server may still hold statements we lost track of
+            cursor.execute("DEALLOCATE ALL")
+
+        if not is_prepared:
+            cursor.execute(f"PREPARE {name} AS {to_server_params(query)}")
+            with self._lock:
+                prepared.add(name)
+                self._prepares[label] += 1
+        else:
+            with self._lock:
+                self._hits[label] += 1
+
+        try:
+            cursor.execute(execute_command(label, query, params), params or None)
+        except (errors.InvalidSqlStatementName, errors.FeatureNotSupported):
+            # Deallocated behind our back, or a cached plan invalidated by a
+            # schema change ("cached plan must not change result type")
+            self.forget(conn)
+            raise
+
+    def forget(self, conn) -> None:
+        """
+        Start over on a connection whose statements are in an unknown state.
+
+        The failed transaction cannot run DEALLOCATE, so the next execute()
+        on the connection deallocates everything before preparing again.
+        """
+        with self._lock:
+            self._prepared[conn] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits and prepares per query label"""
+        with self._lock:
+            labels = sorted(set(self._hits) | set(self._prepares))
+            hits = sum(self._hits.values())
+            prepares = sum(self._prepares.values())
+            return {
+                "hits": hits,
+                "prepares": prepares,
+                "hit_ratio": round(hits / (hits + prepares), 4) if hits + prepares else None,
+                "connections": len(self._prepared),
+                "queries": {
+                    label: {"hits": self._hits[label], "prepares": self._prepares[label]}
+                    for label in labels
+                },
+            }
+
+
+prepared_statements = PreparedStatementCache()
@@ -0,0 +1,296 @@
+"""
+Ingestion session: two pooled connections and batched commits per run
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from ipl_analytics.db.aggregates import AggregateDeltas, installed_aggregates
+from ipl_analytics.api.config import settings
+from ipl_analytics.db.pool import DatabasePool
+from ipl_analytics.db.dimensions import PLAYERS_TABLE, resolve_codes
+from ipl_analytics.db.insert_match import write_match
+from ipl_analytics.db.insert_deliveries import (
+    write_deliveries,
+    copy_deliveries,
+    delete_match_deliveries,
+)
+from ipl_analytics.db.manifest import ManifestEntry, write_manifest_entry
+from ipl_analytics.db.partitions import SEASONS_TABLE, ensure_partitions
+from ipl_analytics.models.delivery_batch import DeliveryChunk, chunk_header
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_pool(sessions: int = 1) -> None:
+    """
+    Create the connection pool, large enough for `sessions` concurrent
+    IngestionSessions, unless it already exists
+    """
+    needed = IngestionSession.CONNECTIONS * sessions
+    if not DatabasePool.is_initialized():
+        DatabasePool.initialize(max_conn=max(settings.db_pool_max, needed))
+    elif DatabasePool.stats()["max_size"] < needed:
+        logger.warning(
+            f"Connection pool allows {DatabasePool.stats()['max_size']} connections; "
+            f"{sessions} ingestion sessions need {needed} and will wait for each other"
+        )
+
+
+class IngestionSession:
+    """
+    Owns two pooled connections for the length of an ingestion run.
+
+    Each match is written inside its own savepoint, so a failing match never
+    leaves partial rows behind, and the transaction is committed every
+    `batch_size` matches. Use as a context manager: pending matches are
+    committed on a clean exit and rolled back if an exception escapes.
+
+    Aggregate rows (see db.aggregates) are brought up to date with the
+    pending matches' deltas right before each commit, in the same
+    transaction.
+
+    Players and lookup values are inserted, and season partitions created,
+    on the second connection in autocommit mode, so each of those statements
+    commits at once. The batch transaction itself then only inserts rows
+    that reference them, and concurrent writers whose matches share
+    players never hold locks on the same player rows. Size the pool with
+    ensure_pool() for the number of concurrent sessions.
+    """
+
+    # Pool connections checked out by an open session
+    CONNECTIONS = 2
+
+    def __init__(
+        self,
+        batch_size: int = 10,
+        use_copy: bool = False,
+        maintain_aggregates: bool = True,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.maintain_aggregates = maintain_aggregates
+        self.matches_written = 0
+        self.deliveries_written = 0
+
+        self._conn = None
+        self._lookup_conn = None
+        self._pending = 0
+        # lookup table -> value -> code (player ids, season codes, ...) seen
+        # so far, so each value is looked up once per run; committed as soon
+        # as resolved, so they stay valid when a batch rolls back
+        self._codes: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # season_ids whose deliveries partition is known to exist
+        self._partitions: Set[int] = set()
+        # Aggregate deltas of uncommitted matches (None until the installed
+        # aggregate tables are known), and the ids of those matches
+        self._deltas: Optional[AggregateDeltas] = None
+        self._batch_matches: List[int] = []
+
+    def __enter__(self) -> "IngestionSession":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
+
+    def open(self) -> None:
+        """Check the batch and lookup connections out of the pool"""
+        if self._conn is not None:
+            return
+        ensure_pool()
+        self._conn = DatabasePool.get_connection()
+        try:
+            self._lookup_conn = DatabasePool.get_connection()
+        except Exception:
+            # Never hold one slot while waiting out a failure for the other
+            DatabasePool.return_connection(self._conn)
+            self._conn = None
+            raise
+        self._lookup_conn.autocommit = True
+
+    def close(self) -> None:
+        """Return the connections to the pool"""
+        if self._lookup_conn is not None:
+            try:
+                self._lookup_conn.autocommit = False
+                DatabasePool.return_connection(self._lookup_conn)
+            except Exception:
+                DatabasePool.return_connection(self._lookup_conn, close=True)
+            self._lookup_conn = None
+        if self._conn is None:
+            return
+        DatabasePool.return_connection(self._conn)
+        self._conn = None
+
+    @property
+    def pending(self) -> int:
+        """Matches written but not yet committed"""
+        return self._pending
+
+    def write_match(
+        self,
+        deliveries: DeliveryChunk,
+        replace: bool = False,
+        manifest_entry: Optional[ManifestEntry] = None,
+    ) -> None:
+        """
+        Write players, match and deliveries of one match atomically.
+
+        Args:
+            deliveries: All deliveries of a single match (Delivery objects
+                or a DeliveryBatch)
+            replace: Delete the match's existing deliveries first, so a
+                corrected source file fully supersedes the stored rows
+            manifest_entry: Manifest record committed together with the match
+        """
+        if not len(deliveries):
+            raise ValueError("No deliveries provided")
+
+        self.write_match_stream([deliveries], replace, manifest_entry)
+
+    def write_match_stream(
+        self,
+        chunks: Iterable[DeliveryChunk],
+        replace: bool = False,
+        manifest_entry: Optional[ManifestEntry] = None,
+    ) -> int:
+        """
+        Write one match delivered as a stream of chunks (innings or overs).
+
+        Every chunk is flushed as soon as it arrives, inside one savepoint,
+        so memory stays bounded by the chunk size while the match is still
+        written atomically.
+
+        Args:
+            chunks: Consecutive delivery chunks of a single match
+            replace: Delete the match's existing deliveries first
+            manifest_entry: Manifest record committed together with the match;
+                its row counts are filled in from the streamed rows
+
+        Returns:
+            Number of deliveries written
+        """
+        if self._conn is None:
+            raise RuntimeError("Ingestion session is not open")
+
+        count = 0
+        players: Set[str] = set()
+        match_id = None
+        match_deltas = None
+
+        with self._conn.cursor() as cur:
+            cur.execute("SAVEPOINT ingest_match")
+            try:
+                match_written = False
+                for chunk in chunks:
+                    if not len(chunk):
+                        continue
+
+                    codes = self._resolve(chunk)
+                    players |= codes[PLAYERS_TABLE].keys()
+
+                    if not match_written:
+                        match_id = chunk_header(chunk)[0]
+                        deltas = self._aggregate_deltas(cur)
+                        if deltas is not None and match_id not in self._batch_matches:
+                            # Whatever is stored for the match now is superseded
+                            match_deltas = AggregateDeltas(deltas.aggregates)
+                            match_deltas.subtract_matches(cur, [match_id])
+                        write_match(cur, chunk, replace=replace)
+                        if replace:
+                            delete_match_deliveries(cur, match_id)
+                        match_written = True
+
+                    if self.use_copy:
+                        count += copy_deliveries(chunk, cur, codes=codes)
+                    else:
+                        count += write_deliveries(cur, chunk, codes)
+
+                if not match_written:
+                    raise ValueError("No deliveries provided")
+
+                if manifest_entry is not None:
+                    manifest_entry.deliveries = count
+                    manifest_entry.players = len(players)
+                    write_manifest_entry(cur, manifest_entry)
+            except Exception:
+                cur.execute("ROLLBACK TO SAVEPOINT ingest_match")
+                raise
+            cur.execute("RELEASE SAVEPOINT ingest_match")
+
+        if match_deltas is not None:
+            self._deltas.update(match_deltas)
+        self._batch_matches.append(match_id)
+        self.matches_written += 1
+        self.deliveries_written += count
+        self._pending += 1
+
+        if self._pending >= self.batch_size:
+            self.commit()
+
+        return count
+
+    def commit(self) -> None:
+        """Apply the aggregate deltas and commit all matches written since the last commit"""
+        if self._conn is None or self._pending == 0:
+            return
+        if self._deltas is not None:
+            try:
+                with self._conn.cursor() as cur:
+                    self._deltas.add_matches(cur, self._batch_matches)
+                    changed = self._deltas.apply(cur)
+                logger.debug(f"Applied {changed} aggregate row deltas for {self._pending} matches")
+            except Exception:
+                self.rollback()
+                raise
+        self._conn.commit()
+        logger.debug(f"Committed {self._pending} matches")
+        self._pending = 0
+        self._batch_matches.clear()
+
+    def rollback(self) -> None:
+        """Discard all matches written since the last commit"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.rollback()
+        except Exception as e:
+            logger.error(f"Failed to roll back ingestion session: {e}")
+        self._pending = 0
+        self._batch_matches.clear()
+        if self._deltas is not None:
+            self._deltas.clear()
+
+    def _resolve(self, chunk: DeliveryChunk) -> Mapping[str, Mapping[str, int]]:
+        """
+        Codes of every encoded value in `chunk`, inserting new values and
+        creating missing partitions on the autocommit lookup connection
+        """
+        with self._lookup_conn.cursor() as cur:
+            codes = resolve_codes(cur, chunk, self._codes)
+            for table, table_codes in codes.items():
+                self._codes[table].update(table_codes)
+            ensure_partitions(cur, codes[SEASONS_TABLE], self._partitions)
+            self._partitions.update(codes[SEASONS_TABLE].values())
+        return codes
+
+    def _aggregate_deltas(self, cur) -> Optional[AggregateDeltas]:
+        """Pending deltas, or None when aggregates are not maintained"""
+        if self.maintain_aggregates and self._deltas is None:
+            aggregates = installed_aggregates(cur)
+            if not aggregates:
+                logger.warning("Aggregate tables missing; run migration 004 to maintain them")
+                self.maintain_aggregates = False
+            else:
+                self._deltas = AggregateDeltas(aggregates)
+        return self._deltas
@@ -0,0 +1,332 @@
+"""
+Parquet snapshots of the delivery store.
+
+A snapshot is a folder that pandas (or any Parquet reader) can open directly:
+
+    snapshot.json                        seasons, row counts, format version
+    players.parquet                      player_name, registry_id
+    matches.parquet                      match_id, season, venue
+    manifest.parquet                     ingestion_manifest rows
+    deliveries/season_key=2011/part-0.parquet
+    deliveries/season_key=2007_08/part-0.parquet
+    ...
+
+Deliveries are stored decoded (DELIVERY_COLUMNS, player names rather than
+ids), so a snapshot does not depend on the codes of the database it came
+from. Importing bulk-loads one season per transaction with COPY.
+
+    ipl-snapshot export snapshots/2024-05-01
+    ipl-snapshot import snapshots/2024-05-01 --season 2011
+
+    pd.read_parquet("snapshots/2024-05-01/deliveries")
+
+Needs pyarrow (`pip install 'ipl-analytics[parquet]'`); it is imported on
+first use so the rest of the package works without it.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from psycopg2.extras import execute_values
+
+from ipl_analytics.db.aggregates import aggregates_installed, rebuild_aggregates
+from ipl_analytics.db.connection import get_connection
+from ipl_analytics.db.dimensions import resolve_codes
+from ipl_analytics.db.insert_deliveries import copy_deliveries
+from ipl_analytics.db.manifest import MANIFEST_DDL, ManifestEntry, write_manifest_entry
+from ipl_analytics.db.partitions import (
+    SEASONS_TABLE,
+    detach_season,
+    drop_detached,
+    ensure_partitions,
+    partition_name,
+    prepare_seasons,
+)
+from ipl_analytics.models.delivery import DELIVERY_COLUMNS
+from ipl_analytics.models.delivery_batch import DeliveryBatch
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = "snapshot.json"
+DELIVERIES_DIR = "deliveries"
+
+# Hive-style directory key; not "season", which the files already contain
+PARTITION_KEY = "season_key"
+
+_MANIFEST_COLUMNS = tuple(f.name for f in fields(ManifestEntry))
+
+
+def _pandas():
+    """pandas, after checking a Parquet engine is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet snapshots need pyarrow: pip install 'ipl-analytics[parquet]'"
+        ) from e
+
+    import pandas as pd
+    return pd
+
+
+def season_dir(season: str) -> str:
+    """Directory of a season under deliveries/: "2007/08" -> "season_key=2007_08" """
+    return f"{PARTITION_KEY}={partition_name(season)[len('deliveries_'):]}"
+
+
+def batch_to_frame(batch: DeliveryBatch):
+    """DataFrame with one column per DELIVERY_COLUMNS entry"""
+    pd = _pandas()
+    return pd.DataFrame({name: getattr(batch, name) for name in DELIVERY_COLUMNS})
+
+
+def frame_to_batch(frame, registry: Optional[Dict[str, str]] = None) -> DeliveryBatch:
+    """
+    Inverse of batch_to_frame().
+
+    Text columns may come back as pandas string columns with NaN for
+    missing values; they are turned back into None.
+    """
+    columns = {}
+    for name in DELIVERY_COLUMNS:
+        column = frame[name]
+        if column.dtype.kind in "iub":
+            columns[name] = column.to_numpy()
+        else:
+            values = column.astype(object)
+            columns[name] = values.where(values.notna(), None).to_numpy()
+    return DeliveryBatch(registry=registry, **columns)
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _fetch_season(cur, season: str) -> DeliveryBatch:
+    cur.execute(
+        f"""
+        SELECT {", ".join(DELIVERY_COLUMNS)}
+        FROM deliveries_named
+        WHERE season_id = (SELECT season_id FROM seasons WHERE season = %s)
+        ORDER BY match_id, innings, delivery_seq
+        """,
+        (season,),
+    )
+    return DeliveryBatch.from_rows(cur.fetchall())
+
+
+def export_snapshot(path: Path, seasons: Optional[Sequence[str]] = None) -> dict:
+    """
+    Write deliveries, matches, players and the ingestion manifest to `path`.
+
+    Args:
+        path: Snapshot folder (created; existing season files are overwritten)
+        seasons: Seasons to export (all seasons with deliveries when None)
+
+    Returns:
+        The snapshot.json document
+    """
+    pd = _pandas()
+    started = time.perf_counter()
+    path.mkdir(parents=True, exist_ok=True)
+
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT s.season
+                FROM {SEASONS_TABLE} s
+                WHERE EXISTS (SELECT 1 FROM deliveries d WHERE d.season_id = s.season_id)
+                ORDER BY s.season
+            """)
+            available = [row[0] for row in cur.fetchall()]
+            selected = list(seasons) if seasons else available
+            unknown = sorted(set(selected) - set(available))
+            if unknown:
+                raise ValueError(f"No deliveries stored for seasons: {', '.join(unknown)}")
+
+            document = {
+                "version": SNAPSHOT_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "columns": list(DELIVERY_COLUMNS),
+                "seasons": {},
+            }
+
+            for season in selected:
+                batch = _fetch_season(cur, season)
+                season_path = path / DELIVERIES_DIR / season_dir(season)
+                season_path.mkdir(parents=True, exist_ok=True)
+                batch_to_frame(batch).to_parquet(season_path / "part-0.parquet", index=False)
+
+                document["seasons"][season] = {
+                    "path": f"{DELIVERIES_DIR}/{season_dir(season)}",
+                    "matches": len(set(batch.match_id.tolist())),
+                    "deliveries": len(batch),
+                }
+                print(f"📤 {season}: {len(batch)} deliveries")
+
+            cur.execute(
+                "SELECT match_id, season, venue FROM matches WHERE season = ANY(%s) ORDER BY match_id",
+                (selected,),
+            )
+            matches = pd.DataFrame(cur.fetchall(), columns=["match_id", "season", "venue"])
+            matches.to_parquet(path / "matches.parquet", index=False)
+
+            cur.execute("SELECT player_name, registry_id FROM players ORDER BY player_name")
+            players = pd.DataFrame(cur.fetchall(), columns=["player_name", "registry_id"])
+            players.to_parquet(path / "players.parquet", index=False)
+
+            cur.execute(MANIFEST_DDL)
+            cur.execute(
+                f"""
+                SELECT {", ".join(_MANIFEST_COLUMNS)}
+                FROM ingestion_manifest
+                WHERE season = ANY(%s)
+                ORDER BY file_path
+                """,
+                (selected,),
+            )
+            manifest = pd.DataFrame(cur.fetchall(), columns=list(_MANIFEST_COLUMNS))
+            manifest.to_parquet(path / "manifest.parquet", index=False)
+
+    (path / SNAPSHOT_FILE).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    deliveries = sum(s["deliveries"] for s in document["seasons"].values())
+    print(f"✅ Exported {len(selected)} seasons, {deliveries} deliveries, {len(players)} players "
+          f"to {path} in {time.perf_counter() - started:.1f}s")
+    return document
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def load_snapshot_document(path: Path) -> dict:
+    document = json.loads((path / SNAPSHOT_FILE).read_text(encoding="utf-8"))
+    if document.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {document.get('version')} (expected {SNAPSHOT_VERSION})"
+        )
+    return document
+
+
+def import_snapshot(
+    path: Path,
+    seasons: Optional[Sequence[str]] = None,
+    replace: bool = False,
+) -> int:
+    """
+    Bulk-load a snapshot written by export_snapshot().
+
+    Each season is loaded in its own transaction: players and lookup values
+    are resolved once for the whole season, deliveries are streamed with
+    COPY and the season's aggregates are rebuilt. Rows already present are
+    kept (same ON CONFLICT rules as ingestion) unless `replace` is set, in
+    which case the season's partition is swapped out first.
+
+    Args:
+        path: Snapshot folder
+        seasons: Seasons to import (all seasons in the snapshot when None)
+        replace: Drop the season's stored deliveries before loading
+
+    Returns:
+        Number of deliveries loaded
+    """
+    pd = _pandas()
+    started = time.perf_counter()
+
+    document = load_snapshot_document(path)
+    selected = list(seasons) if seasons else list(document["seasons"])
+    unknown = sorted(set(selected) - set(document["seasons"]))
+    if unknown:
+        raise ValueError(f"Seasons not in snapshot: {', '.join(unknown)}")
+
+    players = pd.read_parquet(path / "players.parquet")
+    registry = {
+        name: registry_id
+        for name, registry_id in zip(players["player_name"], players["registry_id"])
+        if isinstance(registry_id, str)
+    }
+    matches = pd.read_parquet(path / "matches.parquet")
+    manifest = pd.read_parquet(path / "manifest.parquet")
+
+    season_ids = prepare_seasons(selected)
+    loaded = 0
+
+    for season in selected:
+        info = document["seasons"][season]
+        batch = frame_to_batch(pd.read_parquet(path / info["path"]), registry)
+        batch.validate()
+
+        season_matches = matches[matches["season"] == season]
+        season_manifest = manifest[manifest["season"] == season]
+
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                if replace:
+                    detached = detach_season(cur, season)
+                    if detached:
+                        drop_detached(cur, detached)
+                        ensure_partitions(cur, {season: season_ids[season]})
+
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO matches (match_id, season, venue)
+                    VALUES %s
+                    ON CONFLICT (match_id) DO NOTHING
+                    """,
+                    list(season_matches.itertuples(index=False, name=None)),
+                )
+
+                codes = resolve_codes(cur, batch)
+                loaded += copy_deliveries(batch, cur, codes=codes)
+
+                cur.execute(MANIFEST_DDL)
+                for row in season_manifest.itertuples(index=False, name=None):
+                    write_manifest_entry(cur, ManifestEntry(*row))
+
+                if aggregates_installed(cur):
+                    rebuild_aggregates(cur, [season_ids[season]])
+
+        print(f"📥 {season}: {len(batch)} deliveries")
+
+    print(f"✅ Imported {len(selected)} seasons, {loaded} deliveries from {path} "
+          f"in {time.perf_counter() - started:.1f}s")
+    return loaded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ipl-snapshot",
+        description="Export or import a Parquet snapshot of the delivery store.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = commands.add_parser("export", help="write a snapshot of the database")
+    export_cmd.add_argument("path", type=Path, help="snapshot folder")
+    export_cmd.add_argument("--season", action="append", dest="seasons", help="season to export; repeatable")
+
+    import_cmd = commands.add_parser("import", help="bulk-load a snapshot into the database")
+    import_cmd.add_argument("path", type=Path, help="snapshot folder")
+    import_cmd.add_argument("--season", action="append", dest="seasons", help="season to import; repeatable")
+    import_cmd.add_argument("--replace", action="store_true", help="drop the stored deliveries of each season first")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "export":
+            export_snapshot(args.path, args.seasons)
+        else:
+            import_snapshot(args.path, args.seasons, replace=args.replace)
+    except (ImportError, ValueError, FileNotFoundError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Read Cricsheet match files straight out of a zip or tar archive.
+
+Members are decompressed one at a time in archive order, so nothing is
+extracted to disk and only the member being handed out is held in memory.
+"""
+import tarfile
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator, Optional, Tuple
+
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+@dataclass
+class ArchiveMember:
+    """One match file inside an archive"""
+
+    name: str
+    match_id: int
+    file_size: int
+    file_mtime: float
+
+
+def is_archive(path: Path) -> bool:
+    """True when `path` is a file with a supported archive suffix"""
+    return path.is_file() and path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _match_id(member_name: str) -> Optional[int]:
+    """Match id of a `<match_id>.json` member, None for anything else"""
+    path = PurePosixPath(member_name)
+    if path.suffix != ".json" or path.name.startswith("."):
+        return None
+    try:
+        return int(path.stem)
+    except ValueError:
+        return None
+
+
+class MatchArchive:
+    """
+    A zip or tar (optionally gz/bz2/xz compressed) archive of match files.
+
+    Use as a context manager. Members that are not `<match_id>.json`
+    (README.txt, directories, ...) are ignored.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._zip: Optional[zipfile.ZipFile] = None
+
+    def __enter__(self) -> "MatchArchive":
+        if zipfile.is_zipfile(self.path):
+            self._zip = zipfile.ZipFile(self.path)
+        elif not tarfile.is_tarfile(self.path):
+            raise ValueError(f"{self.path} is not a zip or tar archive")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def manifest_key(self, member: ArchiveMember) -> str:
+        """Name under which a member is recorded in the ingestion manifest"""
+        return f"{self.path.name}::{member.name}"
+
+    def iter_members(
+        self,
+        wanted: Callable[[ArchiveMember], bool] = lambda member: True,
+    ) -> Iterator[Tuple[ArchiveMember, bytes]]:
+        """
+        Yield (member, raw bytes) for every match file accepted by `wanted`.
+
+        Members are visited in archive order in a single pass, so compressed
+        tarballs are never rewound; rejected members are not decompressed.
+        """
+        if self._zip is not None:
+            yield from self._iter_zip(wanted)
+        else:
+            yield from self._iter_tar(wanted)
+
+    def _iter_zip(self, wanted) -> Iterator[Tuple[ArchiveMember, bytes]]:
+        for info in self._zip.infolist():
+            match_id = _match_id(info.filename)
+            if info.is_dir() or match_id is None:
+                continue
+            member = ArchiveMember(
+                name=info.filename,
+                match_id=match_id,
+                file_size=info.file_size,
+                file_mtime=time.mktime(info.date_time + (0, 0, -1)),
+            )
+            if wanted(member):
+                yield member, self._zip.read(info)
+
+    def _iter_tar(self, wanted) -> Iterator[Tuple[ArchiveMember, bytes]]:
+        # Stream mode: forward-only reads, whatever the compression
+        with tarfile.open(self.path, mode="r|*") as tar:
+            for info in tar:
+                match_id = _match_id(info.name)
+                if not info.isfile() or match_id is None:
+                    continue
+                member = ArchiveMember(
+                    name=info.name,
+                    match_id=match_id,
+                    file_size=info.size,
+                    file_mtime=float(info.mtime),
+                )
+                if wanted(member):
+                    yield member, tar.extractfile(info).read()
@@ -0,0 +1,346 @@
+"""
+`ipl-ingest`: command-line front end for ingest_season().
+
+    ipl-ingest data/ipl_json --season 2011
+    ipl-ingest data/ipl_json.zip --all-seasons --workers 8 --writers 2 --copy
+    ipl-ingest data/ipl_json --from-season 2008 --to-season 2012 --resume
+    ipl-ingest data/ipl_json --all-seasons --dry-run
+
+Seasons are ingested one after another. Completed seasons are recorded in a
+progress file next to the source, so an interrupted multi-season run can be
+picked up again with --resume; the file is removed once a run completes.
+
+A --dry-run checks every match with validate_batch(), prints the issues
+found and exits with status 1 if there are any.
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, TextIO
+
+from ipl_analytics.ingestion.archive import is_archive
+from ipl_analytics.ingestion.ingest_season import IngestionResult, ingest_season
+from ipl_analytics.ingestion.season_index import ArchiveIndex, SeasonIndex
+from ipl_analytics.ingestion.validate_match import ValidationReport
+
+PROGRESS_FILE_NAME = ".ingest_progress"
+
+
+def season_year(season: str) -> int:
+    """
+    IPL year of a Cricsheet season: "2011" -> 2011, "2007/08" -> 2008.
+    """
+    start, _, end = season.partition("/")
+    year = int(start[:4])
+    return year + 1 if end else year
+
+
+def build_index(source: Path, use_cache: bool = True) -> SeasonIndex:
+    """
+    Season index of a match folder or archive, shared by every season of
+    the run so an archive is only header-scanned once
+    """
+    if is_archive(source):
+        return ArchiveIndex.build(source, use_cache)
+    return SeasonIndex.build(source, use_cache)
+
+
+def discover_seasons(index: SeasonIndex) -> List[str]:
+    """Distinct seasons of an indexed folder or archive, in season order"""
+    return sorted(index.seasons(), key=lambda s: (season_year(s), s))
+
+
+def select_seasons(
+    available: Sequence[str],
+    seasons: Optional[Sequence[str]] = None,
+    from_season: Optional[str] = None,
+    to_season: Optional[str] = None,
+) -> List[str]:
+    """
+    Seasons to ingest: the explicit `seasons`, otherwise every available
+    season within the (inclusive) year range.
+    """
+    if seasons:
+        unknown = [s for s in seasons if s not in available]
+        if unknown:
+            raise ValueError(f"Seasons not found in source: {', '.join(unknown)}")
+        return list(seasons)
+
+    low = season_year(from_season) if from_season else None
+    high = season_year(to_season) if to_season else None
+    return [
+        s for s in available
+        if (low is None or season_year(s) >= low)
+        and (high is None or season_year(s) <= high)
+    ]
+
+
+def progress_path(source: Path) -> Path:
+    """Progress file of a run over `source`"""
+    if is_archive(source):
+        return source.with_name(source.name + PROGRESS_FILE_NAME)
+    return source / PROGRESS_FILE_NAME
+
+
+def load_completed(path: Path) -> List[str]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("completed", [])
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable progress file {path}: {e}", file=sys.stderr)
+        return []
+
+
+def save_completed(path: Path, completed: List[str]) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps({"completed": completed}), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        # A read-only source only costs the ability to --resume
+        print(f"⚠️  Could not write progress file {path}: {e}", file=sys.stderr)
+
+
+def clear_completed(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"⚠️  Could not remove progress file {path}: {e}", file=sys.stderr)
+
+
+class ProgressReporter:
+    """
+    Live matches/sec and balls/sec line for one season.
+
+    update() is called from writer threads. On a terminal the line is
+    redrawn in place; otherwise a line is printed every `log_interval`
+    seconds so logs stay readable.
+    """
+
+    def __init__(
+        self,
+        season: str,
+        stream: TextIO = sys.stderr,
+        interval: float = 0.5,
+        log_interval: float = 10.0,
+    ):
+        self.season = season
+        self.stream = stream
+        self.tty = stream.isatty()
+        self.interval = interval if self.tty else log_interval
+        self.matches = 0
+        self.deliveries = 0
+        self._started = time.perf_counter()
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, deliveries: int) -> None:
+        with self._lock:
+            self.matches += 1
+            self.deliveries += deliveries
+            now = time.perf_counter()
+            if now - self._last_draw >= self.interval:
+                self._last_draw = now
+                self._draw(now)
+
+    def finish(self) -> None:
+        with self._lock:
+            if self.matches:
+                self._draw(time.perf_counter())
+            if self.tty and self.matches:
+                self.stream.write("\n")
+                self.stream.flush()
+
+    def _draw(self, now: float) -> None:
+        elapsed = max(now - self._started, 1e-9)
+        line = (
+            f"⏳ {self.season}: {self.matches} matches, {self.deliveries:,} balls"
+            f" | {self.matches / elapsed:.1f} matches/s, {self.deliveries / elapsed:,.0f} balls/s"
+        )
+        if self.tty:
+            self.stream.write("\r\033[K" + line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+def format_summary(results: Sequence[IngestionResult], seconds: float) -> str:
+    """Per-season and total table of a run"""
+    header = f"{'Season':<10}{'Matches':>9}{'Replaced':>10}{'Balls':>10}{'Time (s)':>10}{'Balls/s':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.season:<10}{r.matches:>9}{r.replaced:>10}{r.deliveries:>10}"
+            f"{r.seconds:>10.1f}{r.balls_per_sec:>10,.0f}"
+        )
+
+    matches = sum(r.matches for r in results)
+    deliveries = sum(r.deliveries for r in results)
+    lines.append("-" * len(header))
+    lines.append(
+        f"{'Total':<10}{matches:>9}{sum(r.replaced for r in results):>10}{deliveries:>10}"
+        f"{seconds:>10.1f}{(deliveries / seconds if seconds else 0):>10,.0f}"
+    )
+    return "\n".join(lines)
+
+
+def format_validation(season: str, report: ValidationReport) -> str:
+    """Issue counts per check and every issue of a dry run's report"""
+    lines = [
+        f"❌ Season {season}: {len(report.issues)} validation issues in "
+        f"{len(report.invalid_match_ids())} of {report.matches} matches"
+    ]
+    for check, count in sorted(report.counts_by_check().items()):
+        lines.append(f"   {check}: {count}")
+    for issue in report.issues:
+        lines.append(f"   match {issue.match_id}: {issue.message}")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ipl-ingest",
+        description="Load Cricsheet IPL match files into the database.",
+    )
+    parser.add_argument(
+        "source", type=Path, nargs="?", default=Path("data/ipl_json"),
+        help="folder of match JSON files, or a zip/tar archive of them (default: data/ipl_json)",
+    )
+
+    which = parser.add_argument_group("seasons")
+    which.add_argument(
+        "--season", action="append", dest="seasons", metavar="SEASON",
+        help='season to ingest, as in the files ("2011", "2007/08"); repeatable',
+    )
+    which.add_argument("--all-seasons", action="store_true", help="ingest every season in the source")
+    which.add_argument("--from-season", metavar="YEAR", help="first season of a range, e.g. 2008 or 2007/08")
+    which.add_argument("--to-season", metavar="YEAR", help="last season of a range (inclusive)")
+
+    tuning = parser.add_argument_group("tuning")
+    tuning.add_argument("--workers", type=int, default=1, help="parser processes (default: 1)")
+    tuning.add_argument(
+        "--writers", type=int, default=1,
+        help="concurrent database writers, two connections each (default: 1)",
+    )
+    tuning.add_argument("--batch-size", type=int, default=10, help="matches per commit (default: 10)")
+    tuning.add_argument("--copy", action="store_true", help="bulk-load deliveries with COPY")
+    tuning.add_argument("--stream", action="store_true", help="parse inside the writers with bounded memory")
+    tuning.add_argument("--per-over", action="store_true", help="with --stream, flush one over at a time")
+
+    mode = parser.add_argument_group("mode")
+    mode.add_argument(
+        "--dry-run", action="store_true",
+        help="parse and validate only; no database access, exit status 1 on validation issues",
+    )
+    mode.add_argument("--resume", action="store_true", help="skip seasons completed by an earlier run")
+    mode.add_argument("--full", action="store_true", help="ignore the ingestion manifest and reparse every file")
+    mode.add_argument("--reload", action="store_true", help="replace each season by swapping its partition")
+    mode.add_argument("--no-index", action="store_true", help="do not use the cached season index")
+    mode.add_argument("-v", "--verbose", action="store_true", help="print a line per match")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+
+    if not args.source.exists():
+        parser.error(f"{args.source} does not exist")
+    if args.seasons and (args.all_seasons or args.from_season or args.to_season):
+        parser.error("--season cannot be combined with --all-seasons or a season range")
+    if not (args.seasons or args.all_seasons or args.from_season or args.to_season):
+        parser.error("choose --season, --all-seasons or --from-season/--to-season")
+    if args.reload and args.resume:
+        parser.error("--reload cannot be combined with --resume")
+
+    index = build_index(args.source, use_cache=not args.no_index)
+    try:
+        seasons = select_seasons(
+            discover_seasons(index), args.seasons, args.from_season, args.to_season
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not seasons:
+        print("Nothing to ingest: no seasons match the selection", file=sys.stderr)
+        return 1
+
+    state_path = progress_path(args.source)
+    completed = load_completed(state_path) if args.resume else []
+    todo = [s for s in seasons if s not in completed]
+    if len(todo) < len(seasons):
+        print(f"⏭️  Resuming: {len(seasons) - len(todo)} seasons already completed")
+
+    print(f"🗓️  Seasons: {', '.join(todo) if todo else 'none left'}")
+
+    results: List[IngestionResult] = []
+    started = time.perf_counter()
+
+    for season in todo:
+        reporter = ProgressReporter(season)
+        try:
+            result = ingest_season(
+                folder_path=args.source,
+                season=season,
+                workers=args.workers,
+                writers=args.writers,
+                batch_size=args.batch_size,
+                use_copy=args.copy,
+                incremental=not args.full,
+                use_index=not args.no_index,
+                season_index=index,
+                stream=args.stream,
+                per_over=args.per_over,
+                reload=args.reload,
+                dry_run=args.dry_run,
+                verbose=args.verbose,
+                progress=reporter.update,
+            )
+        except KeyboardInterrupt:
+            reporter.finish()
+            print(f"\n🛑 Interrupted during season {season}; rerun with --resume to continue", file=sys.stderr)
+            return 130
+        except Exception as e:
+            reporter.finish()
+            print(f"\n❌ Season {season} failed: {e}", file=sys.stderr)
+            if not args.dry_run:
+                print("   Rerun with --resume to continue from this season", file=sys.stderr)
+            return 1
+
+        reporter.finish()
+        results.append(result)
+
+        if args.dry_run:
+            if result.validation is not None and not result.validation.ok:
+                print(format_validation(season, result.validation), file=sys.stderr)
+        else:
+            completed.append(season)
+            save_completed(state_path, completed)
+
+    # Every selected season is in: a later --resume starts from scratch
+    if not args.dry_run:
+        clear_completed(state_path)
+
+    print()
+    print(format_summary(results, time.perf_counter() - started))
+
+    invalid = [r for r in results if r.validation is not None and not r.validation.ok]
+    if invalid:
+        print(f"\n❌ Validation issues in {len(invalid)} seasons", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, TextIO, Tuple
 
-from ipl_analytics.models.delivery import Delivery, Phase
+from ipl_analytics.ingestion.json_stream import JsonStreamReader
+from ipl_analytics.models.delivery import DELIVERY_COLUMNS, Delivery, Phase
+from ipl_analytics.models.delivery_batch import DeliveryBatch, DeliveryChunk
 
 
 def determine_phase(over: int) -> Phase:
@@ -27,63 +29,235 @@ def ingest_match(json_path: Path) -> List[Delivery]:
     with open(json_path, "r") as f:
         match = json.load(f)
 
-    info = match["info"]
-    innings_data = match["innings"]
+    return parse_match(match, int(json_path.stem))
 
-    match_id = int(json_path.stem)
+
+def ingest_match_batch(json_path: Path) -> DeliveryBatch:
+    """
+    Parse a single IPL match JSON file into a columnar DeliveryBatch.
+    """
+    with open(json_path, "r") as f:
+        match = json.load(f)
+
+    return parse_match_batch(match, int(json_path.stem))
+
+
+def parse_match(match: dict, match_id: int) -> List[Delivery]:
+    """
+    Convert an already-decoded Cricsheet match document into Delivery objects.
+    """
+    return _to_deliveries(_match_rows(match, match_id))
+
+
+def parse_match_batch(match: dict, match_id: int) -> DeliveryBatch:
+    """
+    Convert an already-decoded Cricsheet match document into a DeliveryBatch.
+
+    Skips per-ball model construction; call validate() on the result to
+    apply the Delivery constraints column-wise.
+    """
+    return DeliveryBatch.from_rows(
+        _match_rows(match, match_id), registry=_registry(match["info"])
+    )
+
+
+def stream_match(
+    json_path: Path,
+    per_over: bool = False,
+    columnar: bool = False,
+) -> Iterator[DeliveryChunk]:
+    """
+    Parse a match file lazily, yielding one innings (or one over) at a time.
+
+    Only the chunk being yielded is held in memory, however large the file.
+    Chunks are lists of Delivery, or DeliveryBatch with `columnar`.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        yield from stream_match_file(f, int(json_path.stem), per_over, columnar)
+
+
+def stream_match_file(
+    fp: TextIO,
+    match_id: int,
+    per_over: bool = False,
+    columnar: bool = False,
+) -> Iterator[DeliveryChunk]:
+    """
+    Streaming counterpart of parse_match() for an open text file.
+
+    Expects Cricsheet's key order (`info` before `innings`); documents that
+    put `innings` first are still parsed, just without the memory bound.
+    """
+    registry: Dict[str, str] = {}
+
+    def to_chunk(rows: List[tuple]) -> DeliveryChunk:
+        if columnar:
+            return DeliveryBatch.from_rows(rows, registry=registry)
+        return _to_deliveries(rows)
+
+    reader = JsonStreamReader(fp)
+    context = None
+    deferred_innings = None
+
+    for key in reader.iter_object_keys():
+        if key == "info":
+            info = reader.read_value()
+            context = _match_context(match_id, info)
+            registry = _registry(info)
+        elif key == "innings" and context is not None:
+            for rows in _stream_innings(reader, context, per_over):
+                yield to_chunk(rows)
+        elif key == "innings":
+            deferred_innings = reader.read_value()
+        else:
+            reader.read_value()
+
+    if context is None:
+        raise ValueError(f"Match {match_id} has no info block")
+
+    for innings_index, innings in enumerate(deferred_innings or [], start=1):
+        yield to_chunk(_innings_rows(context, innings_index, innings))
+
+
+def _to_deliveries(rows: List[tuple]) -> List[Delivery]:
+    return [Delivery(**dict(zip(DELIVERY_COLUMNS, row))) for row in rows]
+
+
+def _match_context(match_id: int, info: dict) -> Tuple[int, str, str]:
     season_raw = info["season"]
     season = str(season_raw)
 
     venue = info["venue"]
 
-    deliveries: List[Delivery] = []
-
-    for innings_index, innings in enumerate(innings_data, start=1):
-        batting_team = innings["team"]
-        delivery_seq = 0  # resets per innings
-
-        for over_data in innings["overs"]:
-            over_number = over_data["over"]
-
-            legal_ball_counter = 0
-
-            for delivery_data in over_data["deliveries"]:
-                delivery_seq += 1
-
-                runs = delivery_data["runs"]
-                extras = delivery_data.get("extras", {})
-                wickets = delivery_data.get("wickets", [])
-
-                is_legal_ball = not (
-                    "wides" in extras or "noballs" in extras
-                )
-
-                if is_legal_ball:
-                    legal_ball_counter += 1
-
-                delivery = Delivery(
-                    match_id=match_id,
-                    season=season,
-                    venue=venue,
-                    innings=innings_index,
-                    over=over_number,
-                    ball=legal_ball_counter,
-                    delivery_seq=delivery_seq,
-                    batting_team=batting_team,
-                    bowling_team=None,  # can be inferred later
-                    batter=delivery_data["batter"],
-                    bowler=delivery_data["bowler"],
-                    non_striker=delivery_data["non_striker"],
-                    runs_batter=runs["batter"],
-                    runs_extras=runs["extras"],
-                    extras_type=next(iter(extras.keys()), None) if extras else None,
-                    is_legal_ball=is_legal_ball,
-                    is_wicket=len(wickets) > 0,
-                    dismissed_batter=wickets[0]["player_out"] if wickets else None,
-                    wicket_type=wickets[0]["kind"] if wickets else None,
-                    phase=determine_phase(over_number),
-                )
-
-                deliveries.append(delivery)
-
-    return deliveries
+    return match_id, season, venue
+
+
+def _registry(info: dict) -> Dict[str, str]:
+    """Player name -> Cricsheet registry identifier, when the file has one"""
+    return dict(info.get("registry", {}).get("people", {}))
+
+
+def _match_rows(match: dict, match_id: int) -> List[tuple]:
+    context = _match_context(match_id, match["info"])
+
+    rows: List[tuple] = []
+
+    for innings_index, innings in enumerate(match["innings"], start=1):
+        rows.extend(_innings_rows(context, innings_index, innings))
+
+    return rows
+
+
+def _stream_innings(
+    reader: JsonStreamReader,
+    context: Tuple[int, str, str],
+    per_over: bool,
+) -> Iterator[List[tuple]]:
+    for position in reader.iter_array():
+        innings_index = position + 1
+
+        if not per_over:
+            innings = reader.read_value()
+            yield _innings_rows(context, innings_index, innings)
+            continue
+
+        batting_team = None
+        buffered_overs = None
+        delivery_seq = 0
+
+        for key in reader.iter_object_keys():
+            if key == "team":
+                batting_team = reader.read_value()
+            elif key == "overs" and batting_team is not None:
+                for _ in reader.iter_array():
+                    over_rows, delivery_seq = _over_rows(
+                        context, innings_index, batting_team,
+                        reader.read_value(), delivery_seq,
+                    )
+                    yield over_rows
+            elif key == "overs":
+                buffered_overs = reader.read_value()
+            else:
+                reader.read_value()
+
+        for over_data in buffered_overs or []:
+            over_rows, delivery_seq = _over_rows(
+                context, innings_index, batting_team, over_data, delivery_seq,
+            )
+            yield over_rows
+
+
+def _innings_rows(
+    context: Tuple[int, str, str],
+    innings_index: int,
+    innings: dict,
+) -> List[tuple]:
+    batting_team = innings["team"]
+    delivery_seq = 0  # resets per innings
+
+    rows: List[tuple] = []
+
+    for over_data in innings["overs"]:
+        over_rows, delivery_seq = _over_rows(
+            context, innings_index, batting_team, over_data, delivery_seq,
+        )
+        rows.extend(over_rows)
+
+    return rows
+
+
+def _over_rows(
+    context: Tuple[int, str, str],
+    innings_index: int,
+    batting_team: str,
+    over_data: dict,
+    delivery_seq: int,
+) -> Tuple[List[tuple], int]:
+    """
+    Rows (in DELIVERY_COLUMNS order) of one over, plus the innings'
+    delivery_seq after it.
+    """
+    match_id, season, venue = context
+    over_number = over_data["over"]
+    phase = determine_phase(over_number).value
+
+    legal_ball_counter = 0
+    rows: List[tuple] = []
+
+    for delivery_data in over_data["deliveries"]:
+        delivery_seq += 1
+
+        runs = delivery_data["runs"]
+        extras = delivery_data.get("extras", {})
+        wickets = delivery_data.get("wickets", [])
+
+        is_legal_ball = not (
+            "wides" in extras or "noballs" in extras
+        )
+
+        if is_legal_ball:
+            legal_ball_counter += 1
+
+        rows.append((
+            match_id,
+            season,
+            venue,
+            innings_index,
+            over_number,
+            legal_ball_counter,                                  # ball
+            delivery_seq,
+            batting_team,
+            delivery_data["batter"],
+            delivery_data["bowler"],
+            delivery_data["non_striker"],
+            runs["batter"],
+            runs["extras"],
+            next(iter(extras.keys()), None) if extras else None,  # extras_type
+            is_legal_ball,
+            len(wickets) > 0,                                    # is_wicket
+            wickets[0]["player_out"] if wickets else None,       # dismissed_batter
+            wickets[0]["kind"] if wickets else None,             # wicket_type
+            phase,
+        ))
+
+    return rows, delivery_seq
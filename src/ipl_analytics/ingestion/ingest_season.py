@@ -1,41 +1,608 @@
+import hashlib
+import io
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace as replace_fields
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
-from ipl_analytics.ingestion.ingest_match import ingest_match
-from ipl_analytics.db.insert_players import insert_players
-from ipl_analytics.db.insert_match import insert_match
-from ipl_analytics.db.insert_deliveries import insert_deliveries
+from ipl_analytics.ingestion.archive import ArchiveMember, MatchArchive, is_archive
+from ipl_analytics.ingestion.ingest_match import parse_match_batch, stream_match, stream_match_file
+from ipl_analytics.ingestion.season_index import ArchiveIndex, SeasonIndex, read_match_header
+from ipl_analytics.ingestion.validate_match import ValidationReport, validate_batch
+from ipl_analytics.db.aggregates import aggregates_installed, rebuild_aggregates
+from ipl_analytics.db.connection import get_connection
+from ipl_analytics.db.manifest import IngestionManifest, ManifestEntry
+from ipl_analytics.db.partitions import attach_season, detach_season, drop_detached, prepare_seasons
+from ipl_analytics.db.session import IngestionSession, ensure_pool
+from ipl_analytics.models.delivery_batch import DeliveryBatch, DeliveryChunk
+
+
+@dataclass
+class ParsedMatch:
+    """A parsed source file plus what the manifest needs to know about it"""
+
+    file_path: str
+    content_hash: str
+    file_size: int
+    file_mtime: float
+    deliveries: DeliveryBatch
+
+    def manifest_entry(self) -> ManifestEntry:
+        match_id, season, _ = self.deliveries.match_header()
+        return ManifestEntry(
+            file_path=self.file_path,
+            content_hash=self.content_hash,
+            file_size=self.file_size,
+            file_mtime=self.file_mtime,
+            match_id=match_id,
+            season=season,
+            deliveries=len(self.deliveries),
+            players=len(self.deliveries.players()),
+        )
+
+
+@dataclass
+class _StreamSource:
+    """A match file (on disk or in memory) to be parsed lazily by a writer"""
+
+    file_path: str
+    match_id: int
+    file_size: int
+    file_mtime: float
+    season: str
+    path: Optional[Path] = None
+    raw: Optional[bytes] = None
+
+    def content_hash(self) -> str:
+        if self.raw is not None:
+            return hashlib.sha256(self.raw).hexdigest()
+        return _file_hash(self.path)
+
+    def stream(self, per_over: bool) -> Iterator[DeliveryBatch]:
+        if self.raw is not None:
+            fp = io.TextIOWrapper(io.BytesIO(self.raw), encoding="utf-8")
+            return stream_match_file(fp, self.match_id, per_over, columnar=True)
+        return stream_match(self.path, per_over, columnar=True)
+
+
+@dataclass
+class IngestionResult:
+    """What one ingest_season() run did"""
+
+    season: str
+    matches: int = 0
+    replaced: int = 0
+    deliveries: int = 0
+    seconds: float = 0.0
+    # Cricket invariant checks of a dry run (see validate_match.validate_batch)
+    validation: Optional[ValidationReport] = None
+
+    @property
+    def balls_per_sec(self) -> float:
+        return self.deliveries / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class _WriteJob:
+    # A parsed match is a single chunk; a streamed one is a lazy generator
+    # that is only consumed inside the writer
+    chunks: Iterable[DeliveryChunk]
+    replace: bool = False
+    manifest_entry: Optional[ManifestEntry] = None
+
+
+def _file_hash(json_path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(json_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_bytes(
+    file_path: str,
+    match_id: int,
+    raw: bytes,
+    file_size: int,
+    file_mtime: float,
+) -> ParsedMatch:
+    """Hash and parse one match file's contents (runs in a worker process)."""
+    deliveries = parse_match_batch(json.loads(raw), match_id)
+    deliveries.validate()
+
+    return ParsedMatch(
+        file_path=file_path,
+        content_hash=hashlib.sha256(raw).hexdigest(),
+        file_size=file_size,
+        file_mtime=file_mtime,
+        deliveries=deliveries,
+    )
+
+
+def _parse_file(json_path: Path) -> ParsedMatch:
+    """Read, hash and parse one match file (runs in a worker process)."""
+    stat = json_path.stat()
+    raw = json_path.read_bytes()
+    return _parse_bytes(json_path.name, int(json_path.stem), raw, stat.st_size, stat.st_mtime)
+
+
+def _validated(chunks: Iterable[DeliveryBatch]) -> Iterator[DeliveryBatch]:
+    for chunk in chunks:
+        chunk.validate()
+        yield chunk
+
+
+def _parse_files(json_files: List[Path], workers: int) -> Iterator[ParsedMatch]:
+    """
+    Parse match files, in input order, using up to `workers` processes.
+    """
+    if workers <= 1:
+        for json_file in json_files:
+            yield _parse_file(json_file)
+        return
+
+    chunksize = max(1, len(json_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # executor.map yields in submission order, so results are deterministic
+        yield from executor.map(_parse_file, json_files, chunksize=chunksize)
+
+
+def _parse_archive(
+    archive: MatchArchive,
+    members: Iterator[Tuple[ArchiveMember, bytes]],
+    season: str,
+    workers: int,
+    index: ArchiveIndex,
+) -> Iterator[ParsedMatch]:
+    """
+    Parse archive members of `season`, in archive order.
+
+    Members are decompressed here while up to `workers` processes parse the
+    ones already read, so decompression and parsing overlap. Members not yet
+    in `index` are routed after a header-only read, and recorded in it.
+    """
+    def season_members() -> Iterator[Tuple[str, int, bytes, int, float]]:
+        for member, raw in members:
+            if index.header(member, raw).season == season:
+                key = archive.manifest_key(member)
+                yield key, member.match_id, raw, member.file_size, member.file_mtime
+
+    if workers <= 1:
+        for args in season_members():
+            yield _parse_bytes(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Bounded look-ahead keeps memory flat and results in archive order
+        in_flight = deque()
+        for args in season_members():
+            in_flight.append(executor.submit(_parse_bytes, *args))
+            if len(in_flight) >= workers * 4:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _drain(
+    matches: Iterator[_WriteJob],
+    progress: Optional[Callable[[int], None]] = None,
+) -> ValidationReport:
+    """
+    Consume `matches` without writing anything (dry runs), checking each
+    match with validate_batch() as it goes.
+
+    Every check is per match, so validating match by match reports the same
+    issues as validating the whole season at once, in bounded memory.
+
+    Returns:
+        Validation report of every match parsed
+    """
+    report = ValidationReport(deliveries=0, matches=0)
+    for job in matches:
+        chunks = list(job.chunks)
+        if not chunks:
+            continue
+        batch = chunks[0] if len(chunks) == 1 else DeliveryBatch.concat(chunks)
+        report = report.merge(validate_batch(batch))
+        if progress is not None:
+            progress(len(batch))
+    return report
+
+
+def _run_writers(
+    matches: Iterator[_WriteJob],
+    writers: int,
+    batch_size: int,
+    use_copy: bool,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Drain `matches` through a bounded pool of writers.
+
+    Every writer owns one IngestionSession (two pool connections) for the
+    whole run. The queue holds at most one commit batch per writer, so fast
+    parsers block instead of piling parsed matches up in memory while
+    Postgres catches up.
+
+    Args:
+        progress: Called with the delivery count of every written match,
+            from the writer's thread
+
+    Returns:
+        Number of deliveries written
+    """
+    def write(session: IngestionSession, job: _WriteJob) -> None:
+        count = session.write_match_stream(job.chunks, job.replace, job.manifest_entry)
+        if progress is not None:
+            progress(count)
+
+    ensure_pool(writers)
+    if writers <= 1:
+        with IngestionSession(batch_size=batch_size, use_copy=use_copy) as session:
+            for job in matches:
+                write(session, job)
+        return session.deliveries_written
+
+    pending: "queue.Queue[Optional[_WriteJob]]" = queue.Queue(maxsize=writers * batch_size)
+    errors: List[BaseException] = []
+    written: List[int] = []
+
+    def writer() -> None:
+        try:
+            with IngestionSession(batch_size=batch_size, use_copy=use_copy) as session:
+                while True:
+                    job = pending.get()
+                    if job is None:
+                        break
+                    if not errors:
+                        write(session, job)
+            written.append(session.deliveries_written)
+        except BaseException as e:
+            errors.append(e)
+            # Keep draining so the producer never blocks on a dead writer
+            while pending.get() is not None:
+                pass
+
+    threads = [
+        threading.Thread(target=writer, name=f"ingest-writer-{i}", daemon=True)
+        for i in range(writers)
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        for job in matches:
+            if errors:
+                break
+            pending.put(job)
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+
+    return sum(written)
 
 
 def ingest_season(
     folder_path: Path,
     season: str,
-) -> None:
-    json_files = sorted(folder_path.glob("*.json"))
+    workers: int = 1,
+    writers: int = 1,
+    batch_size: int = 10,
+    use_copy: bool = False,
+    incremental: bool = True,
+    use_index: bool = True,
+    season_index: Optional[SeasonIndex] = None,
+    stream: bool = False,
+    per_over: bool = False,
+    reload: bool = False,
+    dry_run: bool = False,
+    verbose: bool = True,
+    progress: Optional[Callable[[int], None]] = None,
+) -> IngestionResult:
+    """
+    Ingest every match of `season` found in `folder_path`.
+
+    `folder_path` may also be a zip or tar(.gz) archive such as Cricsheet's
+    `ipl_json.zip`; members are read straight out of it without extracting
+    to disk, and recorded in the manifest as `<archive>::<member>`.
+
+    Each writer keeps one IngestionSession (a batch connection and a lookup
+    connection) for the whole run, writes every match atomically and commits
+    once per `batch_size` matches.
+
+    With `incremental` enabled, files recorded in the ingestion manifest are
+    skipped when their size and mtime are unchanged (or, failing that, their
+    content hash), and files whose content changed replace the stored rows of
+    their match.
+
+    Files are routed by season from a header-only folder index (see
+    season_index), so only the requested season's files are fully parsed.
+    Archive members are routed the same way from an ArchiveIndex; members
+    of other seasons that it already knows are skipped without being
+    decompressed, and the others are recorded in it as they are read.
 
-    if not json_files:
-        raise ValueError(f"No JSON files found in {folder_path}")
+    With `stream` enabled, files are not parsed up front: each writer parses
+    its match innings by innings (or over by over with `per_over`) and
+    flushes every chunk as it goes, so memory stays bounded regardless of
+    file size. Parser `workers` are not used in this mode.
+
+    With `reload` enabled, the season's deliveries partition is detached
+    before anything is written and every file is loaded into a fresh one.
+    The old partition is dropped once the run succeeds, and attached again
+    if it fails.
+
+    With `dry_run` enabled, files are parsed and validated exactly as for a
+    real run but nothing is read from or written to the database; every
+    match is also run through validate_batch() and the result carries the
+    ValidationReport.
+
+    Args:
+        folder_path: Folder of Cricsheet match JSON files, or an archive of them
+        season: Season to ingest (e.g. "2011", "2007/08")
+        workers: Number of parser processes (1 parses in-process)
+        writers: Number of concurrent database writers
+        batch_size: Matches per commit
+        use_copy: Bulk-load deliveries with COPY instead of INSERT
+        incremental: Consult and maintain the ingestion manifest
+        use_index: Pre-filter files by season using the cached header index
+        season_index: Index of `folder_path` already built (an ArchiveIndex
+            for an archive), e.g. shared by the seasons of one run
+        stream: Parse lazily inside the writers instead of in worker processes
+        per_over: With `stream`, flush one over at a time instead of one innings
+        reload: Replace the whole season by swapping its partition
+        dry_run: Parse and validate only; no database access
+        verbose: Print a line per match
+        progress: Called with the delivery count of every match written
+            (parsed, with `dry_run`), possibly from writer threads
+
+    Returns:
+        Matches and deliveries ingested, and the wall-clock time taken
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    started = time.perf_counter()
+
+    from_archive = is_archive(folder_path)
+    index = None
+
+    if from_archive:
+        json_files: List[Path] = []
+        archive_index = season_index or ArchiveIndex.load(folder_path, use_cache=use_index)
+        print(f"📦 Reading match files from archive {folder_path.name}")
+    elif season_index is not None or use_index:
+        index = season_index or SeasonIndex.build(folder_path)
+        total_files = len(index.headers)
+        json_files = index.files_for_season(season)
+    else:
+        json_files = sorted(folder_path.glob("*.json"))
+        total_files = len(json_files)
+
+    if not from_archive:
+        if not total_files:
+            raise ValueError(f"No JSON files found in {folder_path}")
+        print(f"📦 Found {total_files} total match files")
 
-    print(f"📦 Found {len(json_files)} total match files")
     print(f"🎯 Ingesting only season: {season}")
+    if index is not None:
+        print(f"🗂️  {len(json_files)} files belong to season {season}")
+    if workers > 1 or writers > 1:
+        print(f"⚙️  Parser workers: {workers}, writers: {writers}, batch size: {batch_size}")
+
+    # A reload writes every file again, so nothing is skipped or replaced
+    use_manifest = incremental and not reload and not dry_run
+    manifest = IngestionManifest.load() if use_manifest else IngestionManifest()
+    if use_manifest and not from_archive:
+        json_files = [
+            f for f in json_files
+            if not manifest.is_unchanged_on_disk(f.name, f.stat())
+        ]
+        print(f"🔎 {len(json_files)} files new or modified since last run")
 
     ingested = 0
+    replaced = 0
+    touched: List[ManifestEntry] = []
+    validation: Optional[ValidationReport] = None
 
-    for json_file in json_files:
-        deliveries = ingest_match(json_file)
+    def season_matches(parsed_matches: Iterator[ParsedMatch]) -> Iterator[_WriteJob]:
+        nonlocal ingested, replaced
 
-        if not deliveries:
-            continue
+        for parsed in parsed_matches:
+            if not len(parsed.deliveries):
+                continue
 
-        if deliveries[0].season != season:
-            continue
+            previous = manifest.get(parsed.file_path)
+            if previous is not None and previous.content_hash == parsed.content_hash:
+                # Touched but identical: only the stat fields need refreshing
+                touched.append(parsed.manifest_entry())
+                continue
+
+            if parsed.deliveries.season[0] != season:
+                continue
+
+            ingested += 1
+            if previous is not None:
+                replaced += 1
+                if verbose:
+                    print(f"♻️  Re-ingesting changed {parsed.file_path}")
+            elif verbose:
+                print(f"✅ Parsed {parsed.file_path}")
+
+            yield _WriteJob(
+                chunks=[parsed.deliveries],
+                replace=previous is not None,
+                manifest_entry=parsed.manifest_entry() if incremental and not dry_run else None,
+            )
+
+    def streamed_matches(sources: Iterator[_StreamSource]) -> Iterator[_WriteJob]:
+        nonlocal ingested, replaced
+
+        for source in sources:
+            previous = manifest.get(source.file_path)
+            content_hash = source.content_hash() if use_manifest else ""
+
+            if previous is not None and previous.content_hash == content_hash:
+                touched.append(replace_fields(
+                    previous, file_size=source.file_size, file_mtime=source.file_mtime
+                ))
+                continue
+
+            if source.season != season:
+                continue
+
+            ingested += 1
+            if previous is not None:
+                replaced += 1
+                if verbose:
+                    print(f"♻️  Re-ingesting changed {source.file_path}")
+            elif verbose:
+                print(f"✅ Streaming {source.file_path}")
+
+            manifest_entry = None
+            if incremental and not dry_run:
+                # Row counts are filled in by the session as chunks are written;
+                # a reload skips the manifest lookup but still records the hash
+                manifest_entry = ManifestEntry(
+                    file_path=source.file_path,
+                    content_hash=content_hash or source.content_hash(),
+                    file_size=source.file_size,
+                    file_mtime=source.file_mtime,
+                    match_id=source.match_id,
+                    season=season,
+                    deliveries=0,
+                    players=0,
+                )
+
+            yield _WriteJob(
+                chunks=_validated(source.stream(per_over)),
+                replace=previous is not None,
+                manifest_entry=manifest_entry,
+            )
 
-        insert_players(deliveries)
-        insert_match(deliveries)
-        insert_deliveries(deliveries)
+    def folder_sources() -> Iterator[_StreamSource]:
+        for json_file in json_files:
+            stat = json_file.stat()
+            yield _StreamSource(
+                file_path=json_file.name,
+                match_id=int(json_file.stem),
+                file_size=stat.st_size,
+                file_mtime=stat.st_mtime,
+                season=(
+                    index.headers[json_file.name].season if index is not None
+                    else read_match_header(json_file).season
+                ),
+                path=json_file,
+            )
 
-        ingested += 1
-        print(f"✅ Ingested {json_file.name}")
+    def archive_sources(archive: MatchArchive, members) -> Iterator[_StreamSource]:
+        for member, raw in members:
+            key = archive.manifest_key(member)
+            yield _StreamSource(
+                file_path=key,
+                match_id=member.match_id,
+                file_size=member.file_size,
+                file_mtime=member.file_mtime,
+                season=archive_index.header(member, raw).season,
+                raw=raw,
+            )
+
+    def load(jobs: Iterator[_WriteJob]) -> int:
+        nonlocal validation
+        if dry_run:
+            validation = _drain(jobs, progress)
+            return validation.deliveries
+        return _run_writers(jobs, writers, batch_size, use_copy, progress)
+
+    def run() -> int:
+        if from_archive:
+            def wanted(member: ArchiveMember) -> bool:
+                # Decided from metadata alone, before the member is read
+                known = archive_index.season_of(member)
+                if known is not None and known != season:
+                    return False
+                return not use_manifest or not manifest.is_unchanged(
+                    archive.manifest_key(member), member.file_size, member.file_mtime
+                )
+
+            with MatchArchive(folder_path) as archive:
+                members = archive.iter_members(wanted)
+                try:
+                    if stream:
+                        jobs = streamed_matches(archive_sources(archive, members))
+                    else:
+                        jobs = season_matches(
+                            _parse_archive(archive, members, season, workers, archive_index)
+                        )
+                    return load(jobs)
+                finally:
+                    archive_index.save()
+        else:
+            if stream:
+                jobs = streamed_matches(folder_sources())
+            else:
+                jobs = season_matches(_parse_files(json_files, workers))
+            return load(jobs)
+
+    if dry_run:
+        deliveries = run()
+        print(f"\n🧪 Dry run for season {season}: {ingested} matches, {deliveries} deliveries parsed")
+        if validation.ok:
+            print("✅ No validation issues")
+        else:
+            print(f"❌ {len(validation.issues)} validation issues in {len(validation.invalid_match_ids())} matches")
+        return IngestionResult(
+            season, ingested, replaced, deliveries, time.perf_counter() - started, validation
+        )
+
+    detached = None
+    if reload:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                detached = detach_season(cur, season)
+        if detached:
+            print(f"🔁 Detached the previous {season} deliveries as {detached}")
+
+    # Writers share the season partition; creating it up front keeps the
+    # parent table lock out of their transactions
+    season_id = prepare_seasons([season])[season]
+
+    try:
+        deliveries = run()
+    except BaseException:
+        if detached:
+            with get_connection() as conn:
+                with conn.cursor() as cur:
+                    attach_season(cur, season, detached)
+                    # Drop the totals the aborted load already committed
+                    if aggregates_installed(cur):
+                        rebuild_aggregates(cur, [season_id])
+            print(f"↩️  Restored the previous {season} deliveries")
+        raise
+
+    if detached:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                drop_detached(cur, detached)
+                # Players that only appeared in the old files still have rows
+                if aggregates_installed(cur):
+                    rebuild_aggregates(cur, [season_id])
+
+    if touched:
+        manifest.touch(touched)
 
     print(f"\n🏁 Completed ingestion for season {season}")
     print(f"📊 Matches ingested: {ingested}")
+    if replaced:
+        print(f"♻️  Matches replaced: {replaced}")
+
+    return IngestionResult(season, ingested, replaced, deliveries, time.perf_counter() - started)
@@ -0,0 +1,134 @@
+"""
+Incremental reader for large JSON documents.
+
+Only the parts of a document the caller asks for are decoded; everything
+else is read through in chunks. Used to pull the `info` header out of match
+files without decoding their innings.
+"""
+import json
+from typing import Any, Iterator, TextIO
+
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonStreamReader:
+    """
+    Cursor over a JSON document read from a text file in chunks.
+
+    Navigate with iter_object_keys()/iter_array() and decode the value at
+    the cursor with read_value(). Only the unread tail of the file is kept
+    in memory, plus whatever value is currently being decoded.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _read_more(self, min_size: int = 0) -> bool:
+        """Append at least one chunk to the buffer; False at end of file."""
+        if self._eof:
+            return False
+
+        if self._pos > len(self._buf) // 2:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+        chunk = self._fp.read(max(self._chunk_size, min_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, or "" at end of file."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read_more():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        ch = self._peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, found {ch or 'EOF'!r}")
+        self._pos += 1
+        return ch
+
+    def read_value(self) -> Any:
+        """Decode the value at the cursor and move past it."""
+        self._peek()
+        read_ahead = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number may continue in the next chunk; only trust a decode
+                # that stopped before the end of the buffer
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read_more(read_ahead)
+            # Grow the read-ahead so a large value is re-decoded O(log n) times
+            read_ahead *= 2
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """
+        Walk the object at the cursor, yielding each key.
+
+        After each key is yielded the cursor sits on its value, which the
+        caller must consume (read_value() or a nested iterator) before
+        asking for the next key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Expected an object key in JSON stream")
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Walk the array at the cursor, yielding each element's index.
+
+        The caller consumes each element before asking for the next one.
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self._expect(",]") == "]":
+                return
+
+    def read_key(self, key: str) -> Any:
+        """
+        Decode one top-level key of the object at the cursor.
+
+        Keys before it are decoded and discarded; keys after it are never read.
+        """
+        for current in self.iter_object_keys():
+            if current == key:
+                return self.read_value()
+            self.read_value()
+        raise KeyError(key)
@@ -0,0 +1,245 @@
+"""
+Header-only index of a folder (or archive) of Cricsheet match files.
+
+Reads just the `info` block of each file (season, venue, dates) and caches
+the result next to the files, so season-filtered ingestion only opens the
+matches it actually needs.
+"""
+import io
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ipl_analytics.ingestion.archive import ArchiveMember, MatchArchive
+from ipl_analytics.ingestion.json_stream import JsonStreamReader
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = ".season_index"
+INDEX_VERSION = 1
+
+
+@dataclass
+class MatchHeader:
+    """The parts of a match file's `info` block needed to route it"""
+
+    file_path: str
+    match_id: int
+    season: str
+    venue: str
+    dates: List[str] = field(default_factory=list)
+    file_size: int = 0
+    file_mtime: float = 0.0
+
+
+def header_from_info(file_path: str, match_id: int, info: dict) -> MatchHeader:
+    """Build a MatchHeader from a decoded `info` block."""
+    return MatchHeader(
+        file_path=file_path,
+        match_id=match_id,
+        # Same normalisation as ingest_match: 2011 -> "2011", "2007/08" stays
+        season=str(info["season"]),
+        venue=info["venue"],
+        dates=[str(d) for d in info.get("dates", [])],
+    )
+
+
+def read_match_header(json_path: Path) -> MatchHeader:
+    """
+    Read the `info` block of a match file without decoding its innings.
+    """
+    stat = json_path.stat()
+    with open(json_path, "r", encoding="utf-8") as f:
+        info = JsonStreamReader(f).read_key("info")
+
+    header = header_from_info(json_path.name, int(json_path.stem), info)
+    header.file_size = stat.st_size
+    header.file_mtime = stat.st_mtime
+    return header
+
+
+def read_match_header_bytes(file_path: str, match_id: int, raw: bytes) -> MatchHeader:
+    """
+    read_match_header() for a match file already in memory (e.g. an archive member).
+    """
+    with io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8") as f:
+        info = JsonStreamReader(f).read_key("info")
+
+    header = header_from_info(file_path, match_id, info)
+    header.file_size = len(raw)
+    return header
+
+
+class SeasonIndex:
+    """Headers of every match file in a folder, keyed by file name"""
+
+    def __init__(self, folder_path: Path, headers: Dict[str, MatchHeader]):
+        self.folder_path = folder_path
+        self.headers = headers
+
+    @classmethod
+    def build(cls, folder_path: Path, use_cache: bool = True) -> "SeasonIndex":
+        """
+        Index `folder_path`, rescanning only files that are new or whose
+        size/mtime changed since the cached index was written.
+        """
+        cache_path = folder_path / INDEX_FILE_NAME
+        cached = cls._load_cache(cache_path) if use_cache else {}
+
+        headers: Dict[str, MatchHeader] = {}
+        scanned = 0
+
+        for json_path in sorted(folder_path.glob("*.json")):
+            if json_path.name.startswith("."):
+                continue
+            stat = json_path.stat()
+            header = cached.get(json_path.name)
+            if (
+                header is None
+                or header.file_size != stat.st_size
+                or header.file_mtime != stat.st_mtime
+            ):
+                header = read_match_header(json_path)
+                scanned += 1
+            headers[json_path.name] = header
+
+        index = cls(folder_path, headers)
+
+        if use_cache and (scanned or len(headers) != len(cached)):
+            index._save_cache(cache_path)
+
+        logger.info(f"Indexed {len(headers)} match files ({scanned} scanned, {len(headers) - scanned} cached)")
+        return index
+
+    @staticmethod
+    def _load_cache(cache_path: Path) -> Dict[str, MatchHeader]:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable season index {cache_path}: {e}")
+            return {}
+
+        if data.get("version") != INDEX_VERSION:
+            return {}
+
+        return {
+            name: MatchHeader(**header)
+            for name, header in data.get("files", {}).items()
+        }
+
+    def _save_cache(self, cache_path: Path) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "files": {name: asdict(h) for name, h in self.headers.items()},
+        }
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            # A read-only data folder just means no cache next time
+            logger.warning(f"Could not write season index {cache_path}: {e}")
+
+    def seasons(self) -> List[str]:
+        """Distinct seasons present in the folder, sorted"""
+        return sorted({h.season for h in self.headers.values()})
+
+    def files_for_season(self, season: Optional[str] = None) -> List[Path]:
+        """
+        Match files of `season` (all files when None), sorted by name.
+        """
+        return [
+            self.folder_path / name
+            for name, h in sorted(self.headers.items())
+            if season is None or h.season == season
+        ]
+
+
+class ArchiveIndex(SeasonIndex):
+    """
+    Headers of the match files in an archive, keyed by member name.
+
+    Cached next to the archive (`<archive>.season_index`). A member whose
+    size and mtime match its cached header is routed without being
+    decompressed, so only new or changed members are ever read twice. A
+    compressed tarball is still streamed through in full, as tar members
+    cannot be skipped without reading past them.
+    """
+
+    def __init__(self, folder_path: Path, headers: Dict[str, MatchHeader], use_cache: bool = True):
+        super().__init__(folder_path, headers)
+        self.use_cache = use_cache
+        self._changed = False
+
+    @staticmethod
+    def cache_path(archive_path: Path) -> Path:
+        return archive_path.with_name(archive_path.name + INDEX_FILE_NAME)
+
+    @classmethod
+    def load(cls, archive_path: Path, use_cache: bool = True) -> "ArchiveIndex":
+        """The cached index of `archive_path` (empty without a cache)"""
+        cached = cls._load_cache(cls.cache_path(archive_path)) if use_cache else {}
+        return cls(archive_path, cached, use_cache)
+
+    @classmethod
+    def build(cls, folder_path: Path, use_cache: bool = True) -> "ArchiveIndex":
+        """
+        Index every member of the archive at `folder_path`, decompressing
+        only members that are new or whose size/mtime changed.
+        """
+        index = cls.load(folder_path, use_cache)
+        present: Set[str] = set()
+
+        def unknown(member: ArchiveMember) -> bool:
+            present.add(member.name)
+            return index.season_of(member) is None
+
+        scanned = 0
+        with MatchArchive(folder_path) as archive:
+            for member, raw in archive.iter_members(unknown):
+                index.header(member, raw)
+                scanned += 1
+
+        for name in index.headers.keys() - present:
+            del index.headers[name]
+            index._changed = True
+
+        index.save()
+        logger.info(f"Indexed {len(present)} archive members ({scanned} scanned, {len(present) - scanned} cached)")
+        return index
+
+    def season_of(self, member: ArchiveMember) -> Optional[str]:
+        """Cached season of `member`, None when unknown or changed"""
+        header = self.headers.get(member.name)
+        if (
+            header is None
+            or header.file_size != member.file_size
+            or header.file_mtime != member.file_mtime
+        ):
+            return None
+        return header.season
+
+    def header(self, member: ArchiveMember, raw: bytes) -> MatchHeader:
+        """Header of a member already read, parsed and recorded if not cached"""
+        if self.season_of(member) is None:
+            header = read_match_header_bytes(member.name, member.match_id, raw)
+            header.file_size = member.file_size
+            header.file_mtime = member.file_mtime
+            self.headers[member.name] = header
+            self._changed = True
+        return self.headers[member.name]
+
+    def save(self) -> None:
+        """Write the cache if members were added or removed"""
+        if self.use_cache and self._changed:
+            self._save_cache(self.cache_path(self.folder_path))
+            self._changed = False
+
+    def files_for_season(self, season: Optional[str] = None) -> List[Path]:
+        raise NotImplementedError("Archive members are read through MatchArchive")
@@ -1,7 +1,14 @@
 from collections import defaultdict
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from ipl_analytics.ingestion.ingest_match import ingest_match_batch
 from ipl_analytics.models.delivery import Delivery
+from ipl_analytics.models.delivery_batch import DeliveryBatch
 
 
 def validate_deliveries(deliveries: List[Delivery]) -> None:
@@ -33,3 +40,219 @@ def validate_deliveries(deliveries: List[Delivery]) -> None:
             raise ValueError(f"Innings {innings} has {balls} legal balls")
 
     print("✅ Delivery validation passed")
+
+
+# ---------------------------------------------------------------------------
+# Vectorized validation over whole batches / seasons
+# ---------------------------------------------------------------------------
+
+MAX_WICKETS_PER_INNINGS = 10
+MAX_LEGAL_BALLS_PER_INNINGS = 120
+MAX_LEGAL_BALLS_PER_OVER = 6
+
+
+@dataclass
+class ValidationIssue:
+    """One violated invariant for one match (and innings/over where relevant)"""
+
+    check: str
+    match_id: int
+    message: str
+    innings: Optional[int] = None
+    over: Optional[int] = None
+    rows: int = 1
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validate_batch(): every violation, not just the first"""
+
+    deliveries: int
+    matches: int
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def counts_by_check(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for issue in self.issues:
+            counts[issue.check] += 1
+        return dict(counts)
+
+    def invalid_match_ids(self) -> List[int]:
+        return sorted({issue.match_id for issue in self.issues})
+
+    def to_dict(self) -> dict:
+        return {
+            "deliveries": self.deliveries,
+            "matches": self.matches,
+            "ok": self.ok,
+            "counts_by_check": self.counts_by_check(),
+            "issues": [asdict(issue) for issue in self.issues],
+        }
+
+    def merge(self, other: "ValidationReport") -> "ValidationReport":
+        return ValidationReport(
+            deliveries=self.deliveries + other.deliveries,
+            matches=self.matches + other.matches,
+            issues=self.issues + other.issues,
+        )
+
+
+def _group(*keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group rows by the given integer key columns.
+
+    Returns:
+        (first row index of each group, group number of each row)
+    """
+    stacked = np.stack([k.astype(np.int64) for k in keys], axis=1)
+    _, first, inverse = np.unique(stacked, axis=0, return_index=True, return_inverse=True)
+    return first, inverse.reshape(-1)
+
+
+def _codes(column: np.ndarray) -> np.ndarray:
+    """Integer codes for an object (text) column; None gets its own code"""
+    _, codes = np.unique(np.where(np.equal(column, None), "", column).astype(str), return_inverse=True)
+    return codes.reshape(-1)
+
+
+def validate_batch(batch: DeliveryBatch) -> ValidationReport:
+    """
+    Check cricket invariants over a whole batch (one match up to a season
+    or archive) with grouped, vectorized operations.
+
+    Checks:
+        - wickets per innings <= 10
+        - legal balls per innings <= 120
+        - legal balls per over <= 6
+        - delivery_seq strictly increasing within each innings
+        - dismissed_batter is the batter or non-striker of its ball
+        - one season and one venue per match
+
+    Returns:
+        ValidationReport listing every violation
+    """
+    n = len(batch)
+    match_ids = batch.match_id
+    issues: List[ValidationIssue] = []
+
+    if n == 0:
+        return ValidationReport(deliveries=0, matches=0)
+
+    # Per-innings totals
+    first, groups = _group(match_ids, batch.innings)
+    wickets = np.bincount(groups, weights=batch.is_wicket).astype(np.int64)
+    legal = np.bincount(groups, weights=batch.is_legal_ball).astype(np.int64)
+
+    for g in np.flatnonzero(wickets > MAX_WICKETS_PER_INNINGS):
+        i = first[g]
+        issues.append(ValidationIssue(
+            check="wickets_per_innings",
+            match_id=int(match_ids[i]),
+            innings=int(batch.innings[i]),
+            message=f"Innings {batch.innings[i]} has {wickets[g]} wickets",
+            rows=int(wickets[g]),
+        ))
+
+    for g in np.flatnonzero(legal > MAX_LEGAL_BALLS_PER_INNINGS):
+        i = first[g]
+        issues.append(ValidationIssue(
+            check="legal_balls_per_innings",
+            match_id=int(match_ids[i]),
+            innings=int(batch.innings[i]),
+            message=f"Innings {batch.innings[i]} has {legal[g]} legal balls",
+            rows=int(legal[g]),
+        ))
+
+    # Legal balls per over
+    over_first, over_groups = _group(match_ids, batch.innings, batch.over)
+    over_legal = np.bincount(over_groups, weights=batch.is_legal_ball).astype(np.int64)
+
+    for g in np.flatnonzero(over_legal > MAX_LEGAL_BALLS_PER_OVER):
+        i = over_first[g]
+        issues.append(ValidationIssue(
+            check="legal_balls_per_over",
+            match_id=int(match_ids[i]),
+            innings=int(batch.innings[i]),
+            over=int(batch.over[i]),
+            message=f"Over {batch.over[i]} of innings {batch.innings[i]} has {over_legal[g]} legal balls",
+            rows=int(over_legal[g]),
+        ))
+
+    # delivery_seq must increase within an innings, in stored row order
+    order = np.argsort(groups, kind="stable")
+    same_innings = groups[order][1:] == groups[order][:-1]
+    not_increasing = same_innings & (np.diff(batch.delivery_seq[order].astype(np.int64)) <= 0)
+    if not_increasing.any():
+        bad_rows = order[1:][not_increasing]
+        bad_groups, bad_counts = np.unique(groups[bad_rows], return_counts=True)
+        for g, count in zip(bad_groups, bad_counts):
+            i = first[g]
+            issues.append(ValidationIssue(
+                check="delivery_seq_monotonic",
+                match_id=int(match_ids[i]),
+                innings=int(batch.innings[i]),
+                message=f"Innings {batch.innings[i]} has {count} out-of-order or repeated delivery_seq values",
+                rows=int(count),
+            ))
+
+    # Dismissed batter must be on strike or at the non-striker's end
+    wicket_rows = np.flatnonzero(batch.is_wicket)
+    if wicket_rows.size:
+        dismissed = batch.dismissed_batter[wicket_rows]
+        valid = (dismissed == batch.batter[wicket_rows]) | (dismissed == batch.non_striker[wicket_rows])
+        bad_rows = wicket_rows[~valid.astype(bool)]
+        if bad_rows.size:
+            bad_matches, bad_counts = np.unique(match_ids[bad_rows], return_counts=True)
+            for match_id, count in zip(bad_matches, bad_counts):
+                issues.append(ValidationIssue(
+                    check="dismissed_batter_at_crease",
+                    match_id=int(match_id),
+                    message=f"{count} wickets dismiss a player who is neither batter nor non-striker",
+                    rows=int(count),
+                ))
+
+    # One season and one venue per match
+    match_first, match_groups = _group(match_ids)
+    for name in ("season", "venue"):
+        column = getattr(batch, name)
+        _, pair_inverse = np.unique(
+            np.stack([match_groups, _codes(column)], axis=1), axis=0, return_inverse=True
+        )
+        distinct_per_match = np.bincount(
+            match_groups[np.unique(pair_inverse.reshape(-1), return_index=True)[1]],
+            minlength=len(match_first),
+        )
+        for g in np.flatnonzero(distinct_per_match > 1):
+            i = match_first[g]
+            issues.append(ValidationIssue(
+                check=f"consistent_{name}",
+                match_id=int(match_ids[i]),
+                message=f"Match {match_ids[i]} has {distinct_per_match[g]} different {name} values",
+                rows=int(np.count_nonzero(match_groups == g)),
+            ))
+
+    issues.sort(key=lambda issue: (issue.match_id, issue.innings or 0, issue.over or 0, issue.check))
+
+    return ValidationReport(deliveries=n, matches=len(match_first), issues=issues)
+
+
+def validate_files(json_files: Sequence[Path], workers: int = 1) -> ValidationReport:
+    """
+    Parse match files into one batch and validate them in a single pass.
+
+    Args:
+        json_files: Match JSON files (e.g. a whole season or archive)
+        workers: Number of parser processes
+    """
+    if workers <= 1:
+        batches = [ingest_match_batch(p) for p in json_files]
+    else:
+        chunksize = max(1, len(json_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(ingest_match_batch, json_files, chunksize=chunksize))
+
+    return validate_batch(DeliveryBatch.concat(batches))
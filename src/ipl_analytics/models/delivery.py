@@ -46,3 +46,27 @@ class Delivery(BaseModel):
     @property
     def total_runs(self) -> int:
         return self.runs_batter + self.runs_extras
+
+
+# Column order shared by the parser, DeliveryBatch and the DB writers
+DELIVERY_COLUMNS = (
+    "match_id",
+    "season",
+    "venue",
+    "innings",
+    "over",
+    "ball",
+    "delivery_seq",
+    "batting_team",
+    "batter",
+    "bowler",
+    "non_striker",
+    "runs_batter",
+    "runs_extras",
+    "extras_type",
+    "is_legal_ball",
+    "is_wicket",
+    "dismissed_batter",
+    "wicket_type",
+    "phase",
+)
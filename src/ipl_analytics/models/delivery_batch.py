@@ -0,0 +1,209 @@
+"""
+Columnar, validation-light container for many deliveries.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from ipl_analytics.models.delivery import DELIVERY_COLUMNS, Delivery
+
+
+INT_COLUMNS = (
+    "match_id",
+    "innings",
+    "over",
+    "ball",
+    "delivery_seq",
+    "runs_batter",
+    "runs_extras",
+)
+BOOL_COLUMNS = ("is_legal_ball", "is_wicket")
+
+# Columns that must be >= 0, mirroring Field(ge=0) on Delivery
+NON_NEGATIVE_COLUMNS = ("runs_batter", "runs_extras")
+
+
+class DeliveryBatch:
+    """
+    Deliveries stored column by column.
+
+    Integer and boolean columns are NumPy arrays, text columns are object
+    arrays, one entry per ball. The parser builds a batch straight from raw
+    tuples (see from_rows), so no per-ball model object is created, and
+    validate() applies the Delivery model's constraints to whole columns at
+    once.
+
+    `registry` maps player names to their Cricsheet registry identifiers,
+    when the source file provides them.
+    """
+
+    __slots__ = DELIVERY_COLUMNS + ("registry",)
+
+    def __init__(self, registry: Optional[Dict[str, str]] = None, **columns: Sequence):
+        missing = set(DELIVERY_COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing delivery columns: {sorted(missing)}")
+
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Delivery columns have different lengths")
+
+        for name in DELIVERY_COLUMNS:
+            values = columns[name]
+            if name in INT_COLUMNS:
+                array = np.asarray(values, dtype=np.int32)
+            elif name in BOOL_COLUMNS:
+                array = np.asarray(values, dtype=np.bool_)
+            else:
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+            setattr(self, name, array)
+
+        self.registry = registry or {}
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[tuple],
+        registry: Optional[Dict[str, str]] = None,
+    ) -> "DeliveryBatch":
+        """Build a batch from tuples in DELIVERY_COLUMNS order"""
+        if not rows:
+            return cls.empty()
+        return cls(registry=registry, **dict(zip(DELIVERY_COLUMNS, zip(*rows))))
+
+    @classmethod
+    def from_deliveries(cls, deliveries: Iterable[Delivery]) -> "DeliveryBatch":
+        return cls.from_rows([delivery_row(d) for d in deliveries])
+
+    @classmethod
+    def empty(cls) -> "DeliveryBatch":
+        return cls(**{name: [] for name in DELIVERY_COLUMNS})
+
+    @classmethod
+    def concat(cls, batches: Iterable["DeliveryBatch"]) -> "DeliveryBatch":
+        batches = list(batches)
+        if not batches:
+            return cls.empty()
+        registry: Dict[str, str] = {}
+        for b in batches:
+            registry.update(b.registry)
+        return cls(registry=registry, **{
+            name: np.concatenate([getattr(b, name) for b in batches])
+            for name in DELIVERY_COLUMNS
+        })
+
+    def __len__(self) -> int:
+        return len(self.match_id)
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.registry = {}
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def take(self, selector) -> "DeliveryBatch":
+        """Rows selected by a boolean mask, index array or slice"""
+        return DeliveryBatch(registry=self.registry, **{
+            name: getattr(self, name)[selector] for name in DELIVERY_COLUMNS
+        })
+
+    def validate(self) -> None:
+        """
+        Check the Delivery model's field constraints on every row.
+
+        Raises:
+            ValueError naming the column, the number of bad rows and the
+            first offending match/innings/delivery
+        """
+        for name in NON_NEGATIVE_COLUMNS:
+            bad = np.flatnonzero(getattr(self, name) < 0)
+            if bad.size:
+                i = bad[0]
+                raise ValueError(
+                    f"{name} must be >= 0: {bad.size} rows violate it "
+                    f"(first: match {self.match_id[i]}, innings {self.innings[i]}, "
+                    f"delivery {self.delivery_seq[i]})"
+                )
+
+        for name in ("season", "venue", "batting_team", "batter", "bowler", "non_striker", "phase"):
+            column = getattr(self, name)
+            bad = np.flatnonzero(np.equal(column, None))
+            if bad.size:
+                raise ValueError(f"{name} is required: {bad.size} rows are missing it")
+
+    def rows(self) -> Iterator[tuple]:
+        """Plain-Python tuples in DELIVERY_COLUMNS order, ready for the DB"""
+        return zip(*(getattr(self, name).tolist() for name in DELIVERY_COLUMNS))
+
+    def to_deliveries(self) -> List[Delivery]:
+        """Materialise validated Delivery models (slow; for compatibility)"""
+        return [Delivery(**dict(zip(DELIVERY_COLUMNS, row))) for row in self.rows()]
+
+    def players(self) -> Set[str]:
+        """Every player name appearing in the batch"""
+        players: Set[str] = set()
+        for name in ("batter", "bowler", "non_striker", "dismissed_batter"):
+            players.update(getattr(self, name).tolist())
+        players.discard(None)
+        return players
+
+    def match_header(self) -> Tuple[int, str, str]:
+        """(match_id, season, venue) of the first row"""
+        if not len(self):
+            raise ValueError("No deliveries provided")
+        return int(self.match_id[0]), self.season[0], self.venue[0]
+
+
+DeliveryChunk = Union[DeliveryBatch, Sequence[Delivery]]
+
+
+def delivery_row(d: Delivery) -> tuple:
+    """Values of a delivery in DELIVERY_COLUMNS order."""
+    return (
+        d.match_id,
+        d.season,
+        d.venue,
+        d.innings,
+        d.over,
+        d.ball,
+        d.delivery_seq,
+        d.batting_team,
+        d.batter,
+        d.bowler,
+        d.non_striker,
+        d.runs_batter,
+        d.runs_extras,
+        d.extras_type,
+        d.is_legal_ball,
+        d.is_wicket,
+        d.dismissed_batter,
+        d.wicket_type,
+        d.phase.value,
+    )
+
+
+def chunk_rows(deliveries: Union[DeliveryChunk, Iterable[Delivery]]) -> Iterator[tuple]:
+    """DB-ready rows of a DeliveryBatch or of any iterable of Delivery"""
+    if isinstance(deliveries, DeliveryBatch):
+        return deliveries.rows()
+    return (delivery_row(d) for d in deliveries)
+
+
+def chunk_header(deliveries: DeliveryChunk) -> Tuple[int, str, str]:
+    """(match_id, season, venue) of either a DeliveryBatch or Delivery objects"""
+    if isinstance(deliveries, DeliveryBatch):
+        return deliveries.match_header()
+    if not deliveries:
+        raise ValueError("No deliveries provided")
+    d0 = deliveries[0]
+    return d0.match_id, d0.season, d0.venue
+
+
+def chunk_match_ids(deliveries: DeliveryChunk) -> Set[int]:
+    """Distinct match_ids of either a DeliveryBatch or Delivery objects"""
+    if isinstance(deliveries, DeliveryBatch):
+        return {int(m) for m in set(deliveries.match_id.tolist())}
+    return {d.match_id for d in deliveries}
@@ -1,23 +1,37 @@
 """
 Base repository class
 """
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 from ipl_analytics.db.pool import DatabasePool
+from ipl_analytics.db.instrumentation import elapsed_ms, explain, query_recorder
+from ipl_analytics.db.prepared import execute_command, prepared_statements
+from ipl_analytics.repositories.player_names import player_names
 
 
 class BaseRepository(ABC):
-    """Base repository with common database operations"""
+    """
+    Base repository with common database operations
+    
+    Query methods are coroutines: the blocking psycopg2 calls run on the
+    pool's executor (DatabasePool.run), so routes never stall the event loop.
+    
+    Hot queries pass a `name` to execute_query() and run as prepared
+    statements, parsed once per pooled connection (see db/prepared.py).
+    Every query is timed under that name (see db/instrumentation.py).
+    """
     
     def __init__(self):
         self.pool = DatabasePool
     
-    def execute_query(
+    async def execute_query(
         self,
         query: str,
         params: Optional[tuple] = None,
         fetch_one: bool = False,
-        fetch_all: bool = True
+        fetch_all: bool = True,
+        name: Optional[str] = None
     ) -> Any:
         """
         Execute a SELECT query
@@ -27,21 +41,90 @@ class BaseRepository(ABC):
             params: Query parameters
             fetch_one: Return single row
             fetch_all: Return all rows
+            name: Run as a prepared statement under this label; also the
+                name the query's metrics are recorded under
             
         Returns:
             Query results
         """
-        with self.pool.get_cursor() as cursor:
-            cursor.execute(query, params)
+        return await self.pool.run(self._execute, query, params, fetch_one, fetch_all, name)
+    
+    def _execute(
+        self,
+        query: str,
+        params: Optional[tuple],
+        fetch_one: bool,
+        fetch_all: bool,
+        name: Optional[str] = None
+    ) -> Any:
+        """Blocking part of execute_query(); runs on the pool's executor"""
+        started = time.perf_counter()
+        acquired = None
+        try:
+            with self.pool.get_cursor() as cursor:
+                acquired = time.perf_counter()
+                if name:
+                    prepared_statements.execute(cursor, name, query, params)
+                else:
+                    cursor.execute(query, params)
+                
+                if fetch_one:
+                    result = cursor.fetchone()
+                    rows = 1 if result is not None else 0
+                elif fetch_all:
+                    result = cursor.fetchall()
+                    rows = len(result)
+                else:
+                    result = None
+                    rows = 0
+                
+                duration_ms = elapsed_ms(acquired)
+                plan = None
+                if (
+                    duration_ms >= query_recorder.slow_query_ms
+                    and query_recorder.explain_slow_queries
+                ):
+                    plan = explain(
+                        cursor,
+                        execute_command(name, query, params) if name else query,
+                        params
+                    )
+        except Exception as e:
+            finished = time.perf_counter()
+            query_recorder.record(
+                name,
+                duration_ms=(finished - acquired) * 1000 if acquired else 0.0,
+                pool_wait_ms=((acquired or finished) - started) * 1000,
+                error=e
+            )
+            raise
+        
+        query_recorder.record(
+            name,
+            duration_ms=duration_ms,
+            pool_wait_ms=(acquired - started) * 1000,
+            rows=rows,
+            plan=plan
+        )
+        return result
+    
+    async def resolve_player_id(self, player_name: str) -> Optional[int]:
+        """
+        Look up a player's id by name or alias (case-insensitive)
+        
+        Resolved in memory (see player_names.py), so queries can filter on
+        the indexed id columns with plain equality.
+        
+        Args:
+            player_name: Player name as given by the caller
             
-            if fetch_one:
-                return cursor.fetchone()
-            elif fetch_all:
-                return cursor.fetchall()
-            else:
-                return None
-    
-    def execute_many(
+        Returns:
+            player_id, or None if no player matches
+        """
+        player = await player_names.resolve(player_name)
+        return player.player_id if player else None
+    
+    async def execute_many(
         self,
         query: str,
         params_list: List[tuple]
@@ -53,5 +136,8 @@ class BaseRepository(ABC):
             query: SQL query string
             params_list: List of parameter tuples
         """
+        await self.pool.run(self._execute_many, query, params_list)
+    
+    def _execute_many(self, query: str, params_list: List[tuple]) -> None:
         with self.pool.get_cursor() as cursor:
             cursor.executemany(query, params_list)
@@ -2,13 +2,14 @@
 Repository for batter analytics data access
 """
 from typing import Optional, List, Dict, Any
+import psycopg2
 from ipl_analytics.repositories.base import BaseRepository
 
 
 class BatterRepository(BaseRepository):
     """Handles all batter-related database queries"""
     
-    def get_batter_profile(self, batter_name: str) -> Optional[Dict[str, Any]]:
+    async def get_batter_profile(self, batter_name: str) -> Optional[Dict[str, Any]]:
         """
         Get complete batter profile from analytics view (with fallback to direct query)
         
@@ -18,6 +19,10 @@ class BatterRepository(BaseRepository):
         Returns:
             Dictionary with batter profile data or None
         """
+        batter_id = await self.resolve_player_id(batter_name)
+        if batter_id is None:
+            return None
+        
         # Try analytics view first, fallback to direct query if view doesn't exist or query raises
         query = """
             SELECT 
@@ -39,14 +44,17 @@ class BatterRepository(BaseRepository):
                 lbw_outs,
                 stumped_outs
             FROM analytics.batter_profile
-            WHERE batter ILIKE %s
+            WHERE batter_id = %s
         """
         try:
-            result = self.execute_query(query, (batter_name,), fetch_one=True)
-        except Exception:
+            result = await self.execute_query(
+                query, (batter_id,), fetch_one=True, name="batter_profile"
+            )
+        except psycopg2.Error:
+            # Missing view (migration 004 not run); PoolTimeout propagates
             result = None
         if not result:
-            result = self._get_batter_profile_direct(batter_name)
+            result = await self._get_batter_profile_direct(batter_id)
         
         if not result:
             return None
@@ -74,7 +82,7 @@ class BatterRepository(BaseRepository):
             "stumped_outs": result[16] or 0,
         }
     
-    def _get_batter_profile_direct(self, batter_name: str) -> Optional[tuple]:
+    async def _get_batter_profile_direct(self, batter_id: int) -> Optional[tuple]:
         """
         Fallback method to get batter profile directly from deliveries table
         (used when analytics view doesn't exist)
@@ -82,35 +90,35 @@ class BatterRepository(BaseRepository):
         query = """
             WITH base AS (
                 SELECT
-                    %s as batter,
+                    (SELECT player_name FROM players WHERE player_id = %s) as batter,
                     COUNT(DISTINCT match_id) as matches,
                     COUNT(*) FILTER (WHERE is_legal_ball) as balls,
                     SUM(runs_batter) as runs,
                     COUNT(*) FILTER (
-                        WHERE is_wicket = true AND dismissed_batter ILIKE %s
+                        WHERE is_wicket = true AND dismissed_batter_id = %s
                     ) as outs
                 FROM deliveries
-                WHERE batter ILIKE %s
+                WHERE batter_id = %s
             ),
             phase_stats AS (
                 SELECT
-                    SUM(runs_batter) FILTER (WHERE phase = 'powerplay') AS pp_runs,
-                    COUNT(*) FILTER (WHERE phase = 'powerplay' AND is_legal_ball) AS pp_balls,
-                    SUM(runs_batter) FILTER (WHERE phase = 'middle') AS mid_runs,
-                    COUNT(*) FILTER (WHERE phase = 'middle' AND is_legal_ball) AS mid_balls,
-                    SUM(runs_batter) FILTER (WHERE phase = 'death') AS death_runs,
-                    COUNT(*) FILTER (WHERE phase = 'death' AND is_legal_ball) AS death_balls
+                    SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay')) AS pp_runs,
+                    COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay') AND is_legal_ball) AS pp_balls,
+                    SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle')) AS mid_runs,
+                    COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle') AND is_legal_ball) AS mid_balls,
+                    SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death')) AS death_runs,
+                    COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death') AND is_legal_ball) AS death_balls
                 FROM deliveries
-                WHERE batter ILIKE %s
+                WHERE batter_id = %s
             ),
             dismissals AS (
                 SELECT
-                    COUNT(*) FILTER (WHERE wicket_type = 'caught') AS caught_outs,
-                    COUNT(*) FILTER (WHERE wicket_type = 'bowled') AS bowled_outs,
-                    COUNT(*) FILTER (WHERE wicket_type = 'lbw') AS lbw_outs,
-                    COUNT(*) FILTER (WHERE wicket_type = 'stumped') AS stumped_outs
+                    COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'caught')) AS caught_outs,
+                    COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'bowled')) AS bowled_outs,
+                    COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'lbw')) AS lbw_outs,
+                    COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'stumped')) AS stumped_outs
                 FROM deliveries
-                WHERE is_wicket = true AND dismissed_batter ILIKE %s
+                WHERE is_wicket = true AND dismissed_batter_id = %s
             )
             SELECT
                 b.batter,
@@ -134,13 +142,14 @@ class BatterRepository(BaseRepository):
             CROSS JOIN phase_stats p
             CROSS JOIN dismissals d
         """
-        return self.execute_query(
+        return await self.execute_query(
             query,
-            (batter_name, batter_name, batter_name, batter_name, batter_name),
-            fetch_one=True
+            (batter_id, batter_id, batter_id, batter_id, batter_id),
+            fetch_one=True,
+            name="batter_profile_direct"
         )
     
-    def get_recent_form(
+    async def get_recent_form(
         self,
         batter_name: str,
         num_matches: int = 5,
@@ -157,6 +166,8 @@ class BatterRepository(BaseRepository):
         Returns:
             Tuple of (recent_matches list, summary dict)
         """
+        batter_id = await self.resolve_player_id(batter_name)
+        
         # Get recent match IDs
         match_query = """
             WITH recent_matches AS (
@@ -168,7 +179,7 @@ class BatterRepository(BaseRepository):
                     FROM (
                         SELECT DISTINCT match_id
                         FROM deliveries
-                        WHERE batter ILIKE %s
+                        WHERE batter_id = %s
                         {season_filter}
                     ) m
                 ) ranked
@@ -178,13 +189,18 @@ class BatterRepository(BaseRepository):
         """
         
         if season:
-            match_query = match_query.format(season_filter="AND season = %s")
-            match_params = (batter_name, season, num_matches)
+            match_query = match_query.format(
+                season_filter="AND season_id = (SELECT season_id FROM seasons WHERE season = %s)"
+            )
+            match_params = (batter_id, season, num_matches)
         else:
             match_query = match_query.format(season_filter="")
-            match_params = (batter_name, num_matches)
+            match_params = (batter_id, num_matches)
         
-        match_ids = self.execute_query(match_query, match_params)
+        match_ids = (
+            await self.execute_query(match_query, match_params, name="recent_form_matches")
+            if batter_id is not None else None
+        )
         match_id_list = [row[0] for row in match_ids] if match_ids else []
         
         if not match_id_list:
@@ -198,25 +214,35 @@ class BatterRepository(BaseRepository):
             }
         
         # Get match-level stats
-        placeholders = ",".join(["%s"] * len(match_id_list))
-        match_stats_query = f"""
+        match_stats_query = """
             SELECT
-                match_id,
-                season,
-                venue,
-                SUM(runs_batter) as runs,
-                COUNT(*) FILTER (WHERE is_legal_ball) as balls,
-                COUNT(*) FILTER (
-                    WHERE is_wicket = true AND dismissed_batter ILIKE %s
-                ) as dismissed
-            FROM deliveries
-            WHERE batter ILIKE %s
-              AND match_id IN ({placeholders})
-            GROUP BY match_id, season, venue
-            ORDER BY match_id DESC
+                m.match_id,
+                s.season,
+                v.venue,
+                m.runs,
+                m.balls,
+                m.dismissed
+            FROM (
+                SELECT
+                    match_id,
+                    season_id,
+                    venue_id,
+                    SUM(runs_batter) as runs,
+                    COUNT(*) FILTER (WHERE is_legal_ball) as balls,
+                    COUNT(*) FILTER (
+                        WHERE is_wicket = true AND dismissed_batter_id = %s
+                    ) as dismissed
+                FROM deliveries
+                WHERE batter_id = %s
+                  AND match_id = ANY(%s)
+                GROUP BY match_id, season_id, venue_id
+            ) m
+            JOIN seasons s ON s.season_id = m.season_id
+            JOIN venues v ON v.venue_id = m.venue_id
+            ORDER BY m.match_id DESC
         """
-        params = tuple([batter_name, batter_name] + match_id_list)
-        match_stats = self.execute_query(match_stats_query, params)
+        params = (batter_id, batter_id, match_id_list)
+        match_stats = await self.execute_query(match_stats_query, params, name="recent_form_stats")
         
         # Format recent matches
         recent_matches = []
@@ -251,7 +277,7 @@ class BatterRepository(BaseRepository):
         
         return recent_matches, summary
     
-    def get_highest_score(self, batter_name: str) -> Optional[int]:
+    async def get_highest_score(self, batter_name: str) -> Optional[int]:
         """Get highest score for a batter"""
         query = """
             SELECT MAX(runs_batter) as highest_score
@@ -260,14 +286,17 @@ class BatterRepository(BaseRepository):
                     match_id,
                     SUM(runs_batter) as runs_batter
                 FROM deliveries
-                WHERE batter ILIKE %s
+                WHERE batter_id = %s
                 GROUP BY match_id
             ) match_totals
         """
-        result = self.execute_query(query, (batter_name,), fetch_one=True)
+        batter_id = await self.resolve_player_id(batter_name)
+        if batter_id is None:
+            return None
+        result = await self.execute_query(query, (batter_id,), fetch_one=True, name="highest_score")
         return result[0] if result and result[0] else None
     
-    def get_batter_profile_by_season(
+    async def get_batter_profile_by_season(
         self,
         batter_name: str,
         season: Optional[str] = None
@@ -282,6 +311,10 @@ class BatterRepository(BaseRepository):
         Returns:
             List of dictionaries with season-wise profile data
         """
+        batter_id = await self.resolve_player_id(batter_name)
+        if batter_id is None:
+            return []
+        
         if season:
             query = """
                 SELECT 
@@ -304,10 +337,10 @@ class BatterRepository(BaseRepository):
                     lbw_outs,
                     stumped_outs
                 FROM analytics.batter_profile_season
-                WHERE batter ILIKE %s AND season = %s
+                WHERE batter_id = %s AND season = %s
                 ORDER BY season
             """
-            params = (batter_name, season)
+            params = (batter_id, season)
         else:
             query = """
                 SELECT 
@@ -330,17 +363,17 @@ class BatterRepository(BaseRepository):
                     lbw_outs,
                     stumped_outs
                 FROM analytics.batter_profile_season
-                WHERE batter ILIKE %s
+                WHERE batter_id = %s
                 ORDER BY season
             """
-            params = (batter_name,)
+            params = (batter_id,)
         try:
-            results = self.execute_query(query, params)
-        except Exception:
+            results = await self.execute_query(query, params, name="batter_profile_season")
+        except psycopg2.Error:
             results = None
         if not results:
             # Fallback to direct query if view doesn't exist
-            return self._get_batter_profile_by_season_direct(batter_name, season)
+            return await self._get_batter_profile_by_season_direct(batter_id, season)
         
         return [
             {
@@ -366,9 +399,9 @@ class BatterRepository(BaseRepository):
             for row in results
         ]
     
-    def _get_batter_profile_by_season_direct(
+    async def _get_batter_profile_by_season_direct(
         self,
-        batter_name: str,
+        batter_id: int,
         season: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
@@ -379,49 +412,49 @@ class BatterRepository(BaseRepository):
             query = """
                 WITH base AS (
                     SELECT
-                        batter,
-                        season,
+                        batter_id,
+                        season_id,
                         COUNT(DISTINCT match_id) AS matches,
                         COUNT(*) FILTER (WHERE is_legal_ball) AS balls,
                         SUM(runs_batter) AS runs,
                         COUNT(*) FILTER (
-                            WHERE is_wicket = true AND dismissed_batter = batter
+                            WHERE is_wicket = true AND dismissed_batter_id = batter_id
                         ) AS outs
                     FROM deliveries
-                    WHERE batter ILIKE %s AND season = %s
-                    GROUP BY batter, season
+                    WHERE batter_id = %s AND season_id = (SELECT season_id FROM seasons WHERE season = %s)
+                    GROUP BY batter_id, season_id
                 ),
                 phase_stats AS (
                     SELECT
-                        batter,
-                        season,
-                        SUM(runs_batter) FILTER (WHERE phase = 'powerplay') AS pp_runs,
-                        COUNT(*) FILTER (WHERE phase = 'powerplay' AND is_legal_ball) AS pp_balls,
-                        SUM(runs_batter) FILTER (WHERE phase = 'middle') AS mid_runs,
-                        COUNT(*) FILTER (WHERE phase = 'middle' AND is_legal_ball) AS mid_balls,
-                        SUM(runs_batter) FILTER (WHERE phase = 'death') AS death_runs,
-                        COUNT(*) FILTER (WHERE phase = 'death' AND is_legal_ball) AS death_balls
+                        batter_id,
+                        season_id,
+                        SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay')) AS pp_runs,
+                        COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay') AND is_legal_ball) AS pp_balls,
+                        SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle')) AS mid_runs,
+                        COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle') AND is_legal_ball) AS mid_balls,
+                        SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death')) AS death_runs,
+                        COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death') AND is_legal_ball) AS death_balls
                     FROM deliveries
-                    WHERE batter ILIKE %s AND season = %s
-                    GROUP BY batter, season
+                    WHERE batter_id = %s AND season_id = (SELECT season_id FROM seasons WHERE season = %s)
+                    GROUP BY batter_id, season_id
                 ),
                 dismissals AS (
                     SELECT
-                        batter,
-                        season,
-                        COUNT(*) FILTER (WHERE wicket_type = 'caught') AS caught_outs,
-                        COUNT(*) FILTER (WHERE wicket_type = 'bowled') AS bowled_outs,
-                        COUNT(*) FILTER (WHERE wicket_type = 'lbw') AS lbw_outs,
-                        COUNT(*) FILTER (WHERE wicket_type = 'stumped') AS stumped_outs
+                        batter_id,
+                        season_id,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'caught')) AS caught_outs,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'bowled')) AS bowled_outs,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'lbw')) AS lbw_outs,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'stumped')) AS stumped_outs
                     FROM deliveries
                     WHERE is_wicket = true
-                      AND dismissed_batter = batter
-                      AND batter ILIKE %s AND season = %s
-                    GROUP BY batter, season
+                      AND dismissed_batter_id = batter_id
+                      AND batter_id = %s AND season_id = (SELECT season_id FROM seasons WHERE season = %s)
+                    GROUP BY batter_id, season_id
                 )
                 SELECT
-                    b.batter,
-                    b.season,
+                    pl.player_name,
+                    s.season,
                     b.matches,
                     b.runs,
                     b.balls,
@@ -439,58 +472,60 @@ class BatterRepository(BaseRepository):
                     COALESCE(d.lbw_outs, 0),
                     COALESCE(d.stumped_outs, 0)
                 FROM base b
-                LEFT JOIN phase_stats p USING (batter, season)
-                LEFT JOIN dismissals d USING (batter, season)
-                ORDER BY b.season
+                JOIN players pl ON pl.player_id = b.batter_id
+                JOIN seasons s ON s.season_id = b.season_id
+                LEFT JOIN phase_stats p USING (batter_id, season_id)
+                LEFT JOIN dismissals d USING (batter_id, season_id)
+                ORDER BY s.season
             """
-            params = (batter_name, season, batter_name, season, batter_name, season)
+            params = (batter_id, season, batter_id, season, batter_id, season)
         else:
             query = """
                 WITH base AS (
                     SELECT
-                        batter,
-                        season,
+                        batter_id,
+                        season_id,
                         COUNT(DISTINCT match_id) AS matches,
                         COUNT(*) FILTER (WHERE is_legal_ball) AS balls,
                         SUM(runs_batter) AS runs,
                         COUNT(*) FILTER (
-                            WHERE is_wicket = true AND dismissed_batter = batter
+                            WHERE is_wicket = true AND dismissed_batter_id = batter_id
                         ) AS outs
                     FROM deliveries
-                    WHERE batter ILIKE %s
-                    GROUP BY batter, season
+                    WHERE batter_id = %s
+                    GROUP BY batter_id, season_id
                 ),
                 phase_stats AS (
                     SELECT
-                        batter,
-                        season,
-                        SUM(runs_batter) FILTER (WHERE phase = 'powerplay') AS pp_runs,
-                        COUNT(*) FILTER (WHERE phase = 'powerplay' AND is_legal_ball) AS pp_balls,
-                        SUM(runs_batter) FILTER (WHERE phase = 'middle') AS mid_runs,
-                        COUNT(*) FILTER (WHERE phase = 'middle' AND is_legal_ball) AS mid_balls,
-                        SUM(runs_batter) FILTER (WHERE phase = 'death') AS death_runs,
-                        COUNT(*) FILTER (WHERE phase = 'death' AND is_legal_ball) AS death_balls
+                        batter_id,
+                        season_id,
+                        SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay')) AS pp_runs,
+                        COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'powerplay') AND is_legal_ball) AS pp_balls,
+                        SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle')) AS mid_runs,
+                        COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'middle') AND is_legal_ball) AS mid_balls,
+                        SUM(runs_batter) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death')) AS death_runs,
+                        COUNT(*) FILTER (WHERE phase_id = (SELECT phase_id FROM phases WHERE phase = 'death') AND is_legal_ball) AS death_balls
                     FROM deliveries
-                    WHERE batter ILIKE %s
-                    GROUP BY batter, season
+                    WHERE batter_id = %s
+                    GROUP BY batter_id, season_id
                 ),
                 dismissals AS (
                     SELECT
-                        batter,
-                        season,
-                        COUNT(*) FILTER (WHERE wicket_type = 'caught') AS caught_outs,
-                        COUNT(*) FILTER (WHERE wicket_type = 'bowled') AS bowled_outs,
-                        COUNT(*) FILTER (WHERE wicket_type = 'lbw') AS lbw_outs,
-                        COUNT(*) FILTER (WHERE wicket_type = 'stumped') AS stumped_outs
+                        batter_id,
+                        season_id,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'caught')) AS caught_outs,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'bowled')) AS bowled_outs,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'lbw')) AS lbw_outs,
+                        COUNT(*) FILTER (WHERE wicket_type_id = (SELECT wicket_type_id FROM wicket_types WHERE wicket_type = 'stumped')) AS stumped_outs
                     FROM deliveries
                     WHERE is_wicket = true
-                      AND dismissed_batter = batter
-                      AND batter ILIKE %s
-                    GROUP BY batter, season
+                      AND dismissed_batter_id = batter_id
+                      AND batter_id = %s
+                    GROUP BY batter_id, season_id
                 )
                 SELECT
-                    b.batter,
-                    b.season,
+                    pl.player_name,
+                    s.season,
                     b.matches,
                     b.runs,
                     b.balls,
@@ -508,13 +543,15 @@ class BatterRepository(BaseRepository):
                     COALESCE(d.lbw_outs, 0),
                     COALESCE(d.stumped_outs, 0)
                 FROM base b
-                LEFT JOIN phase_stats p USING (batter, season)
-                LEFT JOIN dismissals d USING (batter, season)
-                ORDER BY b.season
+                JOIN players pl ON pl.player_id = b.batter_id
+                JOIN seasons s ON s.season_id = b.season_id
+                LEFT JOIN phase_stats p USING (batter_id, season_id)
+                LEFT JOIN dismissals d USING (batter_id, season_id)
+                ORDER BY s.season
             """
-            params = (batter_name, batter_name, batter_name)
+            params = (batter_id, batter_id, batter_id)
         
-        results = self.execute_query(query, params)
+        results = await self.execute_query(query, params, name="batter_profile_season_direct")
         
         if not results:
             return []
@@ -8,7 +8,7 @@ from ipl_analytics.repositories.base import BaseRepository
 class MatchRepository(BaseRepository):
     """Handles all match-related database queries"""
     
-    def get_match_info(self, match_id: int) -> Optional[Dict[str, Any]]:
+    async def get_match_info(self, match_id: int) -> Optional[Dict[str, Any]]:
         """
         Get basic match information
         
@@ -23,7 +23,7 @@ class MatchRepository(BaseRepository):
             FROM matches
             WHERE match_id = %s
         """
-        result = self.execute_query(query, (match_id,), fetch_one=True)
+        result = await self.execute_query(query, (match_id,), fetch_one=True, name="match_info")
         
         if not result:
             return None
@@ -37,18 +37,19 @@ class MatchRepository(BaseRepository):
             "toss": None    # Would need additional schema for toss info
         }
     
-    def match_exists(self, match_id: int) -> bool:
+    async def match_exists(self, match_id: int) -> bool:
         """Check if a match exists"""
         query = "SELECT EXISTS(SELECT 1 FROM matches WHERE match_id = %s)"
-        result = self.execute_query(query, (match_id,), fetch_one=True)
+        result = await self.execute_query(query, (match_id,), fetch_one=True, name="match_exists")
         return result[0] if result else False
 
-    def get_available_seasons(self) -> List[str]:
+    async def get_available_seasons(self) -> List[str]:
         """Return distinct seasons from deliveries (same table as matchup/batter stats), newest first."""
         query = """
-            SELECT DISTINCT season
-            FROM deliveries
-            ORDER BY season DESC
+            SELECT s.season
+            FROM seasons s
+            WHERE EXISTS (SELECT 1 FROM deliveries d WHERE d.season_id = s.season_id)
+            ORDER BY s.season DESC
         """
-        rows = self.execute_query(query, (), fetch_one=False)
+        rows = await self.execute_query(query, (), name="available_seasons")
         return [row[0] for row in rows] if rows else []
@@ -2,22 +2,31 @@
 Repository for matchup analytics data access
 """
 from typing import Optional, List, Dict, Any
+from psycopg2 import errors
 from ipl_analytics.repositories.base import BaseRepository
+from ipl_analytics.repositories.player_names import player_names
 
 
 class MatchupRepository(BaseRepository):
     """Handles all matchup-related database queries"""
     
-    def get_batter_bowler_matchup(
+    async def get_batter_bowler_matchup(
         self,
         batter_name: str,
         bowler_name: str,
         season: Optional[str] = None,
         venue: Optional[str] = None,
-        include_phases: bool = True
-    ) -> Optional[Dict[str, Any]]:
+        include_phases: bool = True,
+        phase: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Get batter vs bowler matchup statistics
+        Get batter vs bowler matchup statistics in a single query
+        
+        Totals and the phase breakdown are summed from the pair's rows of
+        analytics.matchup_cube (one per season, venue and phase), so their
+        cost does not grow with the number of deliveries stored. Recent
+        encounters are per match and still come from deliveries, through
+        the pair's entries of ix_deliveries_matchup.
         
         Args:
             batter_name: Name of the batter
@@ -25,63 +34,63 @@ class MatchupRepository(BaseRepository):
             season: Optional season filter
             venue: Optional venue filter
             include_phases: Whether to include phase breakdown
-            
+            phase: Optional phase filter (powerplay, middle, death)
+        
         Returns:
-            Dictionary with matchup data or None
+            Dictionary with matchup data; `batter_found` / `bowler_found`
+            report whether the players exist, and `overall` is None when
+            the pair has no balls under the given filters
         """
-        # Build WHERE clause (ILIKE for consistency with batter profile and to match stored names regardless of case)
-        where_clauses = ["batter ILIKE %s", "bowler ILIKE %s"]
-        params = [batter_name, bowler_name]
+        batter, bowler = await player_names.resolve_many(batter_name, bowler_name)
+        
+        matchup_data = {
+            "batter": batter_name,
+            "bowler": bowler_name,
+            "batter_found": batter is not None,
+            "bowler_found": bowler is not None,
+            "overall": None,
+            "phase_breakdown": {},
+            "recent_encounters": []
+        }
+        if batter is None or bowler is None:
+            return matchup_data
+        
+        where_clauses = ["batter_id = %s", "bowler_id = %s"]
+        params = [batter.player_id, bowler.player_id]
         
         if season:
-            where_clauses.append("season = %s")
+            where_clauses.append("season_id = (SELECT season_id FROM seasons WHERE season = %s)")
             params.append(season)
         
         if venue:
-            where_clauses.append("venue = %s")
+            where_clauses.append("venue_id = (SELECT venue_id FROM venues WHERE venue = %s)")
             params.append(venue)
         
+        if phase:
+            where_clauses.append("phase_id = (SELECT phase_id FROM phases WHERE phase = %s)")
+            params.append(phase)
+        
         where_sql = " AND ".join(where_clauses)
-        # #region agent log
-        import json, os
-        _log_paths = ["/Users/himankverma/Developer/projects/.cursor/debug.log", os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "debug.log"))]
-        _diag = self.execute_query("SELECT current_database(), (SELECT COUNT(*) FROM public.deliveries), (SELECT COUNT(*) FROM public.deliveries WHERE batter ILIKE %s AND bowler ILIKE %s), (SELECT COUNT(*) FILTER (WHERE is_legal_ball) FROM public.deliveries WHERE batter ILIKE %s AND bowler ILIKE %s)", (batter_name, bowler_name, batter_name, bowler_name), fetch_one=True)
-        _line = json.dumps({"location": "matchup_repository.py:get_batter_bowler_matchup", "message": "query params + connection diagnostic", "data": {"batter_name": batter_name, "bowler_name": bowler_name, "current_db": _diag[0] if _diag else None, "total_deliveries_in_public": _diag[1] if _diag else None, "matchup_rows_public": _diag[2] if _diag else None, "matchup_legal_balls_public": _diag[3] if _diag else None}, "timestamp": __import__("time").time() * 1000, "sessionId": "debug-session", "hypothesisId": "H3-H5"}) + "\n"
-        for _p in _log_paths:
-            try:
-                open(_p, "a").write(_line)
-            except Exception:
-                pass
-        # #endregion
-        # Overall stats
-        overall_query = f"""
-            SELECT
-                COUNT(*) FILTER (WHERE is_legal_ball) AS balls_faced,
-                SUM(runs_batter) AS runs,
-                COUNT(*) FILTER (
-                    WHERE is_wicket = true AND dismissed_batter ILIKE %s
-                ) AS outs
-            FROM public.deliveries
-            WHERE {where_sql}
-        """
-        # Order in query: dismissed_batter, batter, bowler [, season] [, venue]
-        params_overall = (batter_name, batter_name) + tuple(params[1:])
-        
-        result = self.execute_query(overall_query, params_overall, fetch_one=True)
-        # #region agent log
-        _line2 = json.dumps({"location": "matchup_repository.py:get_batter_bowler_matchup", "message": "overall query result", "data": {"result_is_none": result is None, "balls": result[0] if result else None, "runs": result[1] if result else None, "outs": result[2] if result else None}, "timestamp": __import__("time").time() * 1000, "sessionId": "debug-session", "hypothesisId": "H3-H5"}) + "\n"
-        for _p in _log_paths:
-            try:
-                open(_p, "a").write(_line2)
-            except Exception:
-                pass
-        # #endregion
-        if not result or (result[0] or 0) < 1:
-            return None
-        
-        balls = result[0] or 0
-        runs = result[1] or 0
-        outs = result[2] or 0
+        
+        # Read the cube, or the deliveries on databases without it (migration 007)
+        try:
+            row = await self.execute_query(
+                self._cube_query(where_sql, include_phases),
+                tuple(params) * 2,
+                fetch_one=True,
+                name="matchup_cube"
+            )
+        except errors.UndefinedTable:
+            row = await self.execute_query(
+                self._deliveries_query(where_sql, include_phases),
+                tuple(params),
+                fetch_one=True,
+                name="matchup"
+            )
+        balls, runs, outs, dots, boundaries, extras, phases, encounters = row
+        
+        if not balls:
+            return matchup_data
         
         strike_rate = round((runs / balls * 100), 2) if balls > 0 else 0.0
         average = round(runs / outs, 2) if outs > 0 else None
@@ -89,101 +98,182 @@ class MatchupRepository(BaseRepository):
         # Calculate confidence score (based on sample size)
         confidence_score = min(100, int((balls / 50) * 100)) if balls > 0 else 0
         
-        matchup_data = {
-            "batter": batter_name,
-            "bowler": bowler_name,
-            "overall": {
-                "runs": runs,
-                "balls": balls,
-                "dismissals": outs,
-                "strike_rate": strike_rate,
-                "average": average,
-                "confidence_score": confidence_score
-            },
-            "phase_breakdown": {},
-            "recent_encounters": []
+        matchup_data["overall"] = {
+            "runs": runs,
+            "balls": balls,
+            "dismissals": outs,
+            "strike_rate": strike_rate,
+            "average": average,
+            "confidence_score": confidence_score,
+            "dots": dots,
+            "boundaries": boundaries,
+            "extras": extras
         }
         
-        # Phase breakdown
-        if include_phases:
-            phase_query = f"""
+        for phase_row in phases or []:
+            phase_balls = phase_row["balls"]
+            phase_runs = phase_row["runs"]
+            phase_outs = phase_row["outs"]
+            phase_sr = round((phase_runs / phase_balls * 100), 2) if phase_balls > 0 else 0.0
+            phase_avg = round(phase_runs / phase_outs, 2) if phase_outs > 0 else None
+            
+            matchup_data["phase_breakdown"][phase_row["phase"]] = {
+                "runs": phase_runs,
+                "balls": phase_balls,
+                "outs": phase_outs,
+                "strike_rate": phase_sr,
+                "average": phase_avg
+            }
+        
+        for encounter in encounters or []:
+            matchup_data["recent_encounters"].append({
+                "match_id": encounter["match_id"],
+                "season": encounter["season"],
+                "runs": encounter["runs"],
+                "balls": encounter["balls"],
+                "dismissed": bool(encounter["dismissed"])
+            })
+        
+        return matchup_data
+    
+    def _cube_query(self, where_sql: str, include_phases: bool) -> str:
+        """Matchup from analytics.matchup_cube; binds the filter params twice"""
+        phases_sql = """
+            (
+                SELECT json_agg(json_build_object(
+                    'phase', ph.phase, 'balls', t.balls, 'runs', t.runs, 'outs', t.outs
+                ))
+                FROM (
+                    SELECT phase_id, SUM(balls) AS balls, SUM(runs) AS runs, SUM(outs) AS outs
+                    FROM cube
+                    GROUP BY phase_id
+                    HAVING SUM(balls) >= 8
+                ) t
+                JOIN phases ph ON ph.phase_id = t.phase_id
+            )
+        """ if include_phases else "NULL"
+        
+        return f"""
+            WITH cube AS MATERIALIZED (
+                SELECT phase_id, balls, runs, outs, dots, boundaries, extras
+                FROM analytics.matchup_cube
+                WHERE {where_sql}
+            ),
+            recent AS (
                 SELECT
-                    phase,
+                    match_id,
+                    season_id,
+                    COALESCE(SUM(runs_batter), 0) AS runs,
                     COUNT(*) FILTER (WHERE is_legal_ball) AS balls,
-                    SUM(runs_batter) AS runs,
-                    COUNT(*) FILTER (
-                        WHERE is_wicket = true AND dismissed_batter ILIKE %s
-                    ) AS outs
+                    bool_or(is_wicket AND dismissed_batter_id = batter_id) AS dismissed
                 FROM public.deliveries
                 WHERE {where_sql}
-                GROUP BY phase
-                HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 8
-            """
-            phase_params = (batter_name, batter_name) + tuple(params[1:])
-            phase_results = self.execute_query(phase_query, phase_params)
-            
-            for row in phase_results or []:
-                phase = row[0]
-                phase_balls = row[1] or 0
-                phase_runs = row[2] or 0
-                phase_outs = row[3] or 0
-                phase_sr = round((phase_runs / phase_balls * 100), 2) if phase_balls > 0 else 0.0
-                phase_avg = round(phase_runs / phase_outs, 2) if phase_outs > 0 else None
-                
-                matchup_data["phase_breakdown"][phase] = {
-                    "runs": phase_runs,
-                    "balls": phase_balls,
-                    "outs": phase_outs,
-                    "strike_rate": phase_sr,
-                    "average": phase_avg
-                }
-        
-        # Recent encounters (last 5 matches)
-        recent_query = f"""
-            SELECT DISTINCT match_id
-            FROM public.deliveries
-            WHERE {where_sql}
-            ORDER BY match_id DESC
-            LIMIT 5
+                GROUP BY match_id, season_id
+                ORDER BY match_id DESC
+                LIMIT 5
+            )
+            SELECT
+                totals.balls,
+                totals.runs,
+                totals.outs,
+                totals.dots,
+                totals.boundaries,
+                totals.extras,
+                {phases_sql} AS phases,
+                {self._recent_sql()} AS recent_encounters
+            FROM (
+                SELECT
+                    COALESCE(SUM(balls), 0) AS balls,
+                    COALESCE(SUM(runs), 0) AS runs,
+                    COALESCE(SUM(outs), 0) AS outs,
+                    COALESCE(SUM(dots), 0) AS dots,
+                    COALESCE(SUM(boundaries), 0) AS boundaries,
+                    COALESCE(SUM(extras), 0) AS extras
+                FROM cube
+            ) totals
         """
-        recent_match_ids = self.execute_query(recent_query, tuple(params))
+    
+    def _deliveries_query(self, where_sql: str, include_phases: bool) -> str:
+        """
+        Matchup aggregated from the pair's deliveries (used when
+        analytics.matchup_cube doesn't exist)
+        """
+        phases_sql = """
+            (
+                SELECT json_agg(json_build_object(
+                    'phase', ph.phase, 'balls', t.balls, 'runs', t.runs, 'outs', t.outs
+                ))
+                FROM (
+                    SELECT
+                        phase_id,
+                        COUNT(*) FILTER (WHERE is_legal_ball) AS balls,
+                        COALESCE(SUM(runs_batter), 0) AS runs,
+                        COUNT(*) FILTER (WHERE is_out) AS outs
+                    FROM matchup
+                    GROUP BY phase_id
+                    HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 8
+                ) t
+                JOIN phases ph ON ph.phase_id = t.phase_id
+            )
+        """ if include_phases else "NULL"
         
-        if recent_match_ids:
-            match_id_list = [row[0] for row in recent_match_ids]
-            placeholders = ",".join(["%s"] * len(match_id_list))
-            
-            encounter_query = f"""
+        # One round trip: overall, phase and recent-encounter sections all
+        # come from a single scan of the pair's deliveries
+        return f"""
+            WITH matchup AS MATERIALIZED (
                 SELECT
                     match_id,
-                    season,
-                    SUM(runs_batter) as runs,
-                    COUNT(*) FILTER (WHERE is_legal_ball) as balls,
-                    COUNT(*) FILTER (
-                        WHERE is_wicket = true AND dismissed_batter ILIKE %s
-                    ) > 0 as dismissed
+                    season_id,
+                    phase_id,
+                    is_legal_ball,
+                    runs_batter,
+                    runs_extras,
+                    (is_wicket AND dismissed_batter_id = batter_id) AS is_out
                 FROM public.deliveries
-                WHERE batter ILIKE %s
-                  AND bowler ILIKE %s
-                  AND match_id IN ({placeholders})
-                GROUP BY match_id, season
+                WHERE {where_sql}
+            ),
+            recent AS (
+                SELECT
+                    match_id,
+                    season_id,
+                    COALESCE(SUM(runs_batter), 0) AS runs,
+                    COUNT(*) FILTER (WHERE is_legal_ball) AS balls,
+                    bool_or(is_out) AS dismissed
+                FROM matchup
+                GROUP BY match_id, season_id
                 ORDER BY match_id DESC
-            """
-            encounter_params = tuple([
-                batter_name, batter_name, bowler_name
-            ] + match_id_list)
-            
-            encounters = self.execute_query(encounter_query, encounter_params)
-            
-            for row in encounters or []:
-                encounter_runs = row[2] or 0
-                encounter_balls = row[3] or 0
-                
-                matchup_data["recent_encounters"].append({
-                    "match_id": row[0],
-                    "season": row[1],
-                    "runs": encounter_runs,
-                    "balls": encounter_balls,
-                    "dismissed": bool(row[4])
-                })
-        
-        return matchup_data
+                LIMIT 5
+            )
+            SELECT
+                totals.balls,
+                totals.runs,
+                totals.outs,
+                totals.dots,
+                totals.boundaries,
+                totals.extras,
+                {phases_sql} AS phases,
+                {self._recent_sql()} AS recent_encounters
+            FROM (
+                SELECT
+                    COUNT(*) FILTER (WHERE is_legal_ball) AS balls,
+                    COALESCE(SUM(runs_batter), 0) AS runs,
+                    COUNT(*) FILTER (WHERE is_out) AS outs,
+                    COUNT(*) FILTER (WHERE is_legal_ball AND runs_batter = 0 AND runs_extras = 0) AS dots,
+                    COUNT(*) FILTER (WHERE runs_batter IN (4, 6)) AS boundaries,
+                    COALESCE(SUM(runs_extras), 0) AS extras
+                FROM matchup
+            ) totals
+        """
+    
+    def _recent_sql(self) -> str:
+        """Recent encounters as JSON, from a `recent` CTE"""
+        return """
+            (
+                SELECT json_agg(json_build_object(
+                    'match_id', r.match_id, 'season', s.season, 'runs', r.runs,
+                    'balls', r.balls, 'dismissed', r.dismissed
+                ) ORDER BY r.match_id DESC)
+                FROM recent r
+                JOIN seasons s ON s.season_id = r.season_id
+            )
+        """
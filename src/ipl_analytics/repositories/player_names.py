@@ -0,0 +1,129 @@
+"""
+Resolution of user-supplied player names to stored players
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ipl_analytics.db.pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+ALIASES_TABLE = "player_aliases"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def name_key(name: str) -> str:
+    """Lookup key of a name: case-folded, whitespace collapsed ("v  kohli " -> "v kohli")"""
+    return _WHITESPACE.sub(" ", name).strip().casefold()
+
+
+@dataclass(frozen=True)
+class Player:
+    """A stored player"""
+
+    player_id: int
+    player_name: str
+
+
+class PlayerNameResolver:
+    """
+    In-memory map from case-folded names and aliases to players
+
+    The players table is small, so it is loaded once and every lookup after
+    that is a dict access rather than an ILIKE scan. Names that differ only
+    in case resolve like before: an exact match wins, then the lowest
+    player_id. Entries of the player_aliases table ("Virat Kohli" ->
+    V Kohli's id) resolve to their player too.
+
+    A name that is not found triggers a reload, at most once every
+    `refresh_interval` seconds, so players added by ingestion show up
+    without restarting the API.
+    """
+
+    def __init__(self, refresh_interval: float = 60.0):
+        self.refresh_interval = refresh_interval
+        self._by_key: Dict[str, List[Player]] = {}
+        self._by_name: Dict[str, Player] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    async def resolve(self, name: str) -> Optional[Player]:
+        """
+        Stored player for a user-supplied name or alias
+
+        Args:
+            name: Player name as given by the caller
+
+        Returns:
+            The player, or None if no name or alias matches
+        """
+        if self._loaded_at is None:
+            await DatabasePool.run(self.load)
+
+        player = self.lookup(name)
+        if player is None and self._stale():
+            await DatabasePool.run(self.load)
+            player = self.lookup(name)
+        return player
+
+    async def resolve_many(self, *names: str) -> Tuple[Optional[Player], ...]:
+        """resolve() for several names, loading the map at most once"""
+        return tuple(await asyncio.gather(*(self.resolve(name) for name in names)))
+
+    def lookup(self, name: str) -> Optional[Player]:
+        """Resolve against the loaded map only"""
+        exact = self._by_name.get(name)
+        if exact is not None:
+            return exact
+        candidates = self._by_key.get(name_key(name))
+        return candidates[0] if candidates else None
+
+    def _stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.refresh_interval
+        )
+
+    def load(self) -> None:
+        """(Re)load players and aliases; blocking"""
+        with self._lock:
+            # Another request may have reloaded while this one waited
+            if self._loaded_at is not None and not self._stale():
+                return
+
+            with DatabasePool.get_cursor() as cursor:
+                cursor.execute("SELECT player_id, player_name FROM players ORDER BY player_id")
+                players = [Player(player_id, player_name) for player_id, player_name in cursor.fetchall()]
+
+                cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (ALIASES_TABLE,))
+                aliases = []
+                if cursor.fetchone()[0]:
+                    cursor.execute(f"SELECT alias, player_id FROM {ALIASES_TABLE}")
+                    aliases = cursor.fetchall()
+
+            by_id = {p.player_id: p for p in players}
+            by_name = {p.player_name: p for p in players}
+            by_key: Dict[str, List[Player]] = {}
+            for player in players:  # player_id order, so the lowest id comes first
+                by_key.setdefault(name_key(player.player_name), []).append(player)
+            for alias, player_id in aliases:
+                player = by_id.get(player_id)
+                if player is not None and player not in by_key.get(name_key(alias), []):
+                    by_key.setdefault(name_key(alias), []).append(player)
+
+            self._by_key, self._by_name = by_key, by_name
+            self._loaded_at = time.monotonic()
+            logger.info(f"Loaded {len(players)} player names and {len(aliases)} aliases")
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup"""
+        self._loaded_at = None
+
+
+player_names = PlayerNameResolver()
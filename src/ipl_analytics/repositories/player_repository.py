@@ -8,7 +8,7 @@ from ipl_analytics.repositories.base import BaseRepository
 class PlayerRepository(BaseRepository):
     """Handles all player-related database queries"""
     
-    def get_all_players(
+    async def get_all_players(
         self,
         search: Optional[str] = None,
         limit: int = 100,
@@ -43,10 +43,10 @@ class PlayerRepository(BaseRepository):
             """
             params = (limit, offset)
         
-        results = self.execute_query(query, params)
+        results = await self.execute_query(query, params, name="list_players")
         return [row[0] for row in results] if results else []
     
-    def get_player_count(self, search: Optional[str] = None) -> int:
+    async def get_player_count(self, search: Optional[str] = None) -> int:
         """Get total count of players"""
         if search:
             query = "SELECT COUNT(*) FROM players WHERE player_name ILIKE %s"
@@ -55,16 +55,14 @@ class PlayerRepository(BaseRepository):
             query = "SELECT COUNT(*) FROM players"
             params = None
         
-        result = self.execute_query(query, params, fetch_one=True)
+        result = await self.execute_query(query, params, fetch_one=True, name="count_players")
         return result[0] if result else 0
     
-    def player_exists(self, player_name: str) -> bool:
-        """Check if a player exists"""
-        query = "SELECT EXISTS(SELECT 1 FROM players WHERE player_name = %s)"
-        result = self.execute_query(query, (player_name,), fetch_one=True)
-        return result[0] if result else False
+    async def player_exists(self, player_name: str) -> bool:
+        """Check if a player exists (by name or alias, case-insensitive)"""
+        return await self.resolve_player_id(player_name) is not None
     
-    def search_players(self, query: str, limit: int = 10) -> List[tuple]:
+    async def search_players(self, query: str, limit: int = 10) -> List[tuple]:
         """
         Search players for autocomplete
         
@@ -83,12 +81,12 @@ class PlayerRepository(BaseRepository):
                 p.player_name,
                 COUNT(DISTINCT d.match_id) as matches
             FROM players p
-            LEFT JOIN deliveries d ON d.batter = p.player_name
+            LEFT JOIN deliveries d ON d.batter_id = p.player_id
             WHERE p.player_name ILIKE %s
             GROUP BY p.player_name
             ORDER BY matches DESC, p.player_name
             LIMIT %s
         """
         params = (f"%{query}%", limit)
-        results = self.execute_query(sql, params)
+        results = await self.execute_query(sql, params, name="search_players")
         return results if results else []
@@ -1,3 +1,6 @@
+-- Ad-hoc analysis queries. They read deliveries_named (see schema.sql), which
+-- puts player names back on top of the id-keyed deliveries table.
+
 1) Core Batter vs Bowler Analysis Query
 
 SELECT
@@ -31,7 +34,7 @@ SELECT
         2
     )                                     AS average
 
-FROM deliveries
+FROM deliveries_named
 GROUP BY batter, bowler
 HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 12
 ORDER BY outs DESC, balls_faced DESC;
@@ -74,7 +77,7 @@ SELECT
         ),
         2
     )                                     AS average
-FROM deliveries
+FROM deliveries_named
 GROUP BY batter, bowler
 HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 12
 ORDER BY outs DESC, balls_faced DESC;
@@ -111,7 +114,7 @@ SELECT
         ),
         2
     )                                     AS average
-FROM deliveries
+FROM deliveries_named
 GROUP BY batter, bowler, phase
 HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 12
 ORDER BY outs DESC, balls_faced DESC;
@@ -131,7 +134,7 @@ SELECT
           AND dismissed_batter = batter
     )                                     AS outs
 
-FROM deliveries
+FROM deliveries_named
 GROUP BY batter, bowler, phase
 HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 8
 ORDER BY batter, bowler, phase;
@@ -150,7 +153,7 @@ WITH matchup_stats AS (
               AND dismissed_batter = batter
         )                                     AS outs
 
-    FROM deliveries
+    FROM deliveries_named
     GROUP BY batter, bowler
     HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 12
 )
@@ -170,7 +173,7 @@ SELECT
     batter,
     wicket_type,
     COUNT(*) AS dismissals
-FROM deliveries
+FROM deliveries_named
 WHERE is_wicket = true
   AND dismissed_batter = batter
 GROUP BY batter, wicket_type
@@ -182,7 +185,7 @@ WITH batter_outs AS (
         batter,
         wicket_type,
         COUNT(*) AS outs
-    FROM deliveries
+    FROM deliveries_named
     WHERE is_wicket = true
       AND dismissed_batter = batter
     GROUP BY batter, wicket_type
@@ -214,7 +217,7 @@ SELECT
         ELSE 'spin'
     END AS bowling_type,
     COUNT(*) AS outs
-FROM deliveries
+FROM deliveries_named
 WHERE is_wicket = true
   AND dismissed_batter = batter
 GROUP BY batter, bowling_type
@@ -226,7 +229,7 @@ SELECT
     phase,
     wicket_type,
     COUNT(*) AS outs
-FROM deliveries
+FROM deliveries_named
 WHERE is_wicket = true
   AND dismissed_batter = batter
 GROUP BY batter, phase, wicket_type
@@ -245,7 +248,7 @@ SELECT
         WHERE is_wicket = true
           AND dismissed_batter = batter
     )                                     AS outs
-FROM deliveries
+FROM deliveries_named
 GROUP BY batter, bowler, venue
 HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 12
 ORDER BY outs DESC, balls_faced DESC;
@@ -275,7 +278,7 @@ SELECT
             ), 0
         ), 2
     )                                                 AS average
-FROM deliveries
+FROM deliveries_named
 WHERE batter = :batter_name
 GROUP BY batter;
 
@@ -283,7 +286,7 @@ GROUP BY batter;
 SELECT
     runs_batter,
     COUNT(*) AS times
-FROM deliveries
+FROM deliveries_named
 WHERE batter = :batter_name
   AND is_legal_ball = true
 GROUP BY runs_batter
@@ -303,7 +306,7 @@ SELECT
         / NULLIF(COUNT(*) FILTER (WHERE is_legal_ball), 0)
         * 100, 2
     )                                     AS strike_rate
-FROM deliveries
+FROM deliveries_named
 WHERE batter = :batter_name
 GROUP BY phase
 ORDER BY phase;
@@ -322,7 +325,7 @@ SELECT
         / NULLIF(COUNT(*) FILTER (WHERE is_legal_ball), 0)
         * 100, 2
     )                                     AS strike_rate
-FROM deliveries
+FROM deliveries_named
 WHERE batter = :batter_name
 GROUP BY bowler
 HAVING COUNT(*) FILTER (WHERE is_legal_ball) >= 12
@@ -342,7 +345,7 @@ SELECT
         / NULLIF(COUNT(*) FILTER (WHERE is_legal_ball), 0)
         * 100, 2
     )                                     AS strike_rate
-FROM deliveries
+FROM deliveries_named
 WHERE batter = :batter_name
 GROUP BY season
 ORDER BY season;
@@ -362,7 +365,7 @@ SELECT
         / NULLIF(COUNT(*) FILTER (WHERE is_legal_ball), 0)
         * 100, 2
     )                                     AS strike_rate
-FROM deliveries
+FROM deliveries_named
 WHERE batter = :batter_name
 GROUP BY venue
 ORDER BY balls DESC;
@@ -373,7 +376,7 @@ WITH batter_matches AS (
         batter,
         match_id,
         MAX(delivery_seq) AS last_delivery_in_match
-    FROM deliveries
+    FROM deliveries_named
     WHERE batter = :batter_name
     GROUP BY batter, match_id
 )
@@ -393,7 +396,7 @@ WITH recent_matches AS (
             ROW_NUMBER() OVER (ORDER BY match_id DESC) AS rn
         FROM (
             SELECT DISTINCT match_id
-            FROM deliveries
+            FROM deliveries_named
             WHERE batter = 'MS Dhoni'
         ) m
     ) ranked
@@ -422,7 +425,7 @@ SELECT
             ), 0
         ), 2
     )                                                 AS average
-FROM deliveries
+FROM deliveries_named
 WHERE batter = 'MS Dhoni'
   AND match_id IN (SELECT match_id FROM recent_matches)
 GROUP BY batter;
@@ -437,7 +440,7 @@ WITH recent_matches AS (
             ROW_NUMBER() OVER (ORDER BY match_id DESC) AS rn
         FROM (
             SELECT DISTINCT match_id
-            FROM deliveries
+            FROM deliveries_named
             WHERE batter = 'V Kohli'
         ) m
     ) ranked
@@ -456,7 +459,7 @@ SELECT
         / NULLIF(COUNT(*) FILTER (WHERE is_legal_ball), 0)
         * 100, 2
     )                                     AS strike_rate
-FROM deliveries
+FROM deliveries_named
 WHERE batter = 'V Kohli'
   AND match_id IN (SELECT match_id FROM recent_matches)
 GROUP BY phase
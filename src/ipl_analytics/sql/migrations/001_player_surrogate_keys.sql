@@ -0,0 +1,84 @@
+-- Migrate an existing database from player-name keys to integer player ids.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/001_player_surrogate_keys.sql
+--
+-- Rewrites the deliveries table once; run it in a maintenance window. Then
+-- re-create analytics.batter_profile and analytics.batter_profile_season from
+-- src/ipl_analytics/misc/ (they are dropped here because their columns change).
+
+BEGIN;
+
+DROP VIEW IF EXISTS analytics.batter_profile;
+DROP VIEW IF EXISTS analytics.batter_profile_season;
+
+-- Players: add the surrogate key and registry id, keep names unique
+ALTER TABLE players ADD COLUMN player_id SERIAL;
+ALTER TABLE players ADD COLUMN registry_id TEXT;
+
+ALTER TABLE deliveries DROP CONSTRAINT IF EXISTS deliveries_batter_fkey;
+ALTER TABLE deliveries DROP CONSTRAINT IF EXISTS deliveries_bowler_fkey;
+ALTER TABLE deliveries DROP CONSTRAINT IF EXISTS deliveries_non_striker_fkey;
+
+ALTER TABLE players DROP CONSTRAINT players_pkey;
+ALTER TABLE players ADD PRIMARY KEY (player_id);
+ALTER TABLE players ADD CONSTRAINT players_player_name_key UNIQUE (player_name);
+
+CREATE INDEX IF NOT EXISTS ix_players_registry_id
+ON players (registry_id);
+
+-- Dismissed batters were never constrained; make sure they exist as players
+INSERT INTO players (player_name)
+SELECT DISTINCT dismissed_batter
+FROM deliveries
+WHERE dismissed_batter IS NOT NULL
+ON CONFLICT (player_name) DO NOTHING;
+
+-- Deliveries: swap name columns for id columns
+ALTER TABLE deliveries
+    ADD COLUMN batter_id INTEGER,
+    ADD COLUMN bowler_id INTEGER,
+    ADD COLUMN non_striker_id INTEGER,
+    ADD COLUMN dismissed_batter_id INTEGER;
+
+UPDATE deliveries d
+SET batter_id = b.player_id,
+    bowler_id = bw.player_id,
+    non_striker_id = ns.player_id,
+    dismissed_batter_id = (
+        SELECT player_id FROM players WHERE player_name = d.dismissed_batter
+    )
+FROM players b, players bw, players ns
+WHERE b.player_name = d.batter
+  AND bw.player_name = d.bowler
+  AND ns.player_name = d.non_striker;
+
+ALTER TABLE deliveries
+    ALTER COLUMN batter_id SET NOT NULL,
+    ALTER COLUMN bowler_id SET NOT NULL,
+    ALTER COLUMN non_striker_id SET NOT NULL,
+    ADD FOREIGN KEY (batter_id) REFERENCES players(player_id),
+    ADD FOREIGN KEY (bowler_id) REFERENCES players(player_id),
+    ADD FOREIGN KEY (non_striker_id) REFERENCES players(player_id),
+    ADD FOREIGN KEY (dismissed_batter_id) REFERENCES players(player_id),
+    DROP COLUMN batter,
+    DROP COLUMN bowler,
+    DROP COLUMN non_striker,
+    DROP COLUMN dismissed_batter;
+
+CREATE OR REPLACE VIEW deliveries_named AS
+SELECT
+    d.*,
+    b.player_name  AS batter,
+    bw.player_name AS bowler,
+    ns.player_name AS non_striker,
+    db.player_name AS dismissed_batter
+FROM deliveries d
+JOIN players b  ON b.player_id = d.batter_id
+JOIN players bw ON bw.player_id = d.bowler_id
+JOIN players ns ON ns.player_id = d.non_striker_id
+LEFT JOIN players db ON db.player_id = d.dismissed_batter_id;
+
+COMMIT;
+
+-- Reclaim the space of the dropped text columns
+VACUUM FULL ANALYZE deliveries;
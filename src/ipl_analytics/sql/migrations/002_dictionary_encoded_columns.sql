@@ -0,0 +1,127 @@
+-- Store season, venue, phase, extras_type and wicket_type as SMALLINT codes
+-- into lookup tables instead of TEXT on every delivery.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/002_dictionary_encoded_columns.sql
+--
+-- Requires 001_player_surrogate_keys.sql. Rewrites the deliveries table once;
+-- re-create the analytics views from src/ipl_analytics/misc/ afterwards.
+
+BEGIN;
+
+DROP VIEW IF EXISTS analytics.batter_profile;
+DROP VIEW IF EXISTS analytics.batter_profile_season;
+DROP VIEW IF EXISTS deliveries_named;
+
+CREATE TABLE IF NOT EXISTS seasons (
+    season_id SMALLSERIAL PRIMARY KEY,
+    season TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS venues (
+    venue_id SMALLSERIAL PRIMARY KEY,
+    venue TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS phases (
+    phase_id SMALLSERIAL PRIMARY KEY,
+    phase TEXT NOT NULL UNIQUE
+);
+
+INSERT INTO phases (phase)
+VALUES ('powerplay'), ('middle'), ('death')
+ON CONFLICT (phase) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS extras_types (
+    extras_type_id SMALLSERIAL PRIMARY KEY,
+    extras_type TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS wicket_types (
+    wicket_type_id SMALLSERIAL PRIMARY KEY,
+    wicket_type TEXT NOT NULL UNIQUE
+);
+
+INSERT INTO seasons (season)
+SELECT DISTINCT season FROM deliveries ORDER BY season
+ON CONFLICT (season) DO NOTHING;
+
+INSERT INTO venues (venue)
+SELECT DISTINCT venue FROM deliveries ORDER BY venue
+ON CONFLICT (venue) DO NOTHING;
+
+INSERT INTO phases (phase)
+SELECT DISTINCT phase FROM deliveries
+ON CONFLICT (phase) DO NOTHING;
+
+INSERT INTO extras_types (extras_type)
+SELECT DISTINCT extras_type FROM deliveries WHERE extras_type IS NOT NULL
+ON CONFLICT (extras_type) DO NOTHING;
+
+INSERT INTO wicket_types (wicket_type)
+SELECT DISTINCT wicket_type FROM deliveries WHERE wicket_type IS NOT NULL
+ON CONFLICT (wicket_type) DO NOTHING;
+
+ALTER TABLE deliveries
+    ADD COLUMN season_id SMALLINT,
+    ADD COLUMN venue_id SMALLINT,
+    ADD COLUMN extras_type_id SMALLINT,
+    ADD COLUMN wicket_type_id SMALLINT,
+    ADD COLUMN phase_id SMALLINT;
+
+UPDATE deliveries d
+SET season_id = s.season_id,
+    venue_id = v.venue_id,
+    phase_id = ph.phase_id,
+    extras_type_id = (
+        SELECT extras_type_id FROM extras_types WHERE extras_type = d.extras_type
+    ),
+    wicket_type_id = (
+        SELECT wicket_type_id FROM wicket_types WHERE wicket_type = d.wicket_type
+    )
+FROM seasons s, venues v, phases ph
+WHERE s.season = d.season
+  AND v.venue = d.venue
+  AND ph.phase = d.phase;
+
+ALTER TABLE deliveries
+    ALTER COLUMN season_id SET NOT NULL,
+    ALTER COLUMN venue_id SET NOT NULL,
+    ALTER COLUMN phase_id SET NOT NULL,
+    ADD FOREIGN KEY (season_id) REFERENCES seasons(season_id),
+    ADD FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    ADD FOREIGN KEY (extras_type_id) REFERENCES extras_types(extras_type_id),
+    ADD FOREIGN KEY (wicket_type_id) REFERENCES wicket_types(wicket_type_id),
+    ADD FOREIGN KEY (phase_id) REFERENCES phases(phase_id),
+    DROP COLUMN season,
+    DROP COLUMN venue,
+    DROP COLUMN extras_type,
+    DROP COLUMN wicket_type,
+    DROP COLUMN phase;
+
+CREATE VIEW deliveries_named AS
+SELECT
+    d.*,
+    s.season,
+    v.venue,
+    b.player_name  AS batter,
+    bw.player_name AS bowler,
+    ns.player_name AS non_striker,
+    db.player_name AS dismissed_batter,
+    et.extras_type,
+    wt.wicket_type,
+    ph.phase
+FROM deliveries d
+JOIN seasons s  ON s.season_id = d.season_id
+JOIN venues v   ON v.venue_id = d.venue_id
+JOIN players b  ON b.player_id = d.batter_id
+JOIN players bw ON bw.player_id = d.bowler_id
+JOIN players ns ON ns.player_id = d.non_striker_id
+LEFT JOIN players db ON db.player_id = d.dismissed_batter_id
+LEFT JOIN extras_types et ON et.extras_type_id = d.extras_type_id
+LEFT JOIN wicket_types wt ON wt.wicket_type_id = d.wicket_type_id
+JOIN phases ph  ON ph.phase_id = d.phase_id;
+
+COMMIT;
+
+-- Reclaim the space of the dropped text columns
+VACUUM FULL ANALYZE deliveries;
@@ -0,0 +1,122 @@
+-- LIST-partition deliveries by season_id, one partition per season.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/003_partition_deliveries_by_season.sql
+--
+-- Requires 002_dictionary_encoded_columns.sql. Copies every delivery once;
+-- re-create the analytics views from src/ipl_analytics/misc/ afterwards.
+-- Partition names follow db/partitions.py: season "2007/08" -> deliveries_2007_08.
+
+BEGIN;
+
+DROP VIEW IF EXISTS analytics.batter_profile;
+DROP VIEW IF EXISTS analytics.batter_profile_season;
+DROP VIEW IF EXISTS deliveries_named;
+
+ALTER TABLE deliveries RENAME TO deliveries_unpartitioned;
+ALTER SEQUENCE deliveries_id_seq RENAME TO deliveries_unpartitioned_id_seq;
+ALTER TABLE deliveries_unpartitioned RENAME CONSTRAINT deliveries_pkey TO deliveries_unpartitioned_pkey;
+ALTER INDEX ux_deliveries_unique_event RENAME TO ux_deliveries_unpartitioned_unique_event;
+
+CREATE TABLE deliveries (
+    id SERIAL,
+
+    match_id INTEGER NOT NULL REFERENCES matches(match_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+    venue_id SMALLINT NOT NULL REFERENCES venues(venue_id),
+
+    innings INTEGER NOT NULL,
+    over INTEGER NOT NULL,
+    ball INTEGER NOT NULL,
+    delivery_seq INTEGER NOT NULL,
+
+    batting_team TEXT NOT NULL,
+
+    batter_id INTEGER NOT NULL REFERENCES players(player_id),
+    bowler_id INTEGER NOT NULL REFERENCES players(player_id),
+    non_striker_id INTEGER NOT NULL REFERENCES players(player_id),
+
+    runs_batter INTEGER NOT NULL,
+    runs_extras INTEGER NOT NULL,
+    extras_type_id SMALLINT REFERENCES extras_types(extras_type_id),
+
+    is_legal_ball BOOLEAN NOT NULL,
+
+    is_wicket BOOLEAN NOT NULL,
+    dismissed_batter_id INTEGER REFERENCES players(player_id),
+    wicket_type_id SMALLINT REFERENCES wicket_types(wicket_type_id),
+
+    phase_id SMALLINT NOT NULL REFERENCES phases(phase_id),
+
+    PRIMARY KEY (season_id, id)
+) PARTITION BY LIST (season_id);
+
+CREATE UNIQUE INDEX ux_deliveries_unique_event
+ON deliveries (season_id, match_id, innings, delivery_seq);
+
+CREATE INDEX ix_deliveries_match_id
+ON deliveries (match_id);
+
+DO $$
+DECLARE
+    s RECORD;
+BEGIN
+    FOR s IN
+        SELECT DISTINCT se.season_id, se.season
+        FROM deliveries_unpartitioned d
+        JOIN seasons se ON se.season_id = d.season_id
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF deliveries FOR VALUES IN (%s)',
+            'deliveries_' || btrim(regexp_replace(lower(s.season), '[^a-z0-9]+', '_', 'g'), '_'),
+            s.season_id
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO deliveries (
+    id, match_id, season_id, venue_id, innings, over, ball, delivery_seq,
+    batting_team, batter_id, bowler_id, non_striker_id, runs_batter,
+    runs_extras, extras_type_id, is_legal_ball, is_wicket,
+    dismissed_batter_id, wicket_type_id, phase_id
+)
+SELECT
+    id, match_id, season_id, venue_id, innings, over, ball, delivery_seq,
+    batting_team, batter_id, bowler_id, non_striker_id, runs_batter,
+    runs_extras, extras_type_id, is_legal_ball, is_wicket,
+    dismissed_batter_id, wicket_type_id, phase_id
+FROM deliveries_unpartitioned;
+
+SELECT setval(
+    'deliveries_id_seq',
+    (SELECT COALESCE(MAX(id), 0) + 1 FROM deliveries),
+    false
+);
+
+DROP TABLE deliveries_unpartitioned;
+
+CREATE VIEW deliveries_named AS
+SELECT
+    d.*,
+    s.season,
+    v.venue,
+    b.player_name  AS batter,
+    bw.player_name AS bowler,
+    ns.player_name AS non_striker,
+    db.player_name AS dismissed_batter,
+    et.extras_type,
+    wt.wicket_type,
+    ph.phase
+FROM deliveries d
+JOIN seasons s  ON s.season_id = d.season_id
+JOIN venues v   ON v.venue_id = d.venue_id
+JOIN players b  ON b.player_id = d.batter_id
+JOIN players bw ON bw.player_id = d.bowler_id
+JOIN players ns ON ns.player_id = d.non_striker_id
+LEFT JOIN players db ON db.player_id = d.dismissed_batter_id
+LEFT JOIN extras_types et ON et.extras_type_id = d.extras_type_id
+LEFT JOIN wicket_types wt ON wt.wicket_type_id = d.wicket_type_id
+JOIN phases ph  ON ph.phase_id = d.phase_id;
+
+COMMIT;
+
+ANALYZE deliveries;
@@ -0,0 +1,67 @@
+-- Create the per-season analytics aggregate tables. Afterwards the ingestion
+-- writers keep them current.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/004_analytics_aggregates.sql
+--   python -m ipl_analytics.db.aggregates
+--
+-- The second command fills the tables from the existing deliveries. The
+-- aggregate expressions live only in db/aggregates.py (AGGREGATES), so this
+-- fill, season rebuilds and incremental ingestion all compute the same totals.
+--
+-- Requires 003_partition_deliveries_by_season.sql. Re-create the analytics
+-- views from src/ipl_analytics/misc/ afterwards; they now read these tables.
+
+BEGIN;
+
+CREATE SCHEMA IF NOT EXISTS analytics;
+
+CREATE TABLE IF NOT EXISTS analytics.batter_season_stats (
+    batter_id INTEGER NOT NULL REFERENCES players(player_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+
+    matches INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    outs INTEGER NOT NULL,
+
+    pp_runs INTEGER NOT NULL,
+    pp_balls INTEGER NOT NULL,
+    mid_runs INTEGER NOT NULL,
+    mid_balls INTEGER NOT NULL,
+    death_runs INTEGER NOT NULL,
+    death_balls INTEGER NOT NULL,
+
+    caught_outs INTEGER NOT NULL,
+    bowled_outs INTEGER NOT NULL,
+    lbw_outs INTEGER NOT NULL,
+    stumped_outs INTEGER NOT NULL,
+
+    PRIMARY KEY (batter_id, season_id)
+);
+
+CREATE TABLE IF NOT EXISTS analytics.bowler_season_stats (
+    bowler_id INTEGER NOT NULL REFERENCES players(player_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+
+    matches INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs_conceded INTEGER NOT NULL,  -- off the bat plus wides and no-balls
+    wickets INTEGER NOT NULL,        -- credited to the bowler (no run outs)
+    dot_balls INTEGER NOT NULL,
+
+    PRIMARY KEY (bowler_id, season_id)
+);
+
+CREATE TABLE IF NOT EXISTS analytics.venue_season_stats (
+    venue_id SMALLINT NOT NULL REFERENCES venues(venue_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+
+    matches INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    wickets INTEGER NOT NULL,
+
+    PRIMARY KEY (venue_id, season_id)
+);
+
+COMMIT;
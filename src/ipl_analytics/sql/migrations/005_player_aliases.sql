@@ -0,0 +1,14 @@
+-- Add the player_aliases table used by the API's player name resolver.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/005_player_aliases.sql
+--
+-- Aliases are optional; names are matched case-insensitively without them.
+-- Example:
+--
+--   INSERT INTO player_aliases (alias, player_id)
+--   SELECT 'Virat Kohli', player_id FROM players WHERE player_name = 'V Kohli';
+
+CREATE TABLE IF NOT EXISTS player_aliases (
+    alias TEXT PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players(player_id) ON DELETE CASCADE
+);
@@ -0,0 +1,94 @@
+-- Build the access-path indexes of the repository queries on deliveries
+-- (see db/indexes.py) without blocking ingestion.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/006_delivery_access_path_indexes.sql
+--
+-- Must run through psql (it uses \gexec) and outside a transaction block.
+-- Postgres cannot build an index on a partitioned table CONCURRENTLY, so each
+-- index is created ON ONLY deliveries (instant, and invalid until complete),
+-- built CONCURRENTLY on every season partition and attached partition by
+-- partition; the parent index becomes valid once every partition has one.
+--
+-- Safe to re-run after an interruption: invalid leftovers of a failed
+-- concurrent build are dropped and partitions already covered are skipped.
+-- Check the result with:
+--
+--   python -m ipl_analytics.benchmarks.index_usage
+
+\set ON_ERROR_STOP on
+
+CREATE TEMP TABLE delivery_index_defs (name, suffix, definition) AS VALUES
+    (
+        'ix_deliveries_batter_match', 'batter_match',
+        '(batter_id, match_id) INCLUDE (season_id, venue_id, phase_id, runs_batter, is_legal_ball, is_wicket, dismissed_batter_id, wicket_type_id)'
+    ),
+    (
+        'ix_deliveries_matchup', 'matchup',
+        '(batter_id, bowler_id, season_id, venue_id) INCLUDE (match_id, phase_id, runs_batter, is_legal_ball, is_wicket, dismissed_batter_id)'
+    ),
+    (
+        'ix_deliveries_dismissed_batter', 'dismissed_batter',
+        '(dismissed_batter_id) INCLUDE (season_id, batter_id, wicket_type_id) WHERE is_wicket'
+    ),
+    (
+        'ix_deliveries_bowler_season', 'bowler_season',
+        '(bowler_id, season_id) INCLUDE (match_id, is_legal_ball, runs_batter, runs_extras, extras_type_id, is_wicket, wicket_type_id)'
+    );
+
+-- 1. Parent indexes, without touching the partitions
+SELECT format('CREATE INDEX IF NOT EXISTS %I ON ONLY deliveries %s', name, definition)
+FROM delivery_index_defs
+ORDER BY name
+\gexec
+
+-- 2. Drop INVALID partition indexes left behind by an interrupted build
+SELECT format('DROP INDEX CONCURRENTLY IF EXISTS %I', c.relname)
+FROM delivery_index_defs d
+CROSS JOIN pg_inherits pi
+JOIN pg_class p ON p.oid = pi.inhrelid
+JOIN pg_class c ON c.relname = format('ix_%s_%s', p.relname, d.suffix)
+JOIN pg_index x ON x.indexrelid = c.oid
+WHERE pi.inhparent = 'deliveries'::regclass
+  AND NOT x.indisvalid
+\gexec
+
+-- 3. Build each index CONCURRENTLY on every partition not yet covered
+SELECT format(
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS %I ON %I %s',
+    format('ix_%s_%s', p.relname, d.suffix), p.relname, d.definition
+)
+FROM delivery_index_defs d
+CROSS JOIN pg_inherits pi
+JOIN pg_class p ON p.oid = pi.inhrelid
+WHERE pi.inhparent = 'deliveries'::regclass
+  AND NOT EXISTS (
+    SELECT 1
+    FROM pg_inherits ii
+    JOIN pg_index x ON x.indexrelid = ii.inhrelid
+    WHERE ii.inhparent = d.name::regclass AND x.indrelid = p.oid
+  )
+ORDER BY p.relname, d.name
+\gexec
+
+-- 4. Attach them; the last attachment makes the parent index valid
+SELECT format(
+    'ALTER INDEX %I ATTACH PARTITION %I',
+    d.name, format('ix_%s_%s', p.relname, d.suffix)
+)
+FROM delivery_index_defs d
+CROSS JOIN pg_inherits pi
+JOIN pg_class p ON p.oid = pi.inhrelid
+WHERE pi.inhparent = 'deliveries'::regclass
+  AND to_regclass(format('ix_%s_%s', p.relname, d.suffix)) IS NOT NULL
+  AND NOT EXISTS (
+    SELECT 1
+    FROM pg_inherits ii
+    JOIN pg_index x ON x.indexrelid = ii.inhrelid
+    WHERE ii.inhparent = d.name::regclass AND x.indrelid = p.oid
+  )
+ORDER BY p.relname, d.name
+\gexec
+
+DROP TABLE delivery_index_defs;
+
+ANALYZE deliveries;
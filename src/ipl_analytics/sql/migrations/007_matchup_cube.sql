@@ -0,0 +1,31 @@
+-- Create analytics.matchup_cube. Afterwards the ingestion writers keep it
+-- current and the matchup endpoint reads it instead of aggregating balls.
+--
+--   psql ipl_analytics < src/ipl_analytics/sql/migrations/007_matchup_cube.sql
+--   python -m ipl_analytics.db.aggregates
+--
+-- The second command fills it from the existing deliveries, with the
+-- definitions in db/aggregates.py (AGGREGATES).
+--
+-- Requires 004_analytics_aggregates.sql.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS analytics.matchup_cube (
+    batter_id INTEGER NOT NULL REFERENCES players(player_id),
+    bowler_id INTEGER NOT NULL REFERENCES players(player_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+    venue_id SMALLINT NOT NULL REFERENCES venues(venue_id),
+    phase_id SMALLINT NOT NULL REFERENCES phases(phase_id),
+
+    balls INTEGER NOT NULL,       -- legal balls
+    runs INTEGER NOT NULL,        -- off the bat
+    outs INTEGER NOT NULL,        -- batter dismissed on the ball (any mode)
+    dots INTEGER NOT NULL,
+    boundaries INTEGER NOT NULL,  -- fours and sixes
+    extras INTEGER NOT NULL,
+
+    PRIMARY KEY (batter_id, bowler_id, season_id, venue_id, phase_id)
+);
+
+COMMIT;
@@ -1,6 +1,48 @@
--- Players
+-- Players (integer surrogate key; deliveries reference player_id)
 CREATE TABLE IF NOT EXISTS players (
-    player_name TEXT PRIMARY KEY
+    player_id SERIAL PRIMARY KEY,
+    player_name TEXT NOT NULL UNIQUE,
+    registry_id TEXT                -- Cricsheet people registry identifier
+);
+
+CREATE INDEX IF NOT EXISTS ix_players_registry_id
+ON players (registry_id);
+
+-- Alternative spellings a player can be looked up by ("Virat Kohli" -> V Kohli).
+-- Matched case-insensitively by the API's name resolver.
+CREATE TABLE IF NOT EXISTS player_aliases (
+    alias TEXT PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players(player_id) ON DELETE CASCADE
+);
+
+-- Lookup tables for the low-cardinality delivery columns (stored as codes)
+CREATE TABLE IF NOT EXISTS seasons (
+    season_id SMALLSERIAL PRIMARY KEY,
+    season TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS venues (
+    venue_id SMALLSERIAL PRIMARY KEY,
+    venue TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS phases (
+    phase_id SMALLSERIAL PRIMARY KEY,
+    phase TEXT NOT NULL UNIQUE
+);
+
+INSERT INTO phases (phase)
+VALUES ('powerplay'), ('middle'), ('death')
+ON CONFLICT (phase) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS extras_types (
+    extras_type_id SMALLSERIAL PRIMARY KEY,
+    extras_type TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS wicket_types (
+    wicket_type_id SMALLSERIAL PRIMARY KEY,
+    wicket_type TEXT NOT NULL UNIQUE
 );
 
 -- Matches
@@ -10,13 +52,15 @@ CREATE TABLE IF NOT EXISTS matches (
     venue TEXT NOT NULL
 );
 
--- Deliveries (ball-by-ball event store)
+-- Deliveries (ball-by-ball event store), LIST-partitioned by season.
+-- One partition per season (deliveries_2011, deliveries_2007_08, ...) is
+-- created by the ingestion writers; see db/partitions.py.
 CREATE TABLE IF NOT EXISTS deliveries (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
 
     match_id INTEGER NOT NULL REFERENCES matches(match_id),
-    season TEXT NOT NULL,
-    venue TEXT NOT NULL,
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+    venue_id SMALLINT NOT NULL REFERENCES venues(venue_id),
 
     innings INTEGER NOT NULL,
     over INTEGER NOT NULL,
@@ -25,23 +69,158 @@ CREATE TABLE IF NOT EXISTS deliveries (
 
     batting_team TEXT NOT NULL,
 
-    batter TEXT NOT NULL REFERENCES players(player_name),
-    bowler TEXT NOT NULL REFERENCES players(player_name),
-    non_striker TEXT NOT NULL REFERENCES players(player_name),
+    batter_id INTEGER NOT NULL REFERENCES players(player_id),
+    bowler_id INTEGER NOT NULL REFERENCES players(player_id),
+    non_striker_id INTEGER NOT NULL REFERENCES players(player_id),
 
     runs_batter INTEGER NOT NULL,
     runs_extras INTEGER NOT NULL,
-    extras_type TEXT,
+    extras_type_id SMALLINT REFERENCES extras_types(extras_type_id),
 
     is_legal_ball BOOLEAN NOT NULL,
 
     is_wicket BOOLEAN NOT NULL,
-    dismissed_batter TEXT,
-    wicket_type TEXT,
+    dismissed_batter_id INTEGER REFERENCES players(player_id),
+    wicket_type_id SMALLINT REFERENCES wicket_types(wicket_type_id),
 
-    phase TEXT NOT NULL
-);
+    phase_id SMALLINT NOT NULL REFERENCES phases(phase_id),
+
+    PRIMARY KEY (season_id, id)
+) PARTITION BY LIST (season_id);
 
--- Correct uniqueness (event-level, not ball-level)
+-- Correct uniqueness (event-level, not ball-level); unique indexes on a
+-- partitioned table must include the partition key
 CREATE UNIQUE INDEX IF NOT EXISTS ux_deliveries_unique_event
-ON deliveries (match_id, innings, delivery_seq);
+ON deliveries (season_id, match_id, innings, delivery_seq);
+
+-- Replacing a match deletes by match_id across partitions
+CREATE INDEX IF NOT EXISTS ix_deliveries_match_id
+ON deliveries (match_id);
+
+-- Access paths of the repository queries (see db/indexes.py). The INCLUDEd
+-- columns let those queries run as index-only scans of a player's rows.
+CREATE INDEX IF NOT EXISTS ix_deliveries_batter_match
+ON deliveries (batter_id, match_id)
+INCLUDE (season_id, venue_id, phase_id, runs_batter, is_legal_ball, is_wicket, dismissed_batter_id, wicket_type_id);
+
+CREATE INDEX IF NOT EXISTS ix_deliveries_matchup
+ON deliveries (batter_id, bowler_id, season_id, venue_id)
+INCLUDE (match_id, phase_id, runs_batter, is_legal_ball, is_wicket, dismissed_batter_id);
+
+CREATE INDEX IF NOT EXISTS ix_deliveries_dismissed_batter
+ON deliveries (dismissed_batter_id)
+INCLUDE (season_id, batter_id, wicket_type_id)
+WHERE is_wicket;
+
+CREATE INDEX IF NOT EXISTS ix_deliveries_bowler_season
+ON deliveries (bowler_id, season_id)
+INCLUDE (match_id, is_legal_ball, runs_batter, runs_extras, extras_type_id, is_wicket, wicket_type_id);
+
+-- Deliveries with every code decoded, for ad-hoc queries (see analytics.sql)
+CREATE OR REPLACE VIEW deliveries_named AS
+SELECT
+    d.*,
+    s.season,
+    v.venue,
+    b.player_name  AS batter,
+    bw.player_name AS bowler,
+    ns.player_name AS non_striker,
+    db.player_name AS dismissed_batter,
+    et.extras_type,
+    wt.wicket_type,
+    ph.phase
+FROM deliveries d
+JOIN seasons s  ON s.season_id = d.season_id
+JOIN venues v   ON v.venue_id = d.venue_id
+JOIN players b  ON b.player_id = d.batter_id
+JOIN players bw ON bw.player_id = d.bowler_id
+JOIN players ns ON ns.player_id = d.non_striker_id
+LEFT JOIN players db ON db.player_id = d.dismissed_batter_id
+LEFT JOIN extras_types et ON et.extras_type_id = d.extras_type_id
+LEFT JOIN wicket_types wt ON wt.wicket_type_id = d.wicket_type_id
+JOIN phases ph  ON ph.phase_id = d.phase_id;
+
+-- Analytics aggregates, refreshed incrementally by the ingestion writers
+-- (see db/aggregates.py); the analytics views in misc/ read from them
+CREATE SCHEMA IF NOT EXISTS analytics;
+
+CREATE TABLE IF NOT EXISTS analytics.batter_season_stats (
+    batter_id INTEGER NOT NULL REFERENCES players(player_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+
+    matches INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    outs INTEGER NOT NULL,
+
+    pp_runs INTEGER NOT NULL,
+    pp_balls INTEGER NOT NULL,
+    mid_runs INTEGER NOT NULL,
+    mid_balls INTEGER NOT NULL,
+    death_runs INTEGER NOT NULL,
+    death_balls INTEGER NOT NULL,
+
+    caught_outs INTEGER NOT NULL,
+    bowled_outs INTEGER NOT NULL,
+    lbw_outs INTEGER NOT NULL,
+    stumped_outs INTEGER NOT NULL,
+
+    PRIMARY KEY (batter_id, season_id)
+);
+
+CREATE TABLE IF NOT EXISTS analytics.bowler_season_stats (
+    bowler_id INTEGER NOT NULL REFERENCES players(player_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+
+    matches INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs_conceded INTEGER NOT NULL,  -- off the bat plus wides and no-balls
+    wickets INTEGER NOT NULL,        -- credited to the bowler (no run outs)
+    dot_balls INTEGER NOT NULL,
+
+    PRIMARY KEY (bowler_id, season_id)
+);
+
+CREATE TABLE IF NOT EXISTS analytics.venue_season_stats (
+    venue_id SMALLINT NOT NULL REFERENCES venues(venue_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+
+    matches INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    wickets INTEGER NOT NULL,
+
+    PRIMARY KEY (venue_id, season_id)
+);
+
+-- Batter-vs-bowler totals per season, venue and phase; the matchup endpoint
+-- sums the pair's rows for any filter combination instead of reading balls
+CREATE TABLE IF NOT EXISTS analytics.matchup_cube (
+    batter_id INTEGER NOT NULL REFERENCES players(player_id),
+    bowler_id INTEGER NOT NULL REFERENCES players(player_id),
+    season_id SMALLINT NOT NULL REFERENCES seasons(season_id),
+    venue_id SMALLINT NOT NULL REFERENCES venues(venue_id),
+    phase_id SMALLINT NOT NULL REFERENCES phases(phase_id),
+
+    balls INTEGER NOT NULL,       -- legal balls
+    runs INTEGER NOT NULL,        -- off the bat
+    outs INTEGER NOT NULL,        -- batter dismissed on the ball (any mode)
+    dots INTEGER NOT NULL,
+    boundaries INTEGER NOT NULL,  -- fours and sixes
+    extras INTEGER NOT NULL,
+
+    PRIMARY KEY (batter_id, bowler_id, season_id, venue_id, phase_id)
+);
+
+-- Ingestion manifest (one row per loaded source file, used for incremental re-runs)
+CREATE TABLE IF NOT EXISTS ingestion_manifest (
+    file_path TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    file_size BIGINT NOT NULL,
+    file_mtime DOUBLE PRECISION NOT NULL,
+    match_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    deliveries INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,251 @@
+"""
+ConnectionPool behaviour, against fake connections (no database needed)
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+
+from ipl_analytics.db import pool as pool_module
+from ipl_analytics.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn: "FakeConnection"):
+        self.conn = conn
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def execute(self, query, params=None) -> None:
+        self.conn.queries += 1
+        if self.conn.dead:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection for the pool"""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.closed = 0
+        self.dead = False
+        self.queries = 0
+        self.info = SimpleNamespace(transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def rollback(self) -> None:
+        if self.dead:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class FakeConnect:
+    """connect() replacement that remembers every connection it opened"""
+
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self) -> FakeConnection:
+        conn = FakeConnection(len(self.opened))
+        self.opened.append(conn)
+        return conn
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def connect() -> FakeConnect:
+    return FakeConnect()
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Drive the pool's notion of time by hand (single-threaded tests only)"""
+    clock = FakeClock()
+    monkeypatch.setattr(pool_module, "time", clock)
+    return clock
+
+
+def wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.001)
+
+
+def start_waiter(pool: ConnectionPool, received: list, timeout: float = 5.0) -> threading.Thread:
+    """Call getconn() on a thread and wait until it is queued"""
+    waiting = pool.stats()["waiting"]
+    thread = threading.Thread(target=lambda: received.append(pool.getconn(timeout)), daemon=True)
+    thread.start()
+    wait_until(lambda: pool.stats()["waiting"] == waiting + 1)
+    return thread
+
+
+def test_warmup_opens_min_size(connect):
+    pool = ConnectionPool(connect, min_size=2, max_size=4)
+
+    assert pool.warmup() == 2
+    assert pool.warmup() == 0
+    assert pool.stats()["idle"] == 2
+    assert len(connect.opened) == 2
+
+
+def test_returned_connection_is_reused(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=2)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    assert len(connect.opened) == 1
+
+
+def test_returned_connection_goes_to_waiters_in_fifo_order(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1)
+    conn = pool.getconn()
+
+    first, second = [], []
+    first_thread = start_waiter(pool, first)
+    second_thread = start_waiter(pool, second)
+
+    pool.putconn(conn)
+    first_thread.join(2)
+    assert first == [conn]
+    assert second == []
+    # Handed over directly: never idle, so a newcomer could not take it
+    stats = pool.stats()
+    assert (stats["idle"], stats["in_use"], stats["waiting"]) == (0, 1, 1)
+
+    pool.putconn(first[0])
+    second_thread.join(2)
+    assert second == [conn]
+    assert len(connect.opened) == 1
+
+
+def test_newcomer_queues_behind_waiters(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1)
+    conn = pool.getconn()
+
+    waiter = []
+    waiter_thread = start_waiter(pool, waiter)
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn(timeout=0.01)
+
+    pool.putconn(conn)
+    waiter_thread.join(2)
+    assert waiter == [conn]
+
+
+def test_getconn_raises_pool_timeout_when_exhausted(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1)
+    pool.getconn()
+
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        pool.getconn(timeout=0.05)
+
+    assert time.monotonic() - started >= 0.05
+    assert pool.stats()["waiting"] == 0
+    assert pool.stats()["size"] == 1
+
+
+def test_putconn_close_hands_the_slot_to_a_waiter(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1)
+    conn = pool.getconn()
+
+    waiter = []
+    waiter_thread = start_waiter(pool, waiter)
+
+    pool.putconn(conn, close=True)
+    waiter_thread.join(2)
+
+    assert conn.closed
+    assert len(waiter) == 1 and waiter[0] is not conn and not waiter[0].closed
+    assert len(connect.opened) == 2
+    assert pool.stats()["size"] == 1
+
+
+def test_putconn_close_frees_the_slot_without_waiters(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1)
+
+    pool.putconn(pool.getconn(), close=True)
+
+    assert pool.stats()["size"] == 0
+    assert pool.getconn() is connect.opened[1]
+
+
+def test_connection_past_max_lifetime_is_closed_on_return(connect, clock):
+    pool = ConnectionPool(connect, min_size=0, max_size=2, max_lifetime=60, max_idle=None)
+    conn = pool.getconn()
+
+    clock.now += 61
+    pool.putconn(conn)
+
+    assert conn.closed
+    assert pool.stats()["size"] == 0
+    assert pool.stats()["recycled"] == 1
+    assert pool.getconn() is connect.opened[1]
+
+
+def test_idle_connection_past_max_lifetime_is_replaced_on_checkout(connect, clock):
+    pool = ConnectionPool(connect, min_size=0, max_size=2, max_lifetime=60, max_idle=None)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    clock.now += 61
+    fresh = pool.getconn()
+
+    assert fresh is not conn
+    assert conn.closed
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["size"] == 1
+
+
+def test_recently_used_connection_is_not_pinged(connect, clock):
+    pool = ConnectionPool(connect, min_size=0, max_size=1, ping_after=5, max_idle=None)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    clock.now += 1
+
+    assert pool.getconn() is conn
+    assert conn.queries == 0
+
+
+def test_dead_idle_connections_are_replaced(connect, clock):
+    pool = ConnectionPool(connect, min_size=0, max_size=2, ping_after=5, max_idle=None)
+    first, second = pool.getconn(), pool.getconn()
+    pool.putconn(first)
+    pool.putconn(second)
+
+    # e.g. a server restart: every idle connection is gone
+    first.dead = second.dead = True
+    clock.now += 6
+    conn = pool.getconn()
+
+    assert conn is connect.opened[2]
+    assert not conn.closed
+    assert first.closed and second.closed
+    stats = pool.stats()
+    assert (stats["size"], stats["idle"], stats["in_use"]) == (1, 0, 1)